@@ -4,20 +4,22 @@ Script para consolidar descrições L2 no arquivo themes_tree_enriched_full.yaml
 Lê todos os arquivos L2_*.yaml e insere as descrições no lugar correto da hierarquia
 """
 
-import yaml
+import sys
 import glob
 import re
 from pathlib import Path
 
+# I/O da árvore compartilhado com os scripts de refinamento (libyaml quando disponível)
+sys.path.append(str(Path(__file__).parent.parent / "_plan_refinamento" / "scripts"))
+from utils.tree_io import load_tree, save_tree
+
 def load_yaml_safe(filepath):
     """Carrega arquivo YAML de forma segura"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return load_tree(filepath)
 
 def save_yaml_safe(filepath, data):
     """Salva arquivo YAML de forma segura"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, sort_keys=False, default_flow_style=False, width=120)
+    save_tree(filepath, data)
 
 def main():
     base_path = Path(__file__).parent
@@ -3,6 +3,7 @@
 Script para consolidar todas as descrições L3 no arquivo themes_tree_enriched.yaml
 """
 
+import sys
 import yaml
 import glob
 import os
@@ -15,6 +16,10 @@ ENRICHED_FILE = BASE_DIR / "themes_tree_enriched.yaml"
 TREE_FILE = BASE_DIR / "themes_tree.yaml"
 OUTPUT_FILE = BASE_DIR / "themes_tree_enriched_full.yaml"
 
+# Escrita da árvore compartilhada com os scripts de refinamento (streaming e atômica)
+sys.path.append(str(BASE_DIR / "_plan_refinamento" / "scripts"))
+from utils.tree_io import save_tree
+
 
 def load_yaml(filepath):
     """Carrega arquivo YAML"""
@@ -164,19 +169,14 @@ def main():
     output = build_enriched_yaml(l1_data, tree_structure, l3_descriptions)
 
     print(f"Salvando em {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        # Header
-        f.write("# Árvore Temática Enriquecida Completa - DestaquesGovBr\n")
-        f.write("# Versão: 3.0\n")
-        f.write("# Data: 2025-12-18\n")
-        f.write("# Inclui: Descrições L1 + Estrutura L2 + Descrições L3\n")
-        f.write("# Próximo passo: Adicionar descrições L2 (Fase 3)\n\n")
-
-        yaml.dump(output, f,
-                  default_flow_style=False,
-                  allow_unicode=True,
-                  sort_keys=False,
-                  width=120)
+    header = (
+        "# Árvore Temática Enriquecida Completa - DestaquesGovBr\n"
+        "# Versão: 3.0\n"
+        "# Data: 2025-12-18\n"
+        "# Inclui: Descrições L1 + Estrutura L2 + Descrições L3\n"
+        "# Próximo passo: Adicionar descrições L2 (Fase 3)\n\n"
+    )
+    save_tree(OUTPUT_FILE, output, header=header)
 
     # Estatísticas
     l1_count = len(output['themes'])
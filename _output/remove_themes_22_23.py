@@ -6,31 +6,33 @@ Esses temas foram marcados para remoção conforme decisões estruturais:
 - Tema 23: Estatísticas e Dados Públicos (fundido com tema 20 - DEC-001)
 """
 
-import yaml
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
 INPUT_FILE = BASE_DIR / "themes_tree_enriched_full.yaml"
 OUTPUT_FILE = INPUT_FILE  # Sobrescrever o mesmo arquivo
 
+# I/O da árvore compartilhado com os scripts de refinamento (libyaml quando disponível)
+sys.path.append(str(BASE_DIR / "_plan_refinamento" / "scripts"))
+from utils.tree_io import load_tree, save_tree
+
+HEADER = (
+    "# Árvore Temática Enriquecida Completa - DestaquesGovBr\n"
+    "# Versão: 3.1\n"
+    "# Data: 2025-12-18\n"
+    "# Inclui: Descrições L1 + L2 + L3 completas\n"
+    "# Total: 23 temas L1 (temas 22 e 23 originais removidos)\n"
+    "# Estrutura final após decisões DEC-001 e DEC-002\n\n"
+)
+
 def load_yaml_safe(filepath):
     """Carrega arquivo YAML de forma segura"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return load_tree(filepath)
 
 def save_yaml_safe(filepath, data):
     """Salva arquivo YAML de forma segura"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        # Header
-        f.write("# Árvore Temática Enriquecida Completa - DestaquesGovBr\n")
-        f.write("# Versão: 3.1\n")
-        f.write("# Data: 2025-12-18\n")
-        f.write("# Inclui: Descrições L1 + L2 + L3 completas\n")
-        f.write("# Total: 23 temas L1 (temas 22 e 23 originais removidos)\n")
-        f.write("# Estrutura final após decisões DEC-001 e DEC-002\n\n")
-
-        yaml.dump(data, f, allow_unicode=True, sort_keys=False,
-                  default_flow_style=False, width=120)
+    save_tree(filepath, data, header=HEADER)
 
 def main():
     print("Carregando themes_tree_enriched_full.yaml...")
@@ -0,0 +1,102 @@
+"""
+Benchmark: gravação incremental do store de embeddings (segmentos de log)
+
+Mede o custo de persistir um lote pequeno de vetores novos (append + fsync no
+segmento) para caches de tamanhos crescentes, comparado com a regravação da
+matriz inteira (compactação). O append deve ter custo constante. Também
+confere a reabertura (segmentos + matriz) e a tolerância a um registro
+truncado no fim do segmento (gravação interrompida).
+Executar com: python scripts/benchmarks/bench_embedding_append.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_store import EmbeddingStore, text_key
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 768
+BATCH = 64
+SIZES = (10_000, 50_000, 150_000)
+
+
+def fill(store: EmbeddingStore, start: int, count: int, rng) -> np.ndarray:
+    vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+    for i, vector in enumerate(vectors, start=start):
+        store.put(text_key(f"texto {i}"), vector)
+    return vectors
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: gravação incremental de embeddings ({BATCH} vetores por lote){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    rng = np.random.default_rng(0)
+    errors = []
+
+    print(f"{'Cache':>10s} {'append':>12s} {'compactação':>14s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = Path(tmp) / "store"
+        store = EmbeddingStore(store_dir)
+        total = 0
+
+        for size in SIZES:
+            fill(store, total, size - total, rng)
+            store.compact()
+            total = size
+
+            timings = []
+            for _ in range(5):
+                fill(store, total, BATCH, rng)
+                start = time.perf_counter()
+                store.flush()
+                timings.append(time.perf_counter() - start)
+                total += BATCH
+            t_append = float(np.median(timings))
+
+            start = time.perf_counter()
+            store.compact()
+            t_compact = time.perf_counter() - start
+
+            print(f"{size:>10,} {t_append * 1000:10.2f}ms {t_compact * 1000:12.1f}ms")
+
+        # Reabertura: matriz compactada + segmento novo
+        last = fill(store, total, BATCH, rng)
+        store.flush()
+        reopened = EmbeddingStore(store_dir)
+        if len(reopened) != total + BATCH:
+            errors.append(f"reabertura: {len(reopened)} vetores, esperado {total + BATCH}")
+        if not np.array_equal(reopened.get(text_key(f"texto {total}")), last[0]):
+            errors.append("reabertura: vetor do segmento difere")
+        if reopened.get(text_key("texto 0")) is None:
+            errors.append("reabertura: vetor da matriz ausente")
+
+        # Registro truncado no fim do segmento: ignorado, os anteriores permanecem
+        segment = next(store.segments_dir.glob("seg-*.log"))
+        with open(segment, 'ab') as f:
+            f.write(b"\0" * 100)
+        truncated = EmbeddingStore(store_dir)
+        if len(truncated) != total + BATCH:
+            errors.append(f"segmento truncado: {len(truncated)} vetores, esperado {total + BATCH}")
+
+    if errors:
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Reabertura e segmento truncado conferidos{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
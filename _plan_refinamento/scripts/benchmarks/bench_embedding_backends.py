@@ -0,0 +1,83 @@
+"""
+Benchmark: throughput em CPU dos backends de embeddings (torch, onnx, onnx-int8)
+
+Gera embeddings, sem cache, para os campos titulo, resumo e conteudo_inicio
+de test_dataset.csv com cada backend (ver utils/embedding_backends), nas
+mesmas condições: batches por comprimento com o mesmo orçamento de tokens,
+cada backend com as threads padrão (todos os núcleos). A primeira execução
+de um backend ONNX inclui a exportação do modelo, que não entra na medição.
+Requer sentence-transformers (e o extra onnx para os backends ONNX).
+Executar com: python scripts/benchmarks/bench_embedding_backends.py [--limit N] [--backends ...]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    DATA_DIR, EMBEDDING_MODEL, EMBEDDING_REVISION, EMBEDDING_MODELS_DIR, EMBEDDING_BATCH_SIZE, export_env
+)
+from utils.embedding_backends import BACKENDS, load_model
+from utils.embedding_batching import encode_bucketed
+from utils.embedding_corpus import field_texts
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+FIELDS = ("titulo", "resumo", "conteudo_inicio")
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Throughput em CPU dos backends de embeddings")
+    parser.add_argument("--limit", type=int, default=500, help="Notícias usadas (padrão: 500)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: backends de embeddings em CPU{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        print(f"{Fore.RED}❌ sentence-transformers não instalado{Style.RESET_ALL}")
+        return 1
+
+    texts = field_texts(DATA_DIR / "test_dataset.csv", FIELDS, args.limit)
+    print(f"Textos: {len(texts):,} ({', '.join(FIELDS)} de {args.limit} notícias)\n")
+
+    timings = {}
+    for backend in args.backends:
+        try:
+            model = load_model(EMBEDDING_MODEL, backend, device="cpu", revision=EMBEDDING_REVISION or None,
+                               models_dir=EMBEDDING_MODELS_DIR)
+        except ImportError as e:
+            print(f"{Fore.YELLOW}⚠ {backend}: {e}{Style.RESET_ALL}")
+            continue
+
+        token_budget = EMBEDDING_BATCH_SIZE * model.max_seq_length
+        encode_bucketed(model, texts[:EMBEDDING_BATCH_SIZE], token_budget)  # aquecimento
+        start = time.perf_counter()
+        encode_bucketed(model, texts, token_budget)
+        timings[backend] = time.perf_counter() - start
+        print(f"{backend:10s} {timings[backend]:7.2f} s  ({len(texts) / timings[backend]:6.1f} textos/s)")
+
+    if "torch" not in timings or len(timings) < 2:
+        print(f"\n{Fore.RED}✗ Sem backends suficientes para comparar{Style.RESET_ALL}")
+        return 1
+
+    print()
+    for backend, elapsed in timings.items():
+        if backend != "torch":
+            print(f"{Fore.GREEN}✓ {backend}: {timings['torch'] / elapsed:.2f}x o throughput do torch{Style.RESET_ALL}")
+    print("Paridade dos vetores: python scripts/validacao/02_check_embedding_backends.py")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark: batches por comprimento vs. batches fixos na geração de embeddings
+
+Gera embeddings (CPU, sem cache) para os campos titulo, resumo e
+conteudo_inicio de test_dataset.csv, misturados como numa chamada real:
+
+- batches fixos: SentenceTransformer.encode(batch_size=32), caminho anterior
+  de EmbeddingGenerator.encode (o próprio encode já ordena por número de
+  caracteres dentro da chamada)
+- por comprimento: encode_bucketed, com textos ordenados pelo comprimento
+  tokenizado e batches sob o orçamento de tokens batch_size × max_seq_length
+
+Informa textos/s e tokens processados com padding (incluindo a ordem
+original sem nenhuma ordenação, como referência) e confere que os vetores
+são os mesmos (cosseno ≥ 0.9999). Requer sentence-transformers.
+Executar com: python scripts/benchmarks/bench_embedding_batching.py [--limit N] [--threads N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import DATA_DIR, EMBEDDING_MODEL, export_env
+from utils.embedding_batching import encode_bucketed, padded_tokens, plan_batches, token_lengths
+from utils.embedding_corpus import field_texts
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+BATCH_SIZE = 32
+FIELDS = ("titulo", "resumo", "conteudo_inicio")
+MIN_COSINE = 0.9999
+
+
+def fixed_batches(order: np.ndarray):
+    return [order[i:i + BATCH_SIZE] for i in range(0, len(order), BATCH_SIZE)]
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Batches por comprimento vs. batches fixos (CPU)")
+    parser.add_argument("--limit", type=int, default=500, help="Notícias usadas (padrão: 500)")
+    parser.add_argument("--threads", type=int, default=0, help="Threads do torch (padrão: do sistema)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: batches por comprimento na geração de embeddings (CPU){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print(f"{Fore.RED}❌ sentence-transformers não instalado{Style.RESET_ALL}")
+        return 1
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts = field_texts(DATA_DIR / "test_dataset.csv", FIELDS, args.limit)
+    model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    token_budget = BATCH_SIZE * model.max_seq_length
+    print(f"Modelo: {EMBEDDING_MODEL} (max_seq_length {model.max_seq_length}, {torch.get_num_threads()} threads)")
+    print(f"Textos: {len(texts):,} ({', '.join(FIELDS)} de {args.limit} notícias)\n")
+
+    # Tokens com padding de cada estratégia
+    lengths = token_lengths(model, texts)
+    by_chars = np.argsort([-len(text) for text in texts], kind='stable')
+    bucketed = plan_batches(lengths, token_budget)
+    print(f"Tokens reais:                    {int(lengths.sum()):>10,}")
+    print(f"Com padding, ordem original:     {padded_tokens(lengths, fixed_batches(np.arange(len(texts)))):>10,}")
+    print(f"Com padding, batches fixos:      {padded_tokens(lengths, fixed_batches(by_chars)):>10,}"
+          f"  ({-(-len(texts) // BATCH_SIZE)} batches)")
+    print(f"Com padding, por comprimento:    {padded_tokens(lengths, bucketed):>10,}  ({len(bucketed)} batches)\n")
+
+    # Aquecimento (alocações e threads do torch)
+    model.encode(texts[:BATCH_SIZE], batch_size=BATCH_SIZE)
+
+    start = time.perf_counter()
+    fixed = model.encode(texts, batch_size=BATCH_SIZE, convert_to_numpy=True)
+    t_fixed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ours = encode_bucketed(model, texts, token_budget)
+    t_ours = time.perf_counter() - start
+
+    print(f"batches fixos      {t_fixed:7.2f} s  ({len(texts) / t_fixed:6.1f} textos/s)")
+    print(f"por comprimento    {t_ours:7.2f} s  ({len(texts) / t_ours:6.1f} textos/s)")
+
+    cosine = np.sum(fixed * ours, axis=1) / (np.linalg.norm(fixed, axis=1) * np.linalg.norm(ours, axis=1))
+    if cosine.min() < MIN_COSINE:
+        print(f"{Fore.RED}✗ Vetores divergem: cosseno mínimo {cosine.min():.6f} < {MIN_COSINE}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Mesmos vetores (cosseno mínimo {cosine.min():.6f}); "
+          f"por comprimento {t_fixed / t_ours:.2f}x mais rápido{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
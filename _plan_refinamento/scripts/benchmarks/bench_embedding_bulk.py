@@ -0,0 +1,99 @@
+"""
+Benchmark: consulta em lote (get_many/put_many) vs. laço por texto
+
+Reproduz a parte de cache de EmbeddingGenerator.encode para N textos, com
+90% já no cache e 10% novos (vetores sintéticos no lugar do modelo):
+
+- por texto: get por texto com lista de placeholders, put por texto para os
+  novos e np.array no final (caminho anterior)
+- em lote: text_keys (um hash por texto), get_many numa matriz pré-alocada e
+  put_many dos novos em uma passada
+
+Confere que os dois caminhos devolvem a mesma matriz.
+Executar com: python scripts/benchmarks/bench_embedding_bulk.py [N]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_store import EmbeddingStore, text_key, text_keys
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 768
+CACHED = 0.9
+
+
+def per_text(store: EmbeddingStore, texts, new_vectors) -> np.ndarray:
+    embeddings, missing = [], []
+    for i, text in enumerate(texts):
+        cached = store.get(text_key(text))
+        if cached is not None:
+            embeddings.append(cached)
+        else:
+            missing.append(i)
+            embeddings.append(None)
+    for i, vector in zip(missing, new_vectors):
+        store.put(text_key(texts[i]), vector)
+        embeddings[i] = vector
+    return np.array(embeddings)
+
+
+def bulk(store: EmbeddingStore, texts, new_vectors) -> np.ndarray:
+    keys = text_keys(texts)
+    embeddings, found = store.get_many(keys, DIM)
+    missing = np.flatnonzero(~found)
+    embeddings[missing] = new_vectors
+    store.put_many(keys[missing], new_vectors)
+    return embeddings
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: cache de embeddings em lote ({n:,} textos, {CACHED:.0%} em cache){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    rng = np.random.default_rng(0)
+    texts = [f"notícia {i}: texto de exemplo" for i in range(n)]
+    cached = rng.random(n) < CACHED
+    vectors = rng.standard_normal((n, DIM), dtype=np.float32)
+    new_vectors = vectors[~cached]
+
+    timings, results = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, method in (("por texto", per_text), ("em lote", bulk)):
+            store = EmbeddingStore(Path(tmp) / label)
+            store.put_many(text_keys([t for t, c in zip(texts, cached) if c]), vectors[cached])
+            store.compact()
+
+            start = time.perf_counter()
+            results[label] = method(store, texts, new_vectors)
+            timings[label] = time.perf_counter() - start
+
+    for label, elapsed in timings.items():
+        print(f"{label:10s} {elapsed * 1000:9.1f} ms  ({elapsed / n * 1e6:.2f} µs/texto)")
+
+    if not np.array_equal(results["por texto"], results["em lote"]):
+        print(f"{Fore.RED}✗ Caminhos devolvem matrizes diferentes{Style.RESET_ALL}")
+        return 1
+    if not np.array_equal(results["em lote"], vectors):
+        print(f"{Fore.RED}✗ Matriz em lote difere dos vetores esperados{Style.RESET_ALL}")
+        return 1
+
+    speedup = timings["por texto"] / timings["em lote"]
+    print(f"\n{Fore.GREEN}✓ Mesma matriz; em lote {speedup:.1f}x mais rápido{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark: embeddings de documentos longos em trechos (encode_long)
+
+Gera, em um cache temporário, os vetores do conteúdo completo das notícias
+de test_dataset.csv (título + conteudo; conteudo_inicio em datasets sem a
+coluna) com EmbeddingGenerator.encode_long e mede:
+
+- geração a frio, trechos por documento e tokens cobertos além do limite
+  do modelo (o que a geração truncada descartaria);
+- a mesma chamada de novo: nenhum trecho gerado;
+- cada notícia editada (uma frase inserida no meio): só os trechos novos
+  são gerados, e a média de trechos novos por notícia fica no limite;
+- concordância entre os modos de pooling (mean, max, first-k) e o vetor
+  truncado.
+
+Requer sentence-transformers.
+Executar com: python scripts/benchmarks/bench_embedding_chunks.py [--limit N] [--max-new 3.0]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    DATA_DIR, EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_MODELS_DIR,
+    EMBEDDING_CHUNK_TOKENS, EMBEDDING_CHUNK_OVERLAP, export_env
+)
+from utils.embedding_chunks import POOLING_MODES
+from utils.embedding_corpus import content_texts
+from utils.embedding_utils import EmbeddingGenerator
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+EDIT = " Nota da redação: esta notícia foi atualizada com novas informações."
+
+
+def edited(text: str) -> str:
+    """Texto com uma frase inserida depois da frase do meio"""
+    middle = text.find(". ", len(text) // 2)
+    if middle < 0:
+        return text + EDIT
+    return text[:middle + 1] + EDIT + text[middle + 1:]
+
+
+def row_cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Embeddings de documentos longos em trechos")
+    parser.add_argument("--dataset", type=Path, default=DATA_DIR / "test_dataset.csv", help="CSV de notícias")
+    parser.add_argument("--limit", type=int, default=200, help="Notícias usadas (padrão: 200)")
+    parser.add_argument("--max-new", type=float, default=3.0,
+                        help="Máximo de trechos novos por notícia editada, em média (padrão: 3.0)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: documentos longos em trechos (encode_long){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        print(f"{Fore.RED}❌ sentence-transformers não instalado{Style.RESET_ALL}")
+        return 1
+
+    texts = content_texts(args.dataset)[:args.limit]
+    errors = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = EmbeddingGenerator(
+            EMBEDDING_MODEL, cache_dir=Path(tmp), device="cpu", backend=EMBEDDING_BACKEND,
+            models_dir=EMBEDDING_MODELS_DIR, chunk_tokens=EMBEDDING_CHUNK_TOKENS,
+            chunk_overlap=EMBEDDING_CHUNK_OVERLAP
+        )
+        stats = generator.cache.stats
+        chunks = generator.chunker.split(texts)
+        counts = np.array([len(doc) for doc in chunks])
+        tokens = np.array([sum(chunk.tokens for chunk in doc) for doc in chunks])
+        limit = generator.model.max_seq_length - 2
+        print(f"Notícias: {len(texts):,}, trechos de {EMBEDDING_CHUNK_TOKENS} tokens "
+              f"(sobreposição {EMBEDDING_CHUNK_OVERLAP})")
+        print(f"Trechos por notícia: média {counts.mean():.1f}, máx. {counts.max()}")
+        print(f"Tokens além do limite do modelo ({limit}): "
+              f"{np.maximum(tokens - limit, 0).sum() / tokens.sum():.0%} do conteúdo\n")
+
+        start = time.perf_counter()
+        vectors = {"mean": generator.encode_long(texts, pooling="mean", show_progress=False)}
+        cold = time.perf_counter() - start
+        cold_encoded = stats.encoded
+        print(f"A frio:     {cold:7.2f} s  ({cold_encoded:,} trechos gerados)")
+
+        # Os outros modos de pooling só combinam os mesmos trechos, já em cache
+        start = time.perf_counter()
+        for mode in POOLING_MODES[1:]:
+            vectors[mode] = generator.encode_long(texts, pooling=mode, show_progress=False)
+        warm = (time.perf_counter() - start) / len(POOLING_MODES[1:])
+        print(f"Em cache:   {warm:7.2f} s  ({stats.encoded - cold_encoded:,} trechos gerados)")
+        if stats.encoded != cold_encoded:
+            errors.append("trechos gerados de novo com tudo em cache")
+
+        changed = [edited(text) for text in texts]
+        old = {chunk.text for doc in chunks for chunk in doc}
+        new = {chunk.text for doc in generator.chunker.split(changed) for chunk in doc} - old
+        before = stats.encoded
+        start = time.perf_counter()
+        generator.encode_long(changed, show_progress=False)
+        edit_seconds = time.perf_counter() - start
+        reencoded = stats.encoded - before
+        per_doc = reencoded / len(texts)
+        print(f"Editadas:   {edit_seconds:7.2f} s  ({reencoded:,} trechos gerados, "
+              f"{per_doc:.1f} por notícia, de {counts.mean():.1f})")
+        if reencoded != len(new):
+            errors.append(f"{reencoded} trechos gerados após a edição, {len(new)} novos")
+        if per_doc > args.max_new:
+            errors.append(f"{per_doc:.1f} trechos novos por notícia editada (máx. {args.max_new})")
+
+        truncated = generator.encode(texts, show_progress=False)
+        print()
+        for mode in POOLING_MODES:
+            cosines = row_cosines(vectors[mode], truncated)
+            print(f"  {mode:8s} cosseno com o vetor truncado: médio {cosines.mean():.3f}, mín. {cosines.min():.3f}")
+        print(f"\nCache: {generator.summary()}")
+        generator.close()
+
+    if errors:
+        print()
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Só os trechos novos foram gerados após a edição ({per_doc:.1f} por notícia){Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
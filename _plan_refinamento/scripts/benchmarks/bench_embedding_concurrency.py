@@ -0,0 +1,146 @@
+"""
+Teste de estresse: store de embeddings compartilhado entre processos
+
+N processos "codificam" conjuntos sobrepostos de textos contra o mesmo
+diretório de cache (get → put dos ausentes → flush, com compactações
+frequentes), enquanto um processo leitor busca vetores continuamente. O
+vetor de cada texto é determinístico (derivado da chave), então qualquer
+vetor lido pode ser conferido.
+
+Ao final, o store reaberto deve conter exatamente os textos únicos, todos
+com o vetor correto, sem temporários nem segmentos órfãos após compactar.
+Executar com: python scripts/benchmarks/bench_embedding_concurrency.py [N]
+"""
+
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_store import EmbeddingStore, text_key
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 64
+TEXTS_PER_WORKER = 3000
+OVERLAP = 0.5          # fração dos textos compartilhada com o worker seguinte
+CHUNK = 100
+COMPACT_MIN_ENTRIES = 1500
+
+
+def expected_vector(key: int) -> np.ndarray:
+    return np.random.default_rng(key).standard_normal(DIM, dtype=np.float32)
+
+
+def worker_texts(worker: int) -> list:
+    step = int(TEXTS_PER_WORKER * (1 - OVERLAP))
+    start = worker * step
+    return [f"texto {i}" for i in range(start, start + TEXTS_PER_WORKER)]
+
+
+def writer(store_dir: str, worker: int, errors) -> None:
+    store = EmbeddingStore(Path(store_dir), compact_min_entries=COMPACT_MIN_ENTRIES)
+    texts = worker_texts(worker)
+    for start in range(0, len(texts), CHUNK):
+        for text in texts[start:start + CHUNK]:
+            key = text_key(text)
+            vector = store.get(key)
+            if vector is None:
+                store.put(key, expected_vector(key))
+            elif not np.array_equal(vector, expected_vector(key)):
+                errors.put(f"worker {worker}: vetor incorreto para '{text}'")
+        store.flush()
+    store.close()
+
+
+def reader(store_dir: str, n_texts: int, stop, errors, counter) -> None:
+    store = EmbeddingStore(Path(store_dir))
+    rng = np.random.default_rng(1)
+    reads = 0
+    while not stop.is_set():
+        key = text_key(f"texto {rng.integers(0, n_texts)}")
+        vector = store.get(key)
+        if vector is not None:
+            reads += 1
+            if not np.array_equal(vector, expected_vector(key)):
+                errors.put(f"leitor: vetor incorreto para chave {key}")
+    counter.value = reads
+
+
+def main():
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Estresse: {n_workers} processos gravando no mesmo store de embeddings{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    unique = {text for w in range(n_workers) for text in worker_texts(w)}
+    errors = mp.Queue()
+    problems = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = str(Path(tmp) / "store")
+
+        stop = mp.Event()
+        reads = mp.Value('i', 0)
+        read_proc = mp.Process(target=reader, args=(store_dir, len(unique), stop, errors, reads))
+        read_proc.start()
+
+        start = time.perf_counter()
+        workers = [mp.Process(target=writer, args=(store_dir, w, errors)) for w in range(n_workers)]
+        for proc in workers:
+            proc.start()
+        for proc in workers:
+            proc.join()
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        read_proc.join()
+
+        for proc in workers + [read_proc]:
+            if proc.exitcode != 0:
+                problems.append(f"processo {proc.pid} terminou com código {proc.exitcode}")
+        while not errors.empty():
+            problems.append(errors.get())
+
+        # Conferência final: todos os textos únicos, com o vetor correto
+        store = EmbeddingStore(Path(store_dir))
+        if len(store) != len(unique):
+            problems.append(f"store com {len(store)} vetores, esperado {len(unique)}")
+        wrong = sum(
+            1 for text in unique
+            if not np.array_equal(store.get(text_key(text)), expected_vector(text_key(text)))
+        )
+        if wrong:
+            problems.append(f"{wrong} vetores ausentes ou incorretos")
+
+        # Sem escritores ativos, a compactação incorpora todos os segmentos
+        store.compact()
+        leftovers = list(store.segments_dir.glob("seg-*.log")) + list(Path(store_dir).rglob("*.tmp"))
+        if leftovers:
+            problems.append(f"arquivos restantes após compactar: {[p.name for p in leftovers]}")
+        if len(EmbeddingStore(Path(store_dir))) != len(unique):
+            problems.append("contagem mudou após compactação final")
+
+    print(f"Textos únicos:        {len(unique):,} ({n_workers} x {TEXTS_PER_WORKER:,}, sobreposição {OVERLAP:.0%})")
+    print(f"Tempo dos escritores: {elapsed:.2f} s")
+    print(f"Leituras conferidas:  {reads.value:,}")
+
+    if problems:
+        for problem in problems[:20]:
+            print(f"{Fore.RED}✗ {problem}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Store íntegro: nenhum vetor perdido ou corrompido{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
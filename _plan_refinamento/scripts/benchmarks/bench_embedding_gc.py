@@ -0,0 +1,148 @@
+"""
+Benchmark: coleta de lixo do store de embeddings com leitores ativos
+
+Monta um store com N vetores, dos quais apenas uma fração continua
+alcançável, e roda EmbeddingStore.retain em várias rodadas (cada uma
+descartando mais vetores) enquanto processos leitores abrem o store e
+buscam vetores sem parar. Cada vetor carrega a própria chave na primeira
+coordenada, então qualquer leitura de linha errada durante a troca de
+geração é detectada. Informa bytes liberados e o tempo de carga (abrir +
+ler os vetores alcançáveis) antes e depois.
+Executar com: python scripts/benchmarks/bench_embedding_gc.py [N]
+"""
+
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_namespace import disk_size
+from utils.embedding_store import EmbeddingStore
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 384
+REACHABLE = 0.3
+ROUNDS = 4
+READERS = 2
+
+
+def make_vectors(keys: np.ndarray) -> np.ndarray:
+    rng = np.random.default_rng(int(keys[0]))
+    vectors = rng.standard_normal((len(keys), DIM), dtype=np.float32)
+    vectors[:, 0] = keys
+    return vectors
+
+
+def reader(store_dir: str, keys: np.ndarray, reachable: np.ndarray, stop, errors, lookups) -> None:
+    """Reabre o store e busca chaves sem parar; confere a chave gravada no vetor"""
+    rng = np.random.default_rng()
+    count = 0
+    store = EmbeddingStore(Path(store_dir))
+    while not stop.is_set():
+        if rng.random() < 0.2:
+            store.close()
+            store = EmbeddingStore(Path(store_dir))
+        wanted = keys[rng.integers(0, len(keys), 256)]
+        vectors, found = store.get_many(wanted, DIM)
+        count += len(wanted)
+        if np.any(vectors[found, 0] != wanted[found]):
+            errors.put("vetor de outra chave lido durante a coleta")
+            return
+        must = np.isin(wanted, reachable)
+        if not found[must].all():
+            errors.put("vetor alcançável não encontrado")
+            return
+    store.close()
+    lookups.put(count)
+
+
+def load_time(store_dir: Path, keys: np.ndarray) -> float:
+    start = time.perf_counter()
+    store = EmbeddingStore(store_dir)
+    _, found = store.get_many(keys)
+    elapsed = time.perf_counter() - start
+    assert found.all()
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: coleta de lixo do cache ({n:,} vetores, {READERS} leitores){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    rng = np.random.default_rng(0)
+    keys = np.arange(1, n + 1, dtype=np.uint64)
+    reachable = np.sort(rng.choice(keys, int(n * REACHABLE), replace=False))
+    # Rodadas cada vez mais restritivas, todas preservando os alcançáveis
+    rank = rng.random(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = Path(tmp)
+        store = EmbeddingStore(store_dir)
+        store.put_many(keys, make_vectors(keys))
+        store.compact()
+        store.close()
+
+        before_bytes = disk_size(store_dir)
+        before_time = load_time(store_dir, reachable)
+
+        stop, errors, lookups = mp.Event(), mp.Queue(), mp.Queue()
+        procs = [mp.Process(target=reader, args=(str(store_dir), keys, reachable, stop, errors, lookups))
+                 for _ in range(READERS)]
+        for p in procs:
+            p.start()
+        time.sleep(0.3)
+
+        removed, gc_times = 0, []
+        store = EmbeddingStore(store_dir)
+        for r in range(1, ROUNDS + 1):
+            keep = np.union1d(reachable, keys[rank < 1 - r / ROUNDS])
+            start = time.perf_counter()
+            removed += store.retain(keep)
+            gc_times.append(time.perf_counter() - start)
+            time.sleep(0.2)
+        store.close()
+
+        stop.set()
+        total_lookups = sum(lookups.get(timeout=30) for _ in procs if errors.empty())
+        for p in procs:
+            p.join()
+
+        after_bytes = disk_size(store_dir)
+        after_time = load_time(store_dir, reachable)
+        remaining = len(EmbeddingStore(store_dir))
+
+    failures = []
+    while not errors.empty():
+        failures.append(errors.get())
+    if removed != n - len(reachable) or remaining != len(reachable):
+        failures.append(f"{removed:,} descartados / {remaining:,} restantes; esperado "
+                        f"{n - len(reachable):,} / {len(reachable):,}")
+
+    print(f"Coletas: {', '.join(f'{t * 1000:.0f} ms' for t in gc_times)}")
+    print(f"Leituras concorrentes: {total_lookups:,}")
+    print(f"Tamanho: {before_bytes / 2**20:.1f} MB → {after_bytes / 2**20:.1f} MB "
+          f"({(before_bytes - after_bytes) / 2**20:.1f} MB liberados)")
+    print(f"Carga ({len(reachable):,} vetores): {before_time * 1000:.1f} ms → {after_time * 1000:.1f} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"{Fore.RED}✗ {failure}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ {removed:,} vetores descartados sem leituras incorretas{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark: escalabilidade do pool de processos de embeddings em CPU
+
+Gera embeddings, sem cache, para os campos titulo, resumo e
+conteudo_inicio de test_dataset.csv (repetidos para chegar a volume de
+corpus) com o EncodingPool em 1, 2, 4 e 8 processos, cada um com
+núcleos / processos threads intra-op. O carregamento dos modelos fica fora
+da medição. Informa textos/s, ganho e eficiência por processo, e confere
+que os vetores batem com os de 1 processo (cosseno ≥ 0.9999).
+Requer sentence-transformers.
+Executar com: python scripts/benchmarks/bench_embedding_pool.py [--limit N] [--repeat N] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import DATA_DIR, EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_MODELS_DIR, export_env
+from utils.embedding_corpus import field_texts
+from utils.embedding_pool import CHUNK_SIZE, EncodingPool
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+FIELDS = ("titulo", "resumo", "conteudo_inicio")
+MIN_COSINE = 0.9999
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Escalabilidade do pool de processos de embeddings")
+    parser.add_argument("--limit", type=int, default=500, help="Notícias usadas (padrão: 500)")
+    parser.add_argument("--repeat", type=int, default=4, help="Repetições dos textos (padrão: 4)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Tamanhos do pool")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: pool de processos de embeddings (CPU, {os.cpu_count()} núcleos){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        print(f"{Fore.RED}❌ sentence-transformers não instalado{Style.RESET_ALL}")
+        return 1
+
+    texts = field_texts(DATA_DIR / "test_dataset.csv", FIELDS, args.limit) * args.repeat
+    print(f"Textos: {len(texts):,} (backend {EMBEDDING_BACKEND})\n")
+
+    timings, reference, worst = {}, None, 1.0
+    for workers in args.workers:
+        with EncodingPool(EMBEDDING_MODEL, workers, backend=EMBEDDING_BACKEND,
+                          models_dir=EMBEDDING_MODELS_DIR) as pool:
+            # Aquecimento: uma fatia por processo carrega os modelos
+            pool.encode(texts[:2 * workers * CHUNK_SIZE])
+
+            start = time.perf_counter()
+            vectors = pool.encode(texts)
+            timings[workers] = time.perf_counter() - start
+
+        if reference is None:
+            reference = vectors
+        cosine = np.sum(reference * vectors, axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(vectors, axis=1))
+        worst = min(worst, float(cosine.min()))
+
+        base = timings[args.workers[0]] * args.workers[0]
+        speedup = timings[args.workers[0]] / timings[workers]
+        print(f"{workers:2d} processo(s) × {pool.threads:2d} threads  {timings[workers]:7.2f} s  "
+              f"{len(texts) / timings[workers]:7.1f} textos/s  {speedup:5.2f}x  "
+              f"eficiência {base / (timings[workers] * workers):5.0%}")
+
+    if worst < MIN_COSINE:
+        print(f"\n{Fore.RED}✗ Vetores divergem entre tamanhos de pool: cosseno mínimo {worst:.6f}{Style.RESET_ALL}")
+        return 1
+
+    best = min(timings, key=timings.get)
+    print(f"\n{Fore.GREEN}✓ Mesmos vetores em todos os tamanhos; melhor: {best} processo(s), "
+          f"{timings[args.workers[0]] / timings[best]:.2f}x{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark: inicialização de uma análise de similaridade com tudo em cache
+
+Preenche um cache temporário (namespace da configuração atual, vetores
+sintéticos) com as descrições da árvore e mede, em um processo novo, o
+tempo total de uma execução no padrão de 02_analyze_similarity.py: importar
+utils.embedding_utils, criar o EmbeddingGenerator e gerar os embeddings de
+cada grupo de irmãos L2 e L3. Confere que o modelo não foi carregado e que
+torch nem foi importado, e falha se o tempo passar do orçamento.
+Executar com: python scripts/benchmarks/bench_embedding_startup.py [--budget 1.0]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE, EMBEDDING_MODEL, EMBEDDING_STORAGE
+from utils.embedding_corpus import node_descriptions
+from utils.embedding_namespace import EmbeddingNamespace
+from utils.embedding_store import text_keys
+from utils.theme_columns import ThemeColumns
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 768
+
+# Executado em um processo novo: mede desde antes do import
+CACHED_RUN = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.append({scripts!r})
+from utils.embedding_utils import EmbeddingGenerator
+from utils.theme_columns import ThemeColumns
+
+gen = EmbeddingGenerator({model!r}, cache_dir=__import__('pathlib').Path({cache!r}), device="cpu",
+                         storage={storage!r})
+cols = ThemeColumns.from_file({themes!r})
+for level in ("L1", "L2"):
+    for row in cols.level_range(level):
+        rows = cols.children_range(row)
+        if len(rows) > 1:
+            gen.encode(cols.descriptions_in(rows), show_progress=False)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "model_loaded": gen.model_loaded,
+                  "torch": "torch" in sys.modules, "summary": gen.summary()}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inicialização de execução com embeddings em cache")
+    parser.add_argument("--budget", type=float, default=1.0, help="Tempo máximo em segundos (padrão: 1.0)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: inicialização com embeddings em cache{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    texts = node_descriptions(ThemeColumns.from_file(THEMES_FILE))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingNamespace(EMBEDDING_MODEL, storage=EMBEDDING_STORAGE).open_store(Path(tmp))
+        rng = np.random.default_rng(0)
+        store.put_many(text_keys(texts), rng.standard_normal((len(texts), DIM), dtype=np.float32))
+        store.close()
+
+        code = CACHED_RUN.format(scripts=str(Path(__file__).parent.parent), model=EMBEDDING_MODEL, cache=tmp,
+                                 storage=EMBEDDING_STORAGE, themes=str(THEMES_FILE))
+        runs = []
+        for _ in range(3):
+            proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{Fore.RED}✗ Execução falhou:\n{proc.stderr}{Style.RESET_ALL}")
+                return 1
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    best = min(run['seconds'] for run in runs)
+    print(f"Execução em cache: {best * 1000:.0f} ms (melhor de {len(runs)})")
+    print(f"Cache: {runs[-1]['summary']}")
+
+    errors = []
+    if any(run['model_loaded'] for run in runs):
+        errors.append("modelo carregado com todos os textos em cache")
+    if any(run['torch'] for run in runs):
+        errors.append("torch importado com todos os textos em cache")
+    if best > args.budget:
+        errors.append(f"{best:.2f}s acima do orçamento de {args.budget:.2f}s")
+    if errors:
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Sem carregar modelo nem torch, dentro de {args.budget:.2f}s{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark: store memmap de embeddings vs. dicionário em pickle
+
+Compara a abertura do cache e as buscas no formato antigo (pickle de um dict
+md5 → ndarray, carregado inteiro na inicialização) e no store memmap
+(matriz .npy + índice ordenado), para um cache sintético de N vetores.
+Executar com: python scripts/benchmarks/bench_embedding_store.py [N]
+"""
+
+import hashlib
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_store import EmbeddingStore, text_key
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 768
+LOOKUPS = 2000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: store memmap de embeddings ({n:,} vetores x {DIM}){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    rng = np.random.default_rng(0)
+    texts = [f"texto {i}" for i in range(n)]
+    vectors = rng.standard_normal((n, DIM), dtype=np.float32)
+    queries = [texts[i] for i in rng.integers(0, n, LOOKUPS)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # Formato antigo: dict md5 → ndarray em pickle
+        pickle_file = tmp / "embeddings.pkl"
+        with open(pickle_file, 'wb') as f:
+            pickle.dump({hashlib.md5(t.encode()).hexdigest(): v for t, v in zip(texts, vectors)}, f)
+
+        start = time.perf_counter()
+        with open(pickle_file, 'rb') as f:
+            cache = pickle.load(f)
+        t_pickle_open = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in queries:
+            cache.get(hashlib.md5(text.encode()).hexdigest())
+        t_pickle_get = time.perf_counter() - start
+        del cache
+
+        # Store memmap
+        store = EmbeddingStore(tmp / "store")
+        for text, vector in zip(texts, vectors):
+            store.put(text_key(text), vector)
+        start = time.perf_counter()
+        store.compact()
+        t_flush = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = EmbeddingStore(tmp / "store")
+        t_store_open = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in queries:
+            store.get(text_key(text))
+        t_store_get = time.perf_counter() - start
+
+        # Conferência: vetores idênticos e views sem cópia
+        for i in rng.integers(0, n, 100):
+            vector = store.get(text_key(texts[i]))
+            assert np.array_equal(vector, vectors[i]), f"Vetor {i} difere"
+            assert not vector.flags.owndata, "Busca deveria devolver view"
+
+        size_pickle = pickle_file.stat().st_size
+        size_store = sum(p.stat().st_size for p in (tmp / "store").rglob("*") if p.is_file())
+
+    print(f"{'':22s} {'pickle':>12s} {'memmap':>12s}")
+    print(f"{'Abertura':22s} {t_pickle_open * 1000:10.1f}ms {t_store_open * 1000:10.2f}ms")
+    print(f"{f'{LOOKUPS} buscas':22s} {t_pickle_get * 1000:10.1f}ms {t_store_get * 1000:10.1f}ms")
+    print(f"{'Tamanho em disco':22s} {size_pickle / 1e6:10.1f}MB {size_store / 1e6:10.1f}MB")
+    print(f"\nGravação inicial do store: {t_flush * 1000:.0f} ms")
+
+    if t_store_open > 0:
+        print(f"\n{Fore.GREEN}Abertura: {t_pickle_open / t_store_open:.0f}x mais rápida{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Benchmark: camada LRU em memória à frente do store de embeddings
+
+Busca repetidamente um conjunto "quente" de textos (distribuição de Zipf,
+como consultas recorrentes a nós da árvore) em um store int8 — onde cada
+leitura do store dequantiza o vetor — com e sem a camada LRU. Confere que
+a memória da camada nunca passa da capacidade e que os contadores batem.
+Repete as buscas em lotes com EmbeddingCache.get_many, que também consulta
+a camada e promove para ela os acertos do store.
+Executar com: python scripts/benchmarks/bench_embedding_tier.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.embedding_namespace import EmbeddingNamespace
+from utils.embedding_store import EmbeddingStore
+from utils.embedding_utils import EmbeddingCache
+from utils.embedding_tier import CacheStats, LRUTier
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+DIM = 768
+N = 20_000
+LOOKUPS = 50_000
+CAPACITY_MB = 8
+BATCH = 500
+
+
+def lookup(store: EmbeddingStore, tier: LRUTier, key: int):
+    """Mesma sequência de EmbeddingCache.get: memória → store → memória"""
+    vector = tier.get(key)
+    if vector is not None:
+        tier.stats.memory_hits += 1
+        return vector
+    vector = store.get(key)
+    if vector is None:
+        tier.stats.misses += 1
+        return None
+    tier.stats.store_hits += 1
+    tier.put(key, vector)
+    return vector
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: camada LRU do cache de embeddings ({LOOKUPS:,} buscas, Zipf){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    rng = np.random.default_rng(0)
+    keys = rng.integers(1, 2**63, N, dtype=np.uint64).tolist()
+    queries = [keys[(i - 1) % N] for i in rng.zipf(1.2, LOOKUPS)]
+    errors = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore(Path(tmp), 'int8')
+        for key, vector in zip(keys, rng.standard_normal((N, DIM), dtype=np.float32)):
+            store.put(key, vector)
+        store.compact()
+
+        results = {}
+        for label, capacity in (("sem camada", 0), (f"LRU {CAPACITY_MB} MB", CAPACITY_MB * 1024 * 1024)):
+            tier = LRUTier(capacity, CacheStats())
+            peak = 0
+            start = time.perf_counter()
+            for key in queries:
+                lookup(store, tier, key)
+                peak = max(peak, tier.stats.bytes)
+            results[label] = (time.perf_counter() - start, tier.stats)
+
+            if peak > max(capacity, 0):
+                errors.append(f"{label}: pico de {peak:,} bytes acima da capacidade {capacity:,}")
+            if tier.stats.hits + tier.stats.misses != LOOKUPS:
+                errors.append(f"{label}: contadores não somam {LOOKUPS}")
+
+        # Em lotes: get_many consulta a camada antes do store
+        namespace = EmbeddingNamespace("bench-tier", storage='int8')
+        writer = EmbeddingCache(Path(tmp) / "cache", namespace, memory_mb=0)
+        writer.put_many(np.array(keys, dtype=np.uint64), rng.standard_normal((N, DIM), dtype=np.float32))
+        writer.save()
+        cache = EmbeddingCache(Path(tmp) / "cache", namespace, memory_mb=CAPACITY_MB)
+        batches = np.array(queries, dtype=np.uint64).reshape(-1, BATCH)
+        peak = 0
+        start = time.perf_counter()
+        for batch in batches:
+            vectors, found = cache.get_many(batch, DIM)
+            peak = max(peak, cache.stats.bytes)
+        results[f"get_many x{BATCH}"] = (time.perf_counter() - start, cache.stats)
+
+        expected, _ = cache.store.get_many(batches[-1], DIM)
+        if not found.all() or not np.array_equal(vectors, expected):
+            errors.append("get_many: vetores da camada diferentes dos do store")
+        if not cache.stats.memory_hits:
+            errors.append("get_many: nenhum acerto na camada em memória")
+        if peak > CAPACITY_MB * 1024 * 1024:
+            errors.append(f"get_many: pico de {peak:,} bytes acima da capacidade")
+        if cache.stats.hits + cache.stats.misses != LOOKUPS:
+            errors.append(f"get_many: contadores não somam {LOOKUPS}")
+
+    for label, (elapsed, stats) in results.items():
+        print(f"{label:14s} {elapsed * 1000:8.1f} ms  {stats.summary()}")
+
+    if errors:
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    (t_off, _), (t_on, _), _ = results.values()
+    print(f"\n{Fore.GREEN}✓ LRU: {t_off / t_on:.1f}x mais rápido, memória dentro da capacidade{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
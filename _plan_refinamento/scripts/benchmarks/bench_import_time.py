@@ -0,0 +1,139 @@
+"""
+Benchmark: tempo de import de cada script de entrada
+
+Para cada script das fases (validacao, dataset, classificacao, refinamento,
+entrega, manutencao), importa o módulo em um processo novo com
+python -X importtime, sem executar main(), e soma o tempo cumulativo dos
+imports de topo (descontando o que o interpretador já importa sozinho).
+Falha se algum script passar do orçamento, se algum importar torch,
+sentence_transformers ou tqdm só por ser importado, ou se
+01_validate_structure.py importar PyYAML, numpy ou pandas (a árvore vem do
+snapshot). Scripts cuja dependência opcional não está instalada são
+ignorados.
+Executar com: python scripts/benchmarks/bench_import_time.py [--repeat 3] [--scale 1.0]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+ENTRY_DIRS = ("validacao", "dataset", "classificacao", "refinamento", "entrega", "manutencao")
+
+# Orçamento em ms (-X importtime, que infla um pouco os tempos)
+DEFAULT_BUDGET_MS = 80
+BUDGETS_MS = {
+    "01_validate_structure.py": 30,
+    # numpy
+    "02_analyze_similarity.py": 250,
+    "02_check_embedding_storage.py": 250,
+    "02_check_embedding_backends.py": 250,
+    "cache_embeddings.py": 250,
+    # pandas (e streamlit)
+    "03_collect_news.py": 1000,
+    "03_validate_annotations.py": 1000,
+    "03_annotation_app.py": 2000,
+}
+
+# Nenhum script deve carregar o modelo (nem a barra de progresso) ao ser importado
+FORBIDDEN = ("torch", "sentence_transformers", "tqdm")
+FORBIDDEN_BY_SCRIPT = {
+    "01_validate_structure.py": ("yaml", "numpy", "pandas"),
+}
+
+# Importa o script sem executá-lo como __main__
+IMPORT_CODE = (
+    "import importlib.util, sys; "
+    "spec = importlib.util.spec_from_file_location('entry_script', sys.argv[1]); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)")
+
+
+def import_times(args):
+    """(tempo cumulativo em µs dos imports de topo, módulos importados, processo)"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+    top, modules = {}, set()
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules.add(match.group(3))
+            if len(match.group(2)) == 1:
+                top[match.group(3)] = int(match.group(1))
+    return top, modules, proc
+
+
+def measure(script: Path, baseline: set, repeat: int):
+    """Menor soma (ms) entre as repetições, maiores imports e módulos importados"""
+    best, top, modules = None, {}, set()
+    for _ in range(repeat):
+        times, modules, proc = import_times(["-c", IMPORT_CODE, str(script)])
+        if proc.returncode != 0:
+            return None, {}, set(), proc.stderr
+        times = {name: us for name, us in times.items() if name not in baseline}
+        total = sum(times.values()) / 1000
+        if best is None or total < best:
+            best, top = total, times
+    return best, top, modules, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de import dos scripts de entrada")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por script (padrão: 3)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplicador dos orçamentos (padrão: 1.0)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: tempo de import dos scripts de entrada{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    baseline = set(import_times(["-c", "import importlib.util"])[0])
+    scripts = [path for directory in ENTRY_DIRS
+               for path in sorted((SCRIPTS_DIR / directory).glob("*.py")) if not path.name.startswith("_")]
+
+    errors, checked = [], 0
+    for script in scripts:
+        total, top, modules, stderr = measure(script, baseline, args.repeat)
+        if total is None:
+            missing = re.search(r"No module named '([^'.]+)", stderr)
+            if missing and not (SCRIPTS_DIR / missing.group(1)).exists():
+                print(f"{Fore.YELLOW}⚠ {script.name:34s} ignorado ({missing.group(1)} não instalado){Style.RESET_ALL}")
+                continue
+            errors.append(f"{script.name}: falha ao importar\n{stderr.strip()}")
+            continue
+
+        checked += 1
+        budget = BUDGETS_MS.get(script.name, DEFAULT_BUDGET_MS) * args.scale
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}"
+                             for name, us in sorted(top.items(), key=lambda item: -item[1])[:3])
+        color = Fore.GREEN if total <= budget else Fore.RED
+        print(f"{color}{script.name:36s} {total:6.0f} ms / {budget:4.0f} ms{Style.RESET_ALL}  {heaviest}")
+
+        if total > budget:
+            errors.append(f"{script.name}: {total:.0f} ms acima do orçamento de {budget:.0f} ms")
+        loaded = [name for name in FORBIDDEN + FORBIDDEN_BY_SCRIPT.get(script.name, ()) if name in modules]
+        if loaded:
+            errors.append(f"{script.name}: importa {', '.join(loaded)} ao ser importado")
+
+    if errors:
+        print()
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ {checked} scripts dentro do orçamento de import{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
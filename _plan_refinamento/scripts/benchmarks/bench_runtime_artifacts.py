@@ -0,0 +1,74 @@
+"""
+Benchmark: carga dos artefatos de runtime vs. YAML + indexação
+
+Compara o custo de um consumidor (scraper, portal) obter árvore e tabelas de
+consulta prontas: YAML (libyaml) + ThemeIndex vs. JSON e MessagePack gerados
+por entrega/06_build_runtime_artifacts.py.
+Executar com: python scripts/benchmarks/bench_runtime_artifacts.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.runtime_artifacts import available_formats, build_runtime_artifacts, load_runtime
+from utils.theme_index import ThemeIndex
+from utils.tree_io import load_tree
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+RUNS = 10
+
+
+def median_time(func) -> float:
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: artefatos de runtime da árvore temática{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        manifest = build_runtime_artifacts(THEMES_FILE, output_dir)
+
+        def load_yaml_indexed():
+            index = ThemeIndex(load_tree(THEMES_FILE))
+            return {code: index.label(code) for code in index.codes_at_level('L3')}
+
+        t_yaml = median_time(load_yaml_indexed)
+        print(f"{'YAML + ThemeIndex':24s} {THEMES_FILE.stat().st_size / 1024:6.0f} KB {t_yaml * 1000:8.2f} ms")
+
+        reference = load_runtime(output_dir, 'json')
+        for fmt in available_formats():
+            document = load_runtime(output_dir, fmt)
+            assert document == reference, f"Artefato {fmt} difere do JSON"
+
+            t_fmt = median_time(lambda: load_runtime(output_dir, fmt))
+            t_raw = median_time(lambda: load_runtime(output_dir, fmt, verify=False))
+            size = manifest['artifacts'][fmt]['size']
+            print(f"{fmt + ' (com sha256)':24s} {size / 1024:6.0f} KB {t_fmt * 1000:8.2f} ms"
+                  f"   {Fore.GREEN}{t_yaml / t_fmt:5.1f}x{Style.RESET_ALL}")
+            print(f"{fmt + ' (sem verificação)':24s} {'':9s} {t_raw * 1000:8.2f} ms"
+                  f"   {Fore.GREEN}{t_yaml / t_raw:5.1f}x{Style.RESET_ALL}")
+
+    if 'msgpack' not in available_formats():
+        print(f"\n{Fore.YELLOW}⚠️  msgpack não instalado: apenas JSON medido{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
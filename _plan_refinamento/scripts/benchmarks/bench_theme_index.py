@@ -0,0 +1,93 @@
+"""
+Benchmark: ThemeIndex vs. busca linear (get_node_by_code / get_siblings)
+
+Reproduz o padrão de 03_validate_annotations.validate_hierarchy sobre o
+test_dataset.csv: duas buscas por código (L2 e L3) por linha.
+Executar com: python scripts/benchmarks/bench_theme_index.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import DATA_DIR, THEMES_FILE
+from utils.yaml_utils import load_yaml, get_node_by_code, get_siblings
+from utils.theme_index import ThemeIndex
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+CODE_COLUMNS = [
+    ('L2_anotado', 'L3_anotado'),
+    ('L2_original', 'L3_original'),
+]
+
+
+def collect_lookups(df: pd.DataFrame) -> list:
+    """Pares (L2, L3) por linha, usando anotação ou classificação original"""
+    lookups = []
+    for _, row in df.iterrows():
+        for l2_col, l3_col in CODE_COLUMNS:
+            if pd.notna(row[l2_col]):
+                lookups.append(str(row[l2_col]))
+                if pd.notna(row[l3_col]):
+                    lookups.append(str(row[l3_col]))
+                break
+    return lookups
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: ThemeIndex vs. busca linear{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    tree = load_yaml(THEMES_FILE)
+    df = pd.read_csv(DATA_DIR / "test_dataset.csv", dtype=str)
+    lookups = collect_lookups(df)
+
+    # O dataset tem poucas linhas com código; replicar até cobrir todas as linhas
+    # para simular um dataset totalmente anotado (2 buscas por linha)
+    if lookups:
+        target = 2 * len(df)
+        lookups = (lookups * (target // len(lookups) + 1))[:target]
+
+    print(f"Linhas do dataset: {len(df)}")
+    print(f"Buscas por código: {len(lookups)}\n")
+
+    def linear_lookups():
+        for code in lookups:
+            get_node_by_code(tree, code)
+            get_siblings(tree, code)
+
+    def indexed_lookups():
+        index = ThemeIndex(tree)
+        for code in lookups:
+            index.get_node(code)
+            index.siblings(code)
+
+    t_build = timed(ThemeIndex, tree)
+    t_linear = timed(linear_lookups)
+    t_indexed = timed(indexed_lookups)
+
+    print(f"Construção do ThemeIndex:       {t_build * 1000:8.2f} ms")
+    print(f"Busca linear (get_node_by_code): {t_linear * 1000:8.2f} ms")
+    print(f"ThemeIndex (incl. construção):  {t_indexed * 1000:8.2f} ms")
+    if t_indexed > 0:
+        print(f"\n{Fore.GREEN}Speedup: {t_linear / t_indexed:.1f}x{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
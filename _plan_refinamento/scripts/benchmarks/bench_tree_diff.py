@@ -0,0 +1,112 @@
+"""
+Benchmark: diff entre versões da árvore com códigos deslocados
+
+Monta, a partir da árvore atual, a versão que remove_themes_22_23.py produz:
+um L1 do meio removido e os L1 seguintes renumerados um a menos (com todos
+os descendentes). O diff deve reportar a subárvore removida e todos os
+nós deslocados como renumerações, sem adições nem modificações; com uma
+descrição editada em um nó deslocado, esse nó vira renomeação. Mede também
+o tempo do diff.
+Executar com: python scripts/benchmarks/bench_tree_diff.py
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.tree_diff import diff_trees
+from utils.tree_snapshot import TreeSnapshot
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+RUNS = 5
+
+
+def count_nodes(node: Dict) -> int:
+    return 1 + sum(count_nodes(child) for child in node.get('children', []))
+
+
+def recode(node: Dict, old_prefix: str, new_prefix: str) -> None:
+    """Troca o prefixo do código do nó e dos descendentes"""
+    node['code'] = new_prefix + node['code'][len(old_prefix):]
+    for child in node.get('children', []):
+        recode(child, old_prefix, new_prefix)
+
+
+def shifted_tree(tree: Dict, removed: int) -> Dict:
+    """Árvore sem o L1 na posição removed e com os L1 seguintes deslocados para os códigos anteriores"""
+    shifted = copy.deepcopy(tree)
+    themes: List[Dict] = shifted['themes']
+    codes = [node['code'] for node in themes]
+    del themes[removed]
+    for position in range(removed, len(themes)):
+        recode(themes[position], codes[position + 1], codes[position])
+    return shifted
+
+
+def check(label: str, got: Dict, expected: Dict, errors: List[str]) -> None:
+    status = f"{Fore.GREEN}✓" if got == expected else f"{Fore.RED}✗"
+    print(f"{status} {label}: {got}{Style.RESET_ALL}")
+    if got != expected:
+        errors.append(f"{label}: esperado {expected}")
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: diff da árvore com códigos deslocados{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    tree = TreeSnapshot(THEMES_FILE).load()
+    themes = tree['themes']
+    removed = len(themes) - 3
+    shifted_nodes = sum(count_nodes(node) for node in themes[removed + 1:])
+    print(f"Removendo L1 {themes[removed]['code']} e deslocando "
+          f"{', '.join(node['code'] for node in themes[removed + 1:])} ({shifted_nodes} nós)\n")
+
+    errors = []
+    shifted = shifted_tree(tree, removed)
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        diff = diff_trees(tree, shifted)
+        times.append(time.perf_counter() - start)
+
+    counts = lambda d: {'added': len(d.added), 'removed': len(d.removed), 'modified': len(d.modified),
+                        'renumbered': len(d.renumbered), 'renamed': len(d.renamed)}
+    check("Remoção + deslocamento", counts(diff),
+          {'added': 0, 'removed': count_nodes(themes[removed]), 'modified': 0,
+           'renumbered': shifted_nodes, 'renamed': 0}, errors)
+    first = themes[removed + 1]
+    pair = {'old_code': first['code'], 'new_code': themes[removed]['code'], 'label': first.get('label', '')}
+    if pair not in diff.renumbered:
+        errors.append(f"renumeração {pair['old_code']} → {pair['new_code']} não reportada")
+
+    # Deslocado e editado: mesmo label, conteúdo diferente → renomeação
+    edited = shifted_tree(tree, removed)
+    node = edited['themes'][removed]['children'][0]
+    node['description'] = (node.get('description') or '') + ' (editado)'
+    check("Deslocamento com um nó editado", counts(diff_trees(tree, edited)),
+          {'added': 0, 'removed': count_nodes(themes[removed]), 'modified': 0,
+           'renumbered': shifted_nodes - 1, 'renamed': 1}, errors)
+
+    print(f"\nDiff: {sorted(times)[len(times) // 2] * 1000:.1f} ms (mediana de {RUNS})")
+
+    if errors:
+        print()
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Códigos deslocados reportados como renumerações{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
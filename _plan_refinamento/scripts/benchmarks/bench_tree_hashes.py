@@ -0,0 +1,74 @@
+"""
+Benchmark: hashes de conteúdo e de subárvore da árvore temática
+
+Mede o cálculo dos hashes (estilo Merkle) para a árvore inteira, que deve
+ficar bem abaixo de 50 ms, e a carga dos hashes já gravados em .tree_cache/.
+Confere também que uma edição em um L3 muda apenas os hashes do seu caminho.
+Executar com: python scripts/benchmarks/bench_tree_hashes.py
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.tree_hashes import TreeHashes
+from utils.tree_snapshot import TreeSnapshot
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+RUNS = 20
+BUDGET_MS = 50.0
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: hashes Merkle da árvore temática{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    tree = TreeSnapshot(THEMES_FILE).load()
+
+    # Cálculo completo (árvore já carregada)
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        hashes = TreeHashes(tree)
+        times.append(time.perf_counter() - start)
+    t_build = sorted(times)[len(times) // 2]
+
+    # Carga dos hashes gravados
+    TreeHashes.from_file(THEMES_FILE)
+    cached = TreeHashes.from_file(THEMES_FILE)
+    assert cached.to_dict() == hashes.to_dict(), "Hashes gravados diferem dos calculados"
+
+    # Edição em um L3: só o nó e seus ancestrais mudam
+    edited = copy.deepcopy(tree)
+    l3 = edited['themes'][0]['children'][0]['children'][0]
+    l3['description'] = (l3.get('description') or '') + ' (editado)'
+    after = TreeHashes(edited)
+
+    changed = [code for code in hashes if not after.same_subtree(code, hashes)]
+    expected = [l3['code'], l3['code'].rsplit('.', 1)[0], l3['code'].split('.')[0]]
+    assert sorted(changed) == sorted(expected), f"Subárvores alteradas inesperadas: {changed}"
+    assert after.changed_codes(hashes) == [l3['code']]
+
+    print(f"Nós: {len(hashes)}")
+    print(f"Cálculo completo (mediana de {RUNS}): {t_build * 1000:8.2f} ms")
+    print(f"Carga do cache ({cached.source}):       {cached.load_time * 1000:8.2f} ms")
+    print(f"Edição em {l3['code']}: {len(changed)} subárvores alteradas ({', '.join(sorted(changed))})")
+
+    if t_build * 1000 > BUDGET_MS:
+        print(f"\n{Fore.RED}✗ Cálculo acima do orçamento de {BUDGET_MS:.0f} ms{Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Dentro do orçamento de {BUDGET_MS:.0f} ms{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
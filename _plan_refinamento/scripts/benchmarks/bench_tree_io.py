@@ -0,0 +1,74 @@
+"""
+Benchmark: I/O da árvore com libyaml (C) vs. Python puro
+
+Compara throughput de carga e escrita de themes_tree_enriched_full.yaml com
+SafeLoader/Dumper (Python) e CSafeLoader/CSafeDumper (libyaml), e confere
+que a saída é byte a byte idêntica.
+Executar com: python scripts/benchmarks/bench_tree_io.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.tree_io import DUMP_OPTIONS, LIBYAML, TreeLoader, TreeDumper
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+RUNS = 3
+
+
+def best_of(func, runs: int = RUNS) -> float:
+    """Menor tempo entre várias execuções"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: I/O da árvore (libyaml vs. Python puro){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    if not LIBYAML:
+        print(f"{Fore.YELLOW}⚠ PyYAML sem libyaml: tree_io usa as implementações em Python{Style.RESET_ALL}\n")
+
+    content = THEMES_FILE.read_text(encoding='utf-8')
+    size_mb = len(content.encode('utf-8')) / (1024 * 1024)
+    tree = yaml.load(content, Loader=yaml.SafeLoader)
+
+    t_load_py = best_of(lambda: yaml.load(content, Loader=yaml.SafeLoader))
+    t_load_c = best_of(lambda: yaml.load(content, Loader=TreeLoader))
+
+    dumped_py = yaml.dump(tree, Dumper=yaml.Dumper, **DUMP_OPTIONS)
+    dumped_c = yaml.dump(tree, Dumper=TreeDumper, **DUMP_OPTIONS)
+    t_dump_py = best_of(lambda: yaml.dump(tree, Dumper=yaml.Dumper, **DUMP_OPTIONS))
+    t_dump_c = best_of(lambda: yaml.dump(tree, Dumper=TreeDumper, **DUMP_OPTIONS))
+
+    print(f"Arquivo: {THEMES_FILE.name} ({size_mb * 1024:.0f} KB)\n")
+    print(f"{'Operação':<10} {'Python (ms)':>12} {'libyaml (ms)':>13} {'Python MB/s':>12} {'libyaml MB/s':>13} {'Speedup':>8}")
+    for name, t_py, t_c in [("load", t_load_py, t_load_c), ("dump", t_dump_py, t_dump_c)]:
+        print(f"{name:<10} {t_py * 1000:12.1f} {t_c * 1000:13.1f} "
+              f"{size_mb / t_py:12.2f} {size_mb / t_c:13.2f} {t_py / t_c:7.1f}x")
+
+    print()
+    if dumped_py == dumped_c:
+        print(f"{Fore.GREEN}✓ Saída byte a byte idêntica à formatação atual{Style.RESET_ALL}")
+        return 0
+
+    print(f"{Fore.RED}✗ Saída do dumper difere da formatação atual{Style.RESET_ALL}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
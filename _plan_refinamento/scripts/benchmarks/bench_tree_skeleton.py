@@ -0,0 +1,78 @@
+"""
+Benchmark: carga do esqueleto da árvore vs. árvore completa
+
+Compara o que um consumidor que só precisa de códigos e labels (app de
+anotação) paga em cada caminho: snapshot completo + ThemeIndex vs. esqueleto
+com campos pesados sob demanda.
+Executar com: python scripts/benchmarks/bench_tree_skeleton.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.theme_index import ThemeIndex
+from utils.tree_skeleton import TreeSkeleton
+from utils.tree_snapshot import TreeSnapshot
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+WARM_RUNS = 20
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: esqueleto da árvore (carga preguiçosa de campos){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    # Carga a frio do esqueleto (reconstrói artefatos)
+    skeleton = TreeSkeleton(THEMES_FILE)
+    skeleton.invalidate()
+    skeleton.load()
+    t_cold = skeleton.load_time
+
+    # Caminho completo: snapshot + índice
+    full_times = []
+    for _ in range(WARM_RUNS):
+        start = time.perf_counter()
+        index = ThemeIndex(TreeSnapshot(THEMES_FILE).load())
+        full_times.append(time.perf_counter() - start)
+
+    # Caminho enxuto: apenas esqueleto
+    skeleton_times = []
+    for _ in range(WARM_RUNS):
+        skeleton = TreeSkeleton(THEMES_FILE).load()
+        skeleton_times.append(skeleton.load_time)
+
+    # Conferência: labels, pais e campos sob demanda idênticos à árvore
+    for node in index:
+        code = node['code']
+        assert skeleton.label(code) == node.get('label'), f"Label difere: {code}"
+        assert skeleton.parent_code(code) == index.parent_code(code), f"Pai difere: {code}"
+        expected = {k: v for k, v in node.items() if k != 'children'}
+        assert skeleton.node(code) == expected, f"Campos diferem: {code}"
+
+    t_full, t_skeleton = median(full_times), median(skeleton_times)
+    print(f"Esqueleto a frio ({len(skeleton)} nós):       {t_cold * 1000:8.2f} ms")
+    print(f"Snapshot + ThemeIndex (mediana):    {t_full * 1000:8.2f} ms")
+    print(f"Esqueleto (mediana de {WARM_RUNS}):          {t_skeleton * 1000:8.2f} ms")
+    print(f"Artefatos: {skeleton.skeleton_file.stat().st_size / 1024:.0f} KB (esqueleto) + "
+          f"{skeleton.fields_file.stat().st_size / 1024:.0f} KB (campos)")
+
+    if t_skeleton > 0:
+        print(f"\n{Fore.GREEN}Speedup (esqueleto vs. completo): {t_full / t_skeleton:.1f}x{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark: carga da árvore temática via YAML vs. snapshot binário
+
+Mede a carga a frio (YAML → árvore + gravação do snapshot) e a quente
+(snapshot válido) de themes_tree_enriched_full.yaml.
+Executar com: python scripts/benchmarks/bench_tree_snapshot.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.tree_snapshot import TreeSnapshot
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+WARM_RUNS = 20
+
+
+def main():
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Benchmark: snapshot binário da árvore temática{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    print(f"Arquivo: {THEMES_FILE} ({THEMES_FILE.stat().st_size / 1024:.0f} KB)\n")
+
+    # Referência: yaml.safe_load puro
+    start = time.perf_counter()
+    with open(THEMES_FILE, 'r', encoding='utf-8') as f:
+        reference = yaml.safe_load(f)
+    t_yaml = time.perf_counter() - start
+
+    snapshot = TreeSnapshot(THEMES_FILE)
+
+    # Carga a frio: sem snapshot
+    snapshot.invalidate()
+    cold_tree = snapshot.load()
+    t_cold, cold_source = snapshot.load_time, snapshot.source
+
+    # Carga a quente: snapshot válido
+    warm_times = []
+    for _ in range(WARM_RUNS):
+        warm_tree = snapshot.load()
+        warm_times.append(snapshot.load_time)
+    t_warm = sorted(warm_times)[len(warm_times) // 2]
+
+    assert cold_tree == reference and warm_tree == reference, "Árvore do snapshot difere do YAML"
+
+    print(f"yaml.safe_load (referência):   {t_yaml * 1000:8.2f} ms")
+    print(f"Carga a frio ({cold_source}):          {t_cold * 1000:8.2f} ms")
+    print(f"Carga a quente ({snapshot.source}, mediana de {WARM_RUNS}): {t_warm * 1000:8.2f} ms")
+    print(f"Snapshot: {snapshot.snapshot_file} ({snapshot.snapshot_file.stat().st_size / 1024:.0f} KB)")
+
+    if t_warm > 0:
+        print(f"\n{Fore.GREEN}Speedup (quente vs. YAML): {t_yaml / t_warm:.1f}x{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
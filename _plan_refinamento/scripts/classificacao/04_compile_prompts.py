@@ -0,0 +1,117 @@
+"""
+Subfase 4.4: Compilação de prompts da árvore para classificação via LLM
+
+Renderiza a árvore em variantes compactas (labels, labels + descrição curta,
+completa, um L1 por vez), mede tokens com tokenizador local e gera relatório
+de tamanho por variante e latência estimada economizada por chamada.
+
+As renderizações ficam em cache indexado pelo hash da árvore.
+
+Uso:
+    python scripts/classificacao/04_compile_prompts.py [--budget TOKENS] [--export DIR]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    THEMES_FILE, REPORTS_DIR, PROMPT_TOKENIZER, PROMPT_TOKEN_BUDGET, LLM_PREFILL_TOKENS_PER_SECOND,
+    ensure_dir
+)
+from utils.prompt_compiler import BASELINE_VARIANT, BASE_VARIANTS, PromptCompiler
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+ESTIMATE_WARNING = ("tiktoken indisponível: tokens estimados por tamanho de palavra, "
+                    "contagens aproximadas (instale tiktoken para contagens exatas)")
+
+
+def savings_ms(tokens: int, baseline_tokens: int) -> float:
+    """Latência de prefill economizada em relação à variante completa"""
+    return (baseline_tokens - tokens) / LLM_PREFILL_TOKENS_PER_SECOND * 1000
+
+
+def generate_report(compiler: PromptCompiler, budget: int, report_file: Path) -> None:
+    baseline = compiler.render(BASELINE_VARIANT)['tokens']
+    chosen = compiler.compile(budget)['variant']
+    tokens_header = "Tokens (estimados)" if compiler.counter.estimated else "Tokens"
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("# Variantes de Prompt da Árvore Temática\n\n")
+        f.write(f"**Árvore:** `{THEMES_FILE.name}` (hash `{compiler.tree_hash}`)\n")
+        f.write(f"**Tokenizador:** {compiler.counter.method}\n")
+        f.write(f"**Vazão de prefill assumida:** {LLM_PREFILL_TOKENS_PER_SECOND:.0f} tokens/s\n")
+        f.write(f"**Orçamento:** {budget} tokens → variante `{chosen}`\n\n")
+        if compiler.counter.estimated:
+            f.write(f"> ⚠️ {ESTIMATE_WARNING}.\n\n")
+
+        f.write("## Variantes Globais\n\n")
+        f.write(f"| Variante | Caracteres | {tokens_header} | % do completo | Economia estimada (ms/chamada) |\n")
+        f.write("|----------|-----------:|-------:|--------------:|-------------------------------:|\n")
+        for variant in BASE_VARIANTS:
+            entry = compiler.render(variant)
+            f.write(f"| `{variant}` | {entry['chars']:,} | {entry['tokens']:,} | "
+                    f"{entry['tokens'] / baseline:.0%} | {savings_ms(entry['tokens'], baseline):,.0f} |\n")
+
+        f.write("\n## Subárvores L1 (labels + descrição curta)\n\n")
+        f.write(f"| Variante | Caracteres | {tokens_header} | % do completo | Economia estimada (ms/chamada) |\n")
+        f.write("|----------|-----------:|-------:|--------------:|-------------------------------:|\n")
+        for variant in compiler.variants():
+            if not variant.startswith('l1:'):
+                continue
+            entry = compiler.render(variant)
+            f.write(f"| `{variant}` | {entry['chars']:,} | {entry['tokens']:,} | "
+                    f"{entry['tokens'] / baseline:.0%} | {savings_ms(entry['tokens'], baseline):,.0f} |\n")
+
+        f.write("\n*Economia = (tokens da variante completa − tokens da variante) / vazão de prefill.*\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila variantes de prompt da árvore temática")
+    parser.add_argument("--budget", type=int, default=PROMPT_TOKEN_BUDGET,
+                        help=f"Orçamento de tokens para a variante global (padrão: {PROMPT_TOKEN_BUDGET})")
+    parser.add_argument("--export", type=Path, help="Diretório para salvar o texto de cada variante")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Subfase 4.4: Compilação de Prompts da Árvore{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    compiler = PromptCompiler(THEMES_FILE, encoding=PROMPT_TOKENIZER)
+    print(f"Hash da árvore: {compiler.tree_hash}")
+    print(f"Tokenizador: {compiler.counter.method}\n")
+    if compiler.counter.estimated:
+        print(f"{Fore.YELLOW}⚠ {ESTIMATE_WARNING}{Style.RESET_ALL}\n")
+
+    baseline = compiler.render(BASELINE_VARIANT)['tokens']
+    for variant in compiler.variants():
+        entry = compiler.render(variant)
+        print(f"  {variant:14s} {entry['tokens']:7,} tokens  ({entry['tokens'] / baseline:4.0%})")
+
+    chosen = compiler.compile(args.budget)
+    print(f"\n{Fore.GREEN}Orçamento de {args.budget} tokens → {chosen['variant']} "
+          f"({chosen['tokens']:,} tokens){Style.RESET_ALL}")
+
+    compiler.save()
+
+    report_file = ensure_dir(REPORTS_DIR) / "04_prompt_variants.md"
+    generate_report(compiler, args.budget, report_file)
+    print(f"{Fore.GREEN}✓ Relatório: {report_file}{Style.RESET_ALL}")
+
+    if args.export:
+        args.export.mkdir(parents=True, exist_ok=True)
+        for variant in compiler.variants():
+            name = variant.replace(':', '_')
+            (args.export / f"prompt_{name}.txt").write_text(compiler.render(variant)['text'], encoding='utf-8')
+        print(f"{Fore.GREEN}✓ Variantes exportadas para: {args.export}{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,47 @@
 """
 Configurações globais para os scripts de validação e refinamento
+
+Importar este módulo não tem efeitos colaterais: o .env é lido sem alterar
+os.environ (python-dotenv só é importado se houver um .env) e os diretórios
+de saída são criados por ensure_dir no momento da escrita. Os scripts que
+carregam modelos chamam export_env() no início de main(), para que
+bibliotecas e subprocessos que leem o ambiente (HF_TOKEN, HF_HOME,
+TOKENIZERS_PARALLELISM, workers do pool de encoding) vejam o .env.
 """
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, Optional
+
+
+def _dotenv_values() -> Dict[str, str]:
+    """Variáveis do .env mais próximo, subindo a partir de scripts/ (como load_dotenv)"""
+    for directory in (Path(__file__).parent, *Path(__file__).parent.parents):
+        env_file = directory / ".env"
+        if env_file.is_file():
+            from dotenv import dotenv_values
+
+            return {key: value for key, value in dotenv_values(env_file).items() if value is not None}
+    return {}
+
+
+_DOTENV = _dotenv_values()
+
+
+def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Variável de ambiente, com o .env como fallback (o ambiente tem precedência)"""
+    return os.environ.get(name, _DOTENV.get(name, default))
 
-# Carregar variáveis de ambiente
-load_dotenv()
+
+def export_env() -> None:
+    """Exporta o .env para os.environ sem sobrescrever o ambiente (como load_dotenv(override=False))"""
+    for name, value in _DOTENV.items():
+        os.environ.setdefault(name, value)
+
+
+def ensure_dir(directory: Path) -> Path:
+    """Cria o diretório (e os pais) se não existir; usado por quem grava nele"""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
 
 # Diretórios base
 BASE_DIR = Path(__file__).parent.parent
@@ -24,51 +59,73 @@ EMBEDDINGS_CACHE_DIR = DATA_DIR / "embeddings_cache"
 ANNOTATIONS_DIR = DATA_DIR / "annotations"
 CONFUSION_MATRICES_DIR = REPORTS_DIR / "04_confusion_matrices"
 
-# Criar diretórios se não existirem
-for directory in [DATA_DIR, REPORTS_DIR, NOTEBOOKS_DIR,
-                  EMBEDDINGS_CACHE_DIR, ANNOTATIONS_DIR, CONFUSION_MATRICES_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+# Artefatos de runtime para scraper e portal (gerados por entrega/06_build_runtime_artifacts.py)
+RUNTIME_ARTIFACTS_DIR = BASE_DIR / "runtime"
 
 # Configurações de Embeddings
-EMBEDDING_MODEL = os.getenv(
+EMBEDDING_MODEL = getenv(
     "EMBEDDING_MODEL",
     "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
 )
-EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
-EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "auto")  # auto detecta cuda/mps/cpu
+EMBEDDING_BATCH_SIZE = int(getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_TOKEN_BUDGET = int(getenv("EMBEDDING_TOKEN_BUDGET", "0"))  # tokens com padding por batch (0 = batch × max_seq)
+EMBEDDING_DEVICE = getenv("EMBEDDING_DEVICE", "auto")  # auto detecta cuda/mps/cpu
+EMBEDDING_STORAGE = getenv("EMBEDDING_STORAGE", "float32")  # float32, float16 ou int8
+EMBEDDING_MEMORY_MB = float(getenv("EMBEDDING_MEMORY_MB", "256"))  # camada LRU em memória (0 desativa)
+EMBEDDING_BACKEND = getenv("EMBEDDING_BACKEND", "torch")  # torch, onnx ou onnx-int8 (ONNX Runtime, CPU)
+EMBEDDING_WORKERS = int(getenv("EMBEDDING_WORKERS", "0"))  # processos de geração em CPU (0/1 = no processo atual)
+EMBEDDING_THREADS = int(getenv("EMBEDDING_THREADS", "0"))  # threads por processo do pool (0 = núcleos / workers)
+EMBEDDING_MODELS_DIR = Path(getenv("EMBEDDING_MODELS_DIR", str(DATA_DIR / "models")))  # modelos exportados p/ ONNX
+
+# Documentos longos (encode_long, estratégia C): trechos com sobreposição, combinados em um vetor
+EMBEDDING_CHUNK_TOKENS = int(getenv("EMBEDDING_CHUNK_TOKENS", "126"))  # tokens por trecho (≤ max_seq_length − 2)
+EMBEDDING_CHUNK_OVERLAP = int(getenv("EMBEDDING_CHUNK_OVERLAP", "32"))  # tokens repetidos do trecho anterior
+EMBEDDING_CHUNK_POOLING = getenv("EMBEDDING_CHUNK_POOLING", "mean")  # mean, max ou first-k
+
+# Parâmetros que definem o namespace do cache de embeddings (vazio/0 = padrão do modelo)
+EMBEDDING_REVISION = getenv("EMBEDDING_REVISION", "")  # branch, tag ou commit no hub
+EMBEDDING_MAX_SEQ_LENGTH = int(getenv("EMBEDDING_MAX_SEQ_LENGTH", "0"))  # truncamento em tokens
+EMBEDDING_POOLING = getenv("EMBEDDING_POOLING", "")  # mean, cls, max...
+EMBEDDING_NORMALIZE = getenv("EMBEDDING_NORMALIZE", "false").lower() in ("1", "true", "yes")
 
 # Thresholds de Confiança
-CONFIDENCE_THRESHOLD_L1 = float(os.getenv("CONFIDENCE_THRESHOLD_L1", "0.4"))
-CONFIDENCE_THRESHOLD_L2 = float(os.getenv("CONFIDENCE_THRESHOLD_L2", "0.5"))
-CONFIDENCE_THRESHOLD_L3 = float(os.getenv("CONFIDENCE_THRESHOLD_L3", "0.6"))
+CONFIDENCE_THRESHOLD_L1 = float(getenv("CONFIDENCE_THRESHOLD_L1", "0.4"))
+CONFIDENCE_THRESHOLD_L2 = float(getenv("CONFIDENCE_THRESHOLD_L2", "0.5"))
+CONFIDENCE_THRESHOLD_L3 = float(getenv("CONFIDENCE_THRESHOLD_L3", "0.6"))
 
 # Configurações de Dataset
-TEST_DATASET_SIZE = int(os.getenv("TEST_DATASET_SIZE", "500"))
-ANNOTATION_BATCH_SIZE = int(os.getenv("ANNOTATION_BATCH_SIZE", "50"))
+TEST_DATASET_SIZE = int(getenv("TEST_DATASET_SIZE", "500"))
+ANNOTATION_BATCH_SIZE = int(getenv("ANNOTATION_BATCH_SIZE", "50"))
 
 # Typesense
-TYPESENSE_HOST = os.getenv("TYPESENSE_HOST", "localhost")
-TYPESENSE_PORT = int(os.getenv("TYPESENSE_PORT", "8108"))
-TYPESENSE_API_KEY = os.getenv("TYPESENSE_API_KEY", "")
-TYPESENSE_PROTOCOL = os.getenv("TYPESENSE_PROTOCOL", "http")
-TYPESENSE_COLLECTION = os.getenv("TYPESENSE_COLLECTION", "news")
+TYPESENSE_HOST = getenv("TYPESENSE_HOST", "localhost")
+TYPESENSE_PORT = int(getenv("TYPESENSE_PORT", "8108"))
+TYPESENSE_API_KEY = getenv("TYPESENSE_API_KEY", "")
+TYPESENSE_PROTOCOL = getenv("TYPESENSE_PROTOCOL", "http")
+TYPESENSE_COLLECTION = getenv("TYPESENSE_COLLECTION", "news")
 
 # Validação
-MIN_KEYWORDS = int(os.getenv("MIN_KEYWORDS", "5"))
-MAX_KEYWORDS = int(os.getenv("MAX_KEYWORDS", "20"))
-MIN_DESCRIPTION_WORDS = int(os.getenv("MIN_DESCRIPTION_WORDS", "30"))
-MAX_DESCRIPTION_WORDS = int(os.getenv("MAX_DESCRIPTION_WORDS", "200"))
-SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.85"))
+MIN_KEYWORDS = int(getenv("MIN_KEYWORDS", "5"))
+MAX_KEYWORDS = int(getenv("MAX_KEYWORDS", "20"))
+MIN_DESCRIPTION_WORDS = int(getenv("MIN_DESCRIPTION_WORDS", "30"))
+MAX_DESCRIPTION_WORDS = int(getenv("MAX_DESCRIPTION_WORDS", "200"))
+SIMILARITY_THRESHOLD = float(getenv("SIMILARITY_THRESHOLD", "0.85"))
 
 # Métricas de Sucesso
-TARGET_ACCURACY_L1 = float(os.getenv("TARGET_ACCURACY_L1", "0.85"))
-TARGET_ACCURACY_L2 = float(os.getenv("TARGET_ACCURACY_L2", "0.70"))
-TARGET_ACCURACY_L3 = float(os.getenv("TARGET_ACCURACY_L3", "0.60"))
-TARGET_HIERARCHICAL_ACCURACY = float(os.getenv("TARGET_HIERARCHICAL_ACCURACY", "0.55"))
+TARGET_ACCURACY_L1 = float(getenv("TARGET_ACCURACY_L1", "0.85"))
+TARGET_ACCURACY_L2 = float(getenv("TARGET_ACCURACY_L2", "0.70"))
+TARGET_ACCURACY_L3 = float(getenv("TARGET_ACCURACY_L3", "0.60"))
+TARGET_HIERARCHICAL_ACCURACY = float(getenv("TARGET_HIERARCHICAL_ACCURACY", "0.55"))
+
+# Prompts para classificação via LLM
+PROMPT_TOKENIZER = getenv("PROMPT_TOKENIZER", "o200k_base")  # codificação tiktoken
+PROMPT_TOKEN_BUDGET = int(getenv("PROMPT_TOKEN_BUDGET", "8000"))
+# Vazão de prefill do LLM, para estimar latência economizada por token a menos
+LLM_PREFILL_TOKENS_PER_SECOND = float(getenv("LLM_PREFILL_TOKENS_PER_SECOND", "2000"))
 
 # Multi-label
-MAX_LABELS = int(os.getenv("MAX_LABELS", "3"))
-SECONDARY_LABEL_THRESHOLD = float(os.getenv("SECONDARY_LABEL_THRESHOLD", "0.4"))
+MAX_LABELS = int(getenv("MAX_LABELS", "3"))
+SECONDARY_LABEL_THRESHOLD = float(getenv("SECONDARY_LABEL_THRESHOLD", "0.4"))
 
 # Cores para output (opcional)
 COLORS = {
@@ -89,6 +146,8 @@ def print_config():
     print(f"Themes file: {THEMES_FILE}")
     print(f"Embedding model: {EMBEDDING_MODEL}")
     print(f"Device: {EMBEDDING_DEVICE}")
+    print(f"Embedding backend: {EMBEDDING_BACKEND}")
+    print(f"Embedding storage: {EMBEDDING_STORAGE} (LRU: {EMBEDDING_MEMORY_MB:.0f} MB)")
     print(f"Test dataset size: {TEST_DATASET_SIZE}")
     print(f"Typesense: {TYPESENSE_PROTOCOL}://{TYPESENSE_HOST}:{TYPESENSE_PORT}")
     print()
@@ -14,7 +14,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config import DATA_DIR, THEMES_FILE
-from utils.yaml_utils import load_yaml, iter_all_nodes, get_level
+from utils.tree_skeleton import TreeSkeleton
 
 import streamlit as st
 
@@ -25,7 +25,7 @@ class AnnotationApp:
     def __init__(self):
         self.dataset_file = DATA_DIR / "test_dataset.csv"
         self.themes_file = THEMES_FILE
-        self.themes_tree = None
+        self.themes_index = None
 
     def load_data(self):
         """Carrega dataset e árvore temática"""
@@ -37,32 +37,23 @@ class AnnotationApp:
 
         df = pd.read_csv(self.dataset_file)
 
-        # Carregar árvore temática
-        self.themes_tree = load_yaml(self.themes_file)
+        # Carregar árvore temática (apenas códigos, labels e pais)
+        self.themes_index = TreeSkeleton(self.themes_file).load()
 
         return df
 
     def get_theme_hierarchy(self):
         """Extrai hierarquia de temas da árvore"""
+        index = self.themes_index
         themes = {'L1': {}, 'L2': {}, 'L3': {}}
 
-        for node in iter_all_nodes(self.themes_tree):
-            code = node.get('code', '')
-            label = node.get('label', '')
-            level = get_level(code)
-
-            if level == 'L1':
-                themes['L1'][code] = label
-            elif level == 'L2':
-                parent_l1 = code.split('.')[0]
-                if parent_l1 not in themes['L2']:
-                    themes['L2'][parent_l1] = {}
-                themes['L2'][parent_l1][code] = label
-            elif level == 'L3':
-                parent_l2 = '.'.join(code.split('.')[:2])
-                if parent_l2 not in themes['L3']:
-                    themes['L3'][parent_l2] = {}
-                themes['L3'][parent_l2][code] = label
+        for code in index.codes_at_level('L1'):
+            themes['L1'][code] = index.label(code, '')
+
+        for level in ('L2', 'L3'):
+            for code in index.codes_at_level(level):
+                parent = index.parent_code(code)
+                themes[level].setdefault(parent, {})[code] = index.label(code, '')
 
         return themes
 
@@ -13,7 +13,7 @@ from collections import Counter
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import TEST_DATASET_SIZE, DATA_DIR
+from config import TEST_DATASET_SIZE, DATA_DIR, ensure_dir
 from colorama import Fore, Style, init
 
 init(autoreset=True)
@@ -108,6 +108,7 @@ class NewsCollector:
             'titulo': df['title'],
             'resumo': df.get('summary', ''),
             'conteudo_inicio': df['content'].str[:500] if 'content' in df.columns else '',  # Primeiros 500 chars
+            'conteudo': df['content'] if 'content' in df.columns else '',  # Completo (estratégia C, encode_long)
             'orgao': df.get('agency', ''),
             'data_publicacao': df.get('published_at', ''),
             'url': df.get('url', ''),
@@ -188,6 +189,7 @@ class NewsCollector:
         print(f"\n{Fore.CYAN}Salvando dataset{Style.RESET_ALL}")
 
         # Salvar CSV
+        ensure_dir(self.output_file.parent)
         df.to_csv(self.output_file, index=False, encoding='utf-8')
         print(f"✓ Dataset salvo em: {self.output_file}")
 
@@ -213,7 +215,7 @@ class NewsCollector:
         """Gera relatório sobre o dataset coletado"""
         from config import REPORTS_DIR
 
-        report_file = REPORTS_DIR / "03_dataset_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "03_dataset_report.md"
 
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write("# Relatório de Coleta do Dataset de Teste - Subfase 4.3\n\n")
@@ -7,14 +7,13 @@ Valida qualidade e consistência das anotações manuais.
 import sys
 from pathlib import Path
 import pandas as pd
-import numpy as np
 from collections import Counter, defaultdict
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import DATA_DIR, THEMES_FILE, REPORTS_DIR
-from utils.yaml_utils import load_yaml, get_node_by_code
+from config import DATA_DIR, THEMES_FILE, REPORTS_DIR, ensure_dir
+from utils.theme_index import ThemeIndex
 from colorama import Fore, Style, init
 
 init(autoreset=True)
@@ -25,7 +24,8 @@ class AnnotationValidator:
 
     def __init__(self):
         self.dataset_file = DATA_DIR / "test_dataset.csv"
-        self.themes_tree = load_yaml(THEMES_FILE)
+        self.themes_index = ThemeIndex.from_file(THEMES_FILE)
+        self.themes_tree = self.themes_index.tree
         self.issues = []
 
     def load_data(self):
@@ -94,8 +94,7 @@ class AnnotationValidator:
                     erros_hierarquia += 1
 
                 # Verificar se L2 existe na árvore
-                _, node = get_node_by_code(self.themes_tree, l2)
-                if node is None:
+                if l2 not in self.themes_index:
                     self.issues.append({
                         'type': 'invalid_code',
                         'severity': 'error',
@@ -116,8 +115,7 @@ class AnnotationValidator:
                     erros_hierarquia += 1
 
                 # Verificar se L3 existe na árvore
-                _, node = get_node_by_code(self.themes_tree, l3)
-                if node is None:
+                if l3 not in self.themes_index:
                     self.issues.append({
                         'type': 'invalid_code',
                         'severity': 'error',
@@ -231,7 +229,7 @@ class AnnotationValidator:
 
     def generate_report(self, stats: dict):
         """Gera relatório de validação"""
-        report_file = REPORTS_DIR / "03_validation_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "03_validation_report.md"
 
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write("# Relatório de Validação de Anotações - Subfase 4.3\n\n")
@@ -0,0 +1,63 @@
+"""
+Subfase 4.6: Artefatos de runtime da árvore temática
+
+Compila themes_tree_enriched_full.yaml em artefatos prontos para o scraper e
+o portal, substituindo as cópias sincronizadas à mão:
+- Árvore minificada em JSON (e MessagePack, se disponível)
+- Tabelas de consulta pré-calculadas (código → label, código → pai, níveis)
+- manifest.json com versão da árvore e hashes de integridade
+
+Uso:
+    python scripts/entrega/06_build_runtime_artifacts.py [--output DIR] [--format json|msgpack ...]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE, RUNTIME_ARTIFACTS_DIR
+from utils.runtime_artifacts import MANIFEST_NAME, available_formats, build_runtime_artifacts, load_runtime
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera artefatos de runtime da árvore temática")
+    parser.add_argument("--output", type=Path, default=RUNTIME_ARTIFACTS_DIR,
+                        help=f"Diretório de saída (padrão: {RUNTIME_ARTIFACTS_DIR})")
+    parser.add_argument("--format", dest="formats", action="append", choices=['json', 'msgpack'],
+                        help="Formato a gerar (repetível; padrão: todos os disponíveis)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Subfase 4.6: Artefatos de Runtime da Árvore Temática{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    formats = args.formats or available_formats()
+    missing = [fmt for fmt in formats if fmt not in available_formats()]
+    if missing:
+        print(f"{Fore.RED}❌ Formato indisponível: {', '.join(missing)} (pip install msgpack){Style.RESET_ALL}")
+        return 1
+    if 'msgpack' not in formats and not args.formats:
+        print(f"{Fore.YELLOW}⚠️  msgpack não instalado: gerando apenas JSON{Style.RESET_ALL}\n")
+
+    manifest = build_runtime_artifacts(THEMES_FILE, args.output, formats)
+
+    print(f"Árvore: {THEMES_FILE.name} (versão {manifest['version'] or '?'}, {manifest['nodes']} nós)")
+    print(f"Hash da árvore: {manifest['tree_hash']}\n")
+
+    for fmt, entry in manifest['artifacts'].items():
+        # Conferir que o artefato gravado é legível e íntegro
+        load_runtime(args.output, fmt)
+        print(f"  {Fore.GREEN}✓{Style.RESET_ALL} {fmt:8s} {entry['file']} ({entry['size'] / 1024:.0f} KB)")
+
+    print(f"\n{Fore.GREEN}✓ Manifest: {args.output / MANIFEST_NAME}{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
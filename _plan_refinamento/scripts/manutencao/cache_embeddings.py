@@ -0,0 +1,256 @@
+"""
+Manutenção do cache de embeddings: namespaces e coleta de lixo
+
+Cada combinação de modelo, revisão, pooling, truncamento, normalização,
+pré-processamento, backend e modo de armazenamento tem seu próprio namespace no
+cache (ver utils/embedding_namespace). Este comando lista os namespaces com
+tamanho e número de vetores e remove os obsoletos: os que não correspondem
+à configuração atual e os caches em formato antigo (sem namespace). Com
+EMBEDDING_STORAGE float16 ou int8, o mesmo namespace em float32 também é
+atual: é a referência de validacao/02_check_embedding_storage.py.
+
+gc age dentro dos namespaces atuais: calcula os textos que os scripts ainda
+podem pedir para a árvore e os datasets atuais (utils/embedding_corpus),
+descarta os demais vetores e compacta o store, informando os bytes
+liberados e o tempo de carga antes e depois. Os trechos do conteúdo
+completo (encode_long) também são alcançáveis; calculá-los requer o
+tokenizer do modelo (transformers). Pode rodar com leitores ativos (ver
+EmbeddingStore.retain).
+
+Uso:
+    python scripts/manutencao/cache_embeddings.py list
+    python scripts/manutencao/cache_embeddings.py prune [--keep ID ...] [--yes]
+    python scripts/manutencao/cache_embeddings.py delete ID [ID ...]
+    python scripts/manutencao/cache_embeddings.py gc [--dataset CSV ...] [--yes]
+
+Sem --yes, prune e gc apenas mostram o que seria removido. Não remova
+namespaces em uso por outro processo.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    THEMES_FILE, DATA_DIR, EMBEDDINGS_CACHE_DIR, EMBEDDING_MODEL, EMBEDDING_STORAGE, EMBEDDING_REVISION,
+    EMBEDDING_MAX_SEQ_LENGTH, EMBEDDING_POOLING, EMBEDDING_NORMALIZE, EMBEDDING_BACKEND,
+    EMBEDDING_CHUNK_TOKENS, EMBEDDING_CHUNK_OVERLAP, export_env
+)
+from utils.embedding_backends import load_tokenizer
+from utils.embedding_chunks import TextChunker
+from utils.embedding_corpus import reachable_texts
+from utils.embedding_namespace import EmbeddingNamespace, disk_size, list_namespaces, remove_namespace
+from utils.embedding_quantization import bytes_per_vector
+from utils.embedding_store import EmbeddingStore, text_keys
+from utils.theme_columns import ThemeColumns
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+
+def current_namespace() -> EmbeddingNamespace:
+    """Namespace da configuração atual (mesmos parâmetros de EmbeddingGenerator)"""
+    return EmbeddingNamespace(
+        EMBEDDING_MODEL, revision=EMBEDDING_REVISION, max_seq_length=EMBEDDING_MAX_SEQ_LENGTH,
+        pooling=EMBEDDING_POOLING, normalize=EMBEDDING_NORMALIZE, storage=EMBEDDING_STORAGE,
+        backend=EMBEDDING_BACKEND
+    )
+
+
+def current_namespaces(current: EmbeddingNamespace) -> List[EmbeddingNamespace]:
+    """Namespace atual e, se ele for quantizado, a referência em float32 (02_check_embedding_storage)"""
+    if current.storage == "float32":
+        return [current]
+    return [current, current.with_storage("float32")]
+
+
+def describe(entry: Dict) -> str:
+    ns = entry['namespace']
+    if ns is None:
+        return "formato antigo (sem namespace)"
+    options = [f"rev={ns['revision'] or 'padrão'}", f"storage={ns['storage']}", f"prep=v{ns['preprocessing']}"]
+    if ns['max_seq_length']:
+        options.append(f"max_seq={ns['max_seq_length']}")
+    if ns['pooling']:
+        options.append(f"pooling={ns['pooling']}")
+    if ns['normalize']:
+        options.append("normalizado")
+    if ns.get('backend', 'torch') != 'torch':
+        options.append(f"backend={ns['backend']}")
+    return f"{ns['model']} ({', '.join(options)})"
+
+
+def print_entries(entries: List[Dict]) -> None:
+    for entry in entries:
+        if entry['current']:
+            status = f"{Fore.GREEN}atual   {Style.RESET_ALL}"
+        else:
+            status = f"{Fore.YELLOW}obsoleto{Style.RESET_ALL}"
+        count = f"{entry['entries']:,}" if entry['entries'] is not None else "?"
+        print(f"  {status} {entry['path'].name:28s} {entry['bytes'] / 2**20:9.1f} MB {count:>10s} vetores  "
+              f"{describe(entry)}")
+
+
+def load_time(namespace: EmbeddingNamespace, keys: np.ndarray) -> Tuple[float, int]:
+    """Tempo para abrir o store e ler os vetores alcançáveis (e quantos havia)"""
+    start = time.perf_counter()
+    store = EmbeddingStore(namespace.store_dir(EMBEDDINGS_CACHE_DIR), namespace.storage)
+    _, found = store.get_many(keys)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed, int(found.sum())
+
+
+def long_document_chunker() -> Optional[TextChunker]:
+    """Divisor de trechos de encode_long (None se o tokenizer não puder ser carregado)"""
+    try:
+        tokenizer = load_tokenizer(EMBEDDING_MODEL, EMBEDDING_REVISION or None)
+    except (ImportError, OSError) as e:
+        print(f"{Fore.YELLOW}⚠ Tokenizer indisponível ({e.__class__.__name__}): trechos de encode_long "
+              f"serão tratados como inalcançáveis{Style.RESET_ALL}")
+        return None
+    return TextChunker(tokenizer, EMBEDDING_CHUNK_TOKENS, EMBEDDING_CHUNK_OVERLAP)
+
+
+def reachable_keys(datasets: List[Path]) -> Optional[np.ndarray]:
+    """Chaves dos textos alcançáveis pela árvore e pelos datasets (None se faltar dataset)"""
+    for dataset in datasets:
+        if not dataset.exists():
+            print(f"{Fore.RED}❌ Dataset não encontrado: {dataset}{Style.RESET_ALL}")
+            return None
+
+    chunker = long_document_chunker()
+    texts = reachable_texts(ThemeColumns.from_file(THEMES_FILE), datasets, chunker)
+    keys = np.unique(text_keys(sorted(texts)))
+    print(f"Textos alcançáveis: {len(keys):,} (árvore + {len(datasets)} dataset(s)"
+          f"{' com trechos de conteúdo' if chunker else ''})")
+    return keys
+
+
+def collect_garbage(current: EmbeddingNamespace, keys: np.ndarray, apply: bool) -> None:
+    """Descarta do namespace os vetores de textos que não são mais alcançáveis"""
+    store_dir = current.store_dir(EMBEDDINGS_CACHE_DIR)
+    if not store_dir.exists():
+        print(f"{Fore.GREEN}✓ Namespace {current.id} ainda sem cache{Style.RESET_ALL}")
+        return
+
+    store = current.open_store(EMBEDDINGS_CACHE_DIR)
+    total = len(store)
+    store.close()
+    before_bytes = disk_size(store_dir)
+    before_time, kept = load_time(current, keys)
+    garbage = total - kept
+    print(f"Vetores no cache: {total:,} ({kept:,} alcançáveis, {garbage:,} inalcançáveis)")
+    print(f"Tamanho: {before_bytes / 2**20:.1f} MB, carga {before_time * 1000:.1f} ms")
+
+    if not apply:
+        estimate = garbage * bytes_per_vector(current.storage, store.dim or 0)
+        print(f"\n{Fore.YELLOW}⚠ {garbage:,} vetor(es), ~{estimate / 2**20:.1f} MB. "
+              f"Use --yes para descartar e compactar.{Style.RESET_ALL}")
+        return
+
+    store = current.open_store(EMBEDDINGS_CACHE_DIR)
+    removed = store.retain(keys)
+    store.close()
+    after_bytes = disk_size(store_dir)
+    after_time, _ = load_time(current, keys)
+
+    print(f"\n{Fore.GREEN}✓ {removed:,} vetor(es) descartado(s), "
+          f"{(before_bytes - after_bytes) / 2**20:.1f} MB liberados{Style.RESET_ALL}")
+    print(f"  Tamanho: {before_bytes / 2**20:.1f} MB → {after_bytes / 2**20:.1f} MB")
+    print(f"  Carga:   {before_time * 1000:.1f} ms → {after_time * 1000:.1f} ms")
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Lista e remove namespaces do cache de embeddings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Lista namespaces com tamanho e número de vetores")
+    prune = sub.add_parser("prune", help="Remove namespaces obsoletos")
+    prune.add_argument("--keep", nargs="*", default=[], metavar="ID", help="Namespaces obsoletos a manter")
+    prune.add_argument("--yes", action="store_true", help="Remover de fato (sem isso, apenas mostra)")
+    delete = sub.add_parser("delete", help="Remove namespaces específicos")
+    delete.add_argument("ids", nargs="+", metavar="ID", help="ID do namespace ou nome do diretório")
+    gc = sub.add_parser("gc", help="Descarta vetores de textos fora da árvore e dos datasets atuais")
+    gc.add_argument("--dataset", nargs="*", type=Path, default=[DATA_DIR / "test_dataset.csv"], metavar="CSV",
+                    help="Datasets com notícias (padrão: data/test_dataset.csv)")
+    gc.add_argument("--yes", action="store_true", help="Descartar de fato (sem isso, apenas mostra)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Cache de Embeddings: {'Coleta de Lixo' if args.command == 'gc' else 'Namespaces'}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    current = current_namespaces(current_namespace())
+    entries = list_namespaces(EMBEDDINGS_CACHE_DIR, current)
+    print(f"Diretório: {EMBEDDINGS_CACHE_DIR}")
+    print(f"Namespace atual: {current[0].id}")
+    if len(current) > 1:
+        print(f"Referência float32: {current[1].id}")
+    print()
+
+    if args.command == "gc":
+        if any(namespace.store_dir(EMBEDDINGS_CACHE_DIR).exists() for namespace in current):
+            keys = reachable_keys(args.dataset)
+            if keys is None:
+                return 1
+            for namespace in current:
+                if len(current) > 1:
+                    print(f"\n{Fore.CYAN}Namespace {namespace.id} ({namespace.storage}){Style.RESET_ALL}")
+                collect_garbage(namespace, keys, args.yes)
+        else:
+            print(f"{Fore.GREEN}✓ Namespace atual ainda sem cache{Style.RESET_ALL}")
+        obsolete = [e for e in entries if not e['current']]
+        if obsolete:
+            freed = sum(e['bytes'] for e in obsolete) / 2**20
+            print(f"\n{len(obsolete)} namespace(s) obsoleto(s), {freed:.1f} MB: use prune para removê-los")
+        return 0
+
+    if args.command == "list":
+        if not entries:
+            print("Nenhum cache encontrado.")
+            return 0
+        print_entries(entries)
+        total = sum(e['bytes'] for e in entries)
+        obsolete = sum(e['bytes'] for e in entries if not e['current'])
+        print(f"\nTotal: {total / 2**20:.1f} MB ({obsolete / 2**20:.1f} MB obsoletos)")
+        return 0
+
+    if args.command == "prune":
+        keep = set(args.keep)
+        targets = [e for e in entries if not e['current'] and e['id'] not in keep and e['path'].name not in keep]
+    else:
+        wanted = set(args.ids)
+        targets = [e for e in entries if e['id'] in wanted or e['path'].name in wanted]
+        missing = wanted - {e['id'] for e in targets} - {e['path'].name for e in targets}
+        for name in sorted(missing):
+            print(f"{Fore.RED}❌ Namespace não encontrado: {name}{Style.RESET_ALL}")
+        if missing:
+            return 1
+
+    if not targets:
+        print(f"{Fore.GREEN}✓ Nada a remover{Style.RESET_ALL}")
+        return 0
+
+    print_entries(targets)
+    freed = sum(e['bytes'] for e in targets) / 2**20
+    if args.command == "prune" and not args.yes:
+        print(f"\n{Fore.YELLOW}⚠ {len(targets)} namespace(s), {freed:.1f} MB. "
+              f"Use --yes para remover.{Style.RESET_ALL}")
+        return 0
+
+    for entry in targets:
+        remove_namespace(entry['path'])
+    print(f"\n{Fore.GREEN}✓ {len(targets)} namespace(s) removido(s), {freed:.1f} MB liberados{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Subfase 4.5: Diff entre versões da árvore temática
+
+Compara duas versões de themes_tree_enriched_full.yaml (ex: antes e depois de
+remove_themes_22_23.py ou das consolidações de L2/L3) e mostra:
+- Nós adicionados e removidos
+- Renumerações e renomeações de código
+- Mudanças de label, descrição e keywords (e includes/excludes)
+
+Subárvores idênticas são puladas pela comparação de hashes (ver utils/tree_hashes).
+
+Uso:
+    python scripts/refinamento/05_diff_tree.py ANTIGO.yaml [NOVO.yaml] [--json SAIDA.json]
+
+NOVO.yaml é, por padrão, a árvore configurada em THEMES_FILE.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import THEMES_FILE
+from utils.tree_diff import TreeDiff, diff_files
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+# Limite de itens mostrados por seção no terminal
+MAX_ITEMS = 20
+
+
+def print_section(title: str, items: list, color: str, render) -> None:
+    if not items:
+        return
+    print(f"\n{color}{title} ({len(items)}){Style.RESET_ALL}")
+    for item in items[:MAX_ITEMS]:
+        print(f"  {render(item)}")
+    if len(items) > MAX_ITEMS:
+        print(f"  ... e mais {len(items) - MAX_ITEMS}")
+
+
+def render_changes(changes: dict) -> str:
+    parts = []
+    for field, change in changes.items():
+        if 'added' in change:
+            parts.append(f"{field} +{len(change['added'])}/-{len(change['removed'])}")
+        else:
+            parts.append(field)
+    return ", ".join(parts)
+
+
+def print_diff(diff: TreeDiff) -> None:
+    print_section("➕ Adicionados", diff.added, Fore.GREEN,
+                  lambda e: f"{e['code']} - {e['label']}")
+    print_section("➖ Removidos", diff.removed, Fore.RED,
+                  lambda e: f"{e['code']} - {e['label']}")
+    print_section("🔢 Renumerados", diff.renumbered, Fore.CYAN,
+                  lambda e: f"{e['old_code']} → {e['new_code']} - {e['label']}")
+    print_section("✏️  Renomeados", diff.renamed, Fore.CYAN,
+                  lambda e: f"{e['old_code']} → {e['new_code']} - {e['label']} ({render_changes(e['changes'])})")
+    print_section("🏷️  Labels alterados", diff.relabelled, Fore.YELLOW,
+                  lambda e: f"{e['code']}: \"{e['old']}\" → \"{e['new']}\"")
+
+    descriptions = [e for e in diff.modified if 'description' in e['changes']]
+    print_section("📝 Descrições alteradas", descriptions, Fore.YELLOW,
+                  lambda e: e['code'])
+
+    keywords = [e for e in diff.modified if 'keywords' in e['changes']]
+    print_section("🔑 Keywords alteradas", keywords, Fore.YELLOW,
+                  lambda e: (f"{e['code']}: +{e['changes']['keywords']['added']} "
+                             f"-{e['changes']['keywords']['removed']}"))
+
+    others = [e for e in diff.modified
+              if set(e['changes']) - {'label', 'description', 'keywords'}]
+    print_section("📋 Includes/excludes alterados", others, Fore.YELLOW,
+                  lambda e: f"{e['code']} ({render_changes(e['changes'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff entre versões da árvore temática")
+    parser.add_argument("old", type=Path, help="Versão anterior (YAML)")
+    parser.add_argument("new", type=Path, nargs="?", default=THEMES_FILE,
+                        help="Versão nova (padrão: THEMES_FILE)")
+    parser.add_argument("--json", type=Path, dest="json_file", help="Salvar diff completo em JSON")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Subfase 4.5: Diff da Árvore Temática{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    for path in (args.old, args.new):
+        if not path.exists():
+            print(f"{Fore.RED}❌ Arquivo não encontrado: {path}{Style.RESET_ALL}")
+            return 1
+
+    print(f"Anterior: {args.old}")
+    print(f"Nova:     {args.new}")
+
+    start = time.perf_counter()
+    diff = diff_files(args.old, args.new)
+    elapsed = time.perf_counter() - start
+
+    if diff.is_empty():
+        print(f"\n{Fore.GREEN}✓ Árvores idênticas{Style.RESET_ALL}")
+    else:
+        print_diff(diff)
+
+    print(f"\nSubárvores idênticas puladas: {diff.skipped_subtrees} ({diff.skipped_nodes} nós)")
+    print(f"Nós afetados na nova versão: {len(diff.affected_codes())}")
+    print(f"Tempo: {elapsed * 1000:.1f} ms")
+
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump(diff.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"\n{Fore.GREEN}✓ Diff salvo em: {args.json_file}{Style.RESET_ALL}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Backends de inferência do modelo de embeddings
+
+- torch: SentenceTransformer padrão (PyTorch; CPU, CUDA ou MPS)
+- onnx: o mesmo modelo exportado para ONNX e executado pelo ONNX Runtime
+- onnx-int8: o grafo ONNX com quantização dinâmica int8 (CPU)
+
+A exportação roda uma única vez por modelo e revisão: o grafo (e a versão
+int8) fica em export_dir, e as execuções seguintes carregam direto de lá.
+Os backends geram vetores ligeiramente diferentes (int8 mais que onnx),
+por isso o backend faz parte do namespace do cache (ver
+embedding_namespace); a concordância com o torch é medida por
+validacao/02_check_embedding_backends.py.
+
+Os backends ONNX requerem sentence-transformers >= 3.2 com o extra onnx
+(pip install "sentence-transformers[onnx]"); torch continua sendo o
+padrão e não depende deles.
+"""
+from pathlib import Path
+from typing import Optional
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+ONNX_FILE = "onnx/model.onnx"
+
+
+def check_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de embeddings desconhecido: {backend} (use {', '.join(BACKENDS)})")
+    return backend
+
+
+def quantization_target() -> str:
+    """Conjunto de instruções alvo da quantização int8 (arm64 ou avx2, o mais portável em x86)"""
+    import platform
+
+    return "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "avx2"
+
+
+def export_dir_for(models_dir: Path, model_name: str, revision: Optional[str] = None) -> Path:
+    """Diretório do modelo exportado (um por modelo e revisão)"""
+    name = model_name.replace("/", "__")
+    return Path(models_dir) / (f"{name}@{revision}" if revision else name)
+
+
+def _require_onnx() -> None:
+    try:
+        import onnxruntime  # noqa: F401
+        import optimum  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Backends ONNX requerem onnxruntime e optimum: "
+            'pip install "sentence-transformers[onnx]"'
+        ) from e
+
+
+def export_onnx(model_name: str, export_dir: Path, revision: Optional[str] = None, int8: bool = False) -> str:
+    """
+    Exporta o modelo para ONNX (e int8) em export_dir, se ainda não exportado
+
+    Returns:
+        Caminho do grafo relativo a export_dir (model_kwargs file_name)
+    """
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = Path(export_dir)
+    if not (export_dir / ONNX_FILE).exists():
+        print(f"Exportando {model_name} para ONNX em {export_dir} (apenas na primeira vez)")
+        model = SentenceTransformer(model_name, device="cpu", revision=revision, backend="onnx")
+        model.save(str(export_dir))
+    if not int8:
+        return ONNX_FILE
+
+    target = quantization_target()
+    file_name = f"onnx/model_qint8_{target}.onnx"
+    if not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        print(f"Quantizando grafo ONNX para int8 ({target})")
+        model = SentenceTransformer(str(export_dir), device="cpu", backend="onnx",
+                                    model_kwargs={"file_name": ONNX_FILE})
+        export_dynamic_quantized_onnx_model(model, target, str(export_dir))
+    return file_name
+
+
+def load_model(model_name: str, backend: str = "torch", device: str = "cpu",
+               revision: Optional[str] = None, models_dir: Optional[Path] = None):
+    """
+    SentenceTransformer no backend pedido
+
+    Args:
+        model_name: Modelo no hub (ou caminho local)
+        backend: torch, onnx ou onnx-int8
+        device: Dispositivo (os backends ONNX usam o provider correspondente)
+        revision: Revisão no hub
+        models_dir: Onde guardar os modelos exportados (obrigatório para ONNX)
+    """
+    from sentence_transformers import SentenceTransformer
+
+    check_backend(backend)
+    if backend == "torch":
+        return SentenceTransformer(model_name, device=device, revision=revision)
+
+    if models_dir is None:
+        raise ValueError(f"Backend {backend} requer models_dir para o modelo exportado")
+    _require_onnx()
+    export_dir = export_dir_for(models_dir, model_name, revision)
+    file_name = export_onnx(model_name, export_dir, revision, int8=backend == "onnx-int8")
+    return SentenceTransformer(str(export_dir), device=device, backend="onnx",
+                               model_kwargs={"file_name": file_name})
+
+
+def load_tokenizer(model_name: str, revision: Optional[str] = None):
+    """
+    Apenas o tokenizer (rápido) do modelo, sem carregar os pesos
+
+    É o mesmo em todos os backends: os modelos exportados copiam o do hub.
+    """
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_name, revision=revision, use_fast=True)
+
+
+def set_pooling(model, mode: str) -> None:
+    """Substitui o módulo de pooling do modelo (mean, cls, max, ...)"""
+    from sentence_transformers.models import Pooling
+
+    for name, module in model.named_children():
+        if isinstance(module, Pooling):
+            model._modules[name] = Pooling(module.word_embedding_dimension, pooling_mode=mode)
+            return
+    raise ValueError("Modelo sem módulo de pooling para substituir")
+
+
+def configure_model(model, max_seq_length: Optional[int] = None, pooling: Optional[str] = None) -> None:
+    """Aplica truncamento e pooling do namespace a um modelo carregado"""
+    if max_seq_length:
+        model.max_seq_length = max_seq_length
+    if pooling:
+        set_pooling(model, pooling)
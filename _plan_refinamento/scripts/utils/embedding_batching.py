@@ -0,0 +1,108 @@
+"""
+Batches por comprimento para a geração de embeddings
+
+Em um batch, todos os textos são preenchidos (padding) até o comprimento do
+maior; o custo do batch é proporcional a textos × maior comprimento em
+tokens. Misturar labels curtos de L3 com conteúdo longo de notícias faz a
+maior parte desse custo ser padding.
+
+Aqui os textos são ordenados pelo comprimento tokenizado e agrupados sob um
+orçamento de tokens com padding (token_budget): textos curtos vão em batches
+grandes, textos longos em batches pequenos, e o pico de memória fica
+limitado pelo orçamento em vez do número de textos. A saída volta na ordem
+original.
+
+O módulo não importa sentence_transformers: o modelo (e o tokenizer dele)
+é recebido pronto.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+# Limite de textos por batch, mesmo quando todos são curtos
+MAX_BATCH_SIZE = 512
+
+
+def plan_batches(lengths: np.ndarray, token_budget: int,
+                 max_batch_size: int = MAX_BATCH_SIZE) -> List[np.ndarray]:
+    """
+    Agrupa textos por comprimento sob um orçamento de tokens
+
+    Args:
+        lengths: Comprimento em tokens de cada texto
+        token_budget: Máximo de textos × maior comprimento por batch (um
+            texto sozinho sempre forma um batch, mesmo acima do orçamento)
+        max_batch_size: Máximo de textos por batch
+
+    Returns:
+        Índices (nas posições de lengths) de cada batch, do mais curto ao
+        mais longo
+    """
+    lengths = np.maximum(np.asarray(lengths, dtype=np.int64), 1)
+    order = np.argsort(lengths, kind='stable')
+
+    batches = []
+    start = 0
+    while start < len(order):
+        # Em ordem crescente o maior comprimento do batch é o do último texto:
+        # o batch cresce enquanto (n textos) × (comprimento do n-ésimo) cabe,
+        # e esse produto só aumenta com n
+        sorted_lengths = lengths[order[start:start + max_batch_size]]
+        fits = sorted_lengths * np.arange(1, len(sorted_lengths) + 1) <= token_budget
+        size = max(1, int(fits.sum()))
+        batches.append(order[start:start + size])
+        start += size
+    return batches
+
+
+def padded_tokens(lengths: np.ndarray, batches: List[np.ndarray]) -> int:
+    """Tokens processados, com padding, por uma divisão em batches"""
+    lengths = np.asarray(lengths)
+    return int(sum(len(batch) * lengths[batch].max() for batch in batches if len(batch)))
+
+
+def token_lengths(model, texts: List[str]) -> np.ndarray:
+    """Comprimento em tokens de cada texto (com tokens especiais e truncamento do modelo)"""
+    encoded = model.tokenizer(
+        texts, add_special_tokens=True, truncation=True, max_length=model.max_seq_length,
+        return_attention_mask=False, return_token_type_ids=False
+    )
+    return np.fromiter((len(ids) for ids in encoded['input_ids']), dtype=np.int64, count=len(texts))
+
+
+def encode_bucketed(model, texts: List[str], token_budget: int, normalize: bool = False,
+                    show_progress: bool = False, dim: Optional[int] = None) -> np.ndarray:
+    """
+    Embeddings de todos os textos, em batches por comprimento (ver plan_batches)
+
+    Args:
+        model: SentenceTransformer carregado
+        texts: Textos, em qualquer ordem
+        token_budget: Orçamento de tokens com padding por batch
+        normalize: Normalizar os vetores (normalize_embeddings)
+        show_progress: Barra de progresso por texto
+        dim: Dimensão dos vetores (padrão: a do modelo)
+
+    Returns:
+        Matriz float32 (len(texts), dim) na ordem de texts
+    """
+    dim = dim or model.get_sentence_embedding_dimension()
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    if not texts:
+        return out
+
+    # tqdm custa ~50 ms de import: só no caminho que gera embeddings
+    from tqdm import tqdm
+
+    batches = plan_batches(token_lengths(model, texts), token_budget)
+    with tqdm(total=len(texts), desc="Gerando embeddings", disable=not show_progress) as progress:
+        for batch in batches:
+            out[batch] = model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=normalize
+            )
+            progress.update(len(batch))
+    return out
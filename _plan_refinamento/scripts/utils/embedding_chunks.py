@@ -0,0 +1,156 @@
+"""
+Trechos de documentos longos para embeddings (estratégia C: conteúdo completo)
+
+O modelo trunca a entrada em max_seq_length tokens (128 no mpnet) e quase
+toda a notícia ficaria de fora. Aqui o texto é dividido em trechos de até
+max_tokens tokens, cada um com overlap tokens do final do trecho anterior;
+cada trecho é gerado (e cacheado) como um texto comum, e os vetores dos
+trechos são combinados em um vetor do documento (pool_chunks).
+
+Os cortes seguem o conteúdo: o texto é dividido em frases e um trecho
+termina depois de uma frase cujo hash cai na fronteira (com o trecho já
+tendo metade do tamanho) ou quando a próxima frase não cabe. A decisão
+depende só das frases, então uma edição no meio do texto muda apenas os
+trechos em volta dela: depois da edição os cortes voltam aos mesmos lugares
+na primeira fronteira, e os trechos seguintes continuam no cache.
+
+O módulo não importa transformers: recebe pronto um tokenizer rápido (com
+offset_mapping), o do próprio modelo.
+"""
+import re
+import zlib
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+POOLING_MODES = ("mean", "max", "first-k")
+
+# Tokens especiais (<s> e </s>) somados pelo modelo a cada trecho
+SPECIAL_TOKENS = 2
+
+# Em média, uma frase em BOUNDARY_DIVISOR termina trecho
+BOUNDARY_DIVISOR = 3
+
+# Pontuação de fim de frase, com aspas/parênteses de fechamento
+_SENTENCE_END = re.compile(r"[.!?…;:][\"')\]»”]*$")
+
+
+class Chunk(NamedTuple):
+    """Trecho de um documento"""
+    text: str
+    tokens: int  # tokens novos (sem a sobreposição): peso do trecho na média
+
+
+def check_pooling(mode: str) -> str:
+    if mode not in POOLING_MODES:
+        raise ValueError(f"Pooling de trechos desconhecido: {mode} (use {', '.join(POOLING_MODES)})")
+    return mode
+
+
+def sentence_spans(text: str, offsets: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Frases do texto como intervalos de tokens [início, fim)
+
+    Uma frase termina em pontuação seguida de espaço ou em quebra de linha.
+    """
+    spans, start = [], 0
+    for i, (token_start, token_end) in enumerate(offsets):
+        if i + 1 == len(offsets):
+            spans.append((start, i + 1))
+            break
+        # Espaço entre os tokens e o primeiro caractere do próximo (offsets com ou sem o espaço)
+        gap = text[token_end:offsets[i + 1][0] + 1]
+        if "\n" in gap or (gap[:1].isspace() and _SENTENCE_END.search(text[token_start:token_end])):
+            spans.append((start, i + 1))
+            start = i + 1
+    return spans
+
+
+def plan_chunks(units: Sequence[Tuple[int, int]], boundaries: Sequence[bool],
+                max_tokens: int, overlap: int) -> List[Tuple[int, int, int]]:
+    """
+    Agrupa unidades consecutivas (frases) em trechos
+
+    Args:
+        units: Intervalos de tokens [início, fim) contíguos, nenhum maior que
+            max_tokens - overlap
+        boundaries: Se cada unidade pode terminar um trecho (hash do conteúdo)
+        max_tokens: Tokens por trecho, incluindo a sobreposição
+        overlap: Tokens do trecho anterior repetidos no início de cada trecho
+
+    Returns:
+        (início com sobreposição, início, fim) de cada trecho, em tokens
+    """
+    body_limit = max_tokens - overlap
+    min_tokens = body_limit // 2
+
+    bodies, body_start = [], None
+    for (start, end), boundary in zip(units, boundaries):
+        if body_start is not None and end - body_start > body_limit:
+            bodies.append((body_start, start))
+            body_start = None
+        if body_start is None:
+            body_start = start
+        if boundary and end - body_start >= min_tokens:
+            bodies.append((body_start, end))
+            body_start = None
+    if body_start is not None:
+        bodies.append((body_start, units[-1][1]))
+
+    return [(max(0, start - overlap), start, end) for start, end in bodies]
+
+
+class TextChunker:
+    """Divide textos em trechos de até max_tokens tokens com sobreposição"""
+
+    def __init__(self, tokenizer, max_tokens: int, overlap: int):
+        if max_tokens - overlap < 1 or overlap < 0:
+            raise ValueError(f"Trechos de {max_tokens} tokens com sobreposição de {overlap}: "
+                             f"sobreposição deve ficar entre 0 e {max_tokens - 1}")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+
+    def split(self, texts: List[str]) -> List[List[Chunk]]:
+        """Trechos de cada texto (ao menos um por texto)"""
+        encoded = self.tokenizer(list(texts), add_special_tokens=False,
+                                 return_offsets_mapping=True, verbose=False)
+        return [self._split_one(text, offsets) for text, offsets in zip(texts, encoded['offset_mapping'])]
+
+    def _split_one(self, text: str, offsets: List[Tuple[int, int]]) -> List[Chunk]:
+        if len(offsets) <= self.max_tokens:
+            return [Chunk(text, max(1, len(offsets)))]
+
+        # Frases maiores que um trecho viram pedaços do tamanho máximo
+        body_limit = self.max_tokens - self.overlap
+        units = [(piece, min(piece + body_limit, end))
+                 for start, end in sentence_spans(text, offsets)
+                 for piece in range(start, end, body_limit)]
+        boundaries = [zlib.crc32(self._slice(text, offsets, start, end).encode('utf-8')) % BOUNDARY_DIVISOR == 0
+                      for start, end in units]
+
+        return [Chunk(self._slice(text, offsets, first, end), end - start)
+                for first, start, end in plan_chunks(units, boundaries, self.max_tokens, self.overlap)]
+
+    @staticmethod
+    def _slice(text: str, offsets: List[Tuple[int, int]], start: int, end: int) -> str:
+        return text[offsets[start][0]:offsets[end - 1][1]]
+
+
+def pool_chunks(vectors: np.ndarray, tokens: np.ndarray, mode: str = "mean", first_k: int = 3) -> np.ndarray:
+    """
+    Vetor do documento a partir dos vetores dos trechos
+
+    - mean: média ponderada pelos tokens novos de cada trecho
+    - max: máximo por dimensão
+    - first-k: média dos k primeiros trechos com pesos 1, 1/2, ..., 1/k
+      (o início da notícia concentra o assunto)
+    """
+    if mode == "mean":
+        return np.average(vectors, axis=0, weights=tokens).astype(np.float32)
+    if mode == "max":
+        return vectors.max(axis=0)
+    if mode == "first-k":
+        head = vectors[:first_k]
+        return np.average(head, axis=0, weights=1.0 / np.arange(1, len(head) + 1)).astype(np.float32)
+    check_pooling(mode)
@@ -0,0 +1,70 @@
+"""
+Textos enviados ao modelo de embeddings pelos scripts do projeto
+
+Os scripts que geram embeddings montam os textos sempre pelas funções deste
+módulo, e a coleta de lixo do cache (scripts/manutencao/cache_embeddings.py
+gc) usa as mesmas funções para saber quais vetores ainda podem ser pedidos:
+um texto montado de outra forma em algum script teria o vetor descartado
+na próxima coleta (e seria gerado de novo no uso seguinte).
+"""
+import csv
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from .theme_columns import ThemeColumns
+
+CONTENT_CHARS = 500
+
+
+def news_texts(dataset_file: Path) -> List[str]:
+    """Título + resumo (ou início do conteúdo) de cada notícia"""
+    with open(dataset_file, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    texts = []
+    for row in rows:
+        body = row.get("resumo") or (row.get("conteudo_inicio") or "")[:CONTENT_CHARS]
+        texts.append(f"{row.get('titulo') or ''}. {body}".strip())
+    return texts
+
+
+def content_texts(dataset_file: Path) -> List[str]:
+    """Título + conteúdo completo de cada notícia (estratégia C, para encode_long)"""
+    with open(dataset_file, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    return [f"{row.get('titulo') or ''}. {row.get('conteudo') or row.get('conteudo_inicio') or ''}".strip()
+            for row in rows]
+
+
+def field_texts(dataset_file: Path, fields: Tuple[str, ...], limit: Optional[int] = None) -> List[str]:
+    """Campos não vazios das notícias, intercalados por notícia (curtos e longos misturados)"""
+    with open(dataset_file, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))[:limit]
+    return [row[field] for row in rows for field in fields if row.get(field)]
+
+
+def node_texts(cols: ThemeColumns, level: str) -> List[str]:
+    """Label + descrição de cada nó do nível"""
+    rows = cols.level_range(level)
+    return [f"{label}. {description}" for label, description in zip(cols.labels_in(rows), cols.descriptions_in(rows))]
+
+
+def node_descriptions(cols: ThemeColumns) -> List[str]:
+    """Descrições de todos os nós (análise de similaridade entre irmãos)"""
+    return cols.descriptions_in(range(len(cols)))
+
+
+def reachable_texts(cols: ThemeColumns, dataset_files: List[Path], chunker=None) -> Set[str]:
+    """
+    Todos os textos que os scripts podem pedir para a árvore e os datasets atuais
+
+    Com chunker (embedding_chunks.TextChunker), inclui os trechos do conteúdo
+    completo das notícias gerados por encode_long.
+    """
+    texts = set(node_descriptions(cols))
+    for level in ("L1", "L2", "L3"):
+        texts.update(node_texts(cols, level))
+    for dataset_file in dataset_files:
+        texts.update(news_texts(dataset_file))
+        if chunker is not None:
+            texts.update(chunk.text for doc in chunker.split(content_texts(dataset_file)) for chunk in doc)
+    return texts
@@ -0,0 +1,151 @@
+"""
+Namespaces do cache de embeddings
+
+Um vetor só pode ser reaproveitado se foi gerado pelo mesmo modelo, na
+mesma revisão e no mesmo backend de inferência, com o mesmo pooling,
+truncamento, normalização e pré-processamento do texto, e guardado no mesmo
+modo de armazenamento.
+Esses parâmetros formam o namespace; cada namespace tem seu próprio store
+(embeddings_<id>/, com o descritor em namespace.json), e dentro dele a
+chave é o hash do texto (ver embedding_store.text_key).
+
+Mudar qualquer parâmetro leva a um namespace novo: nada de vetores antigos
+servidos em silêncio. Os namespaces que não correspondem à configuração
+atual ficam obsoletos e podem ser listados e removidos
+(scripts/manutencao/cache_embeddings.py).
+
+PREPROCESSING_VERSION deve ser incrementado sempre que o texto passar a
+ser transformado antes da geração (ex.: remoção de markdown).
+"""
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .embedding_store import EmbeddingStore
+from .tree_snapshot import atomic_write
+
+PREPROCESSING_VERSION = 1
+
+NAMESPACE_FILE = "namespace.json"
+STORE_PREFIX = "embeddings_"
+
+
+class EmbeddingNamespace:
+    """Parâmetros que determinam os vetores gerados (e o diretório do store)"""
+
+    def __init__(self, model: str, revision: Optional[str] = None, max_seq_length: Optional[int] = None,
+                 pooling: Optional[str] = None, normalize: bool = False,
+                 preprocessing: int = PREPROCESSING_VERSION, storage: str = "float32",
+                 backend: str = "torch"):
+        self.model = model
+        self.revision = revision or None          # None: revisão padrão do hub
+        self.max_seq_length = max_seq_length or None  # None: limite do modelo
+        self.pooling = pooling or None            # None: pooling do modelo
+        self.normalize = bool(normalize)
+        self.preprocessing = preprocessing
+        self.storage = storage
+        self.backend = backend                    # torch, onnx, onnx-int8
+
+    def to_dict(self) -> Dict:
+        return {
+            'model': self.model,
+            'revision': self.revision,
+            'max_seq_length': self.max_seq_length,
+            'pooling': self.pooling,
+            'normalize': self.normalize,
+            'preprocessing': self.preprocessing,
+            'storage': self.storage,
+            'backend': self.backend,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EmbeddingNamespace":
+        return cls(**data)
+
+    def with_storage(self, storage: str) -> "EmbeddingNamespace":
+        """Mesmo namespace em outro modo de armazenamento"""
+        return EmbeddingNamespace.from_dict({**self.to_dict(), 'storage': storage})
+
+    @property
+    def id(self) -> str:
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=6).hexdigest()
+
+    def store_dir(self, cache_dir: Path) -> Path:
+        return Path(cache_dir) / f"{STORE_PREFIX}{self.id}"
+
+    def open_store(self, cache_dir: Path) -> EmbeddingStore:
+        """Store do namespace, registrando o descritor no diretório"""
+        store_dir = self.store_dir(cache_dir)
+        descriptor = store_dir / NAMESPACE_FILE
+        if not descriptor.exists():
+            store_dir.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps(self.to_dict(), ensure_ascii=False, indent=2).encode('utf-8')
+            atomic_write(descriptor, lambda f: f.write(payload))
+        return EmbeddingStore(store_dir, self.storage)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EmbeddingNamespace) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"EmbeddingNamespace({self.id}: {self.to_dict()})"
+
+
+def disk_size(path: Path) -> int:
+    """Bytes em disco de um arquivo ou diretório (recursivo)"""
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def list_namespaces(cache_dir: Path, current: Sequence[EmbeddingNamespace] = ()) -> List[Dict]:
+    """
+    Namespaces (e caches em formatos antigos) presentes no diretório
+
+    Args:
+        cache_dir: Diretório do cache
+        current: Namespaces em uso pela configuração atual
+
+    Returns:
+        Lista de dicts com 'path', 'id', 'namespace' (descritor ou None se
+        legado), 'entries' (None se desconhecido), 'bytes' e 'current'
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return []
+
+    current_ids = {namespace.id for namespace in current}
+    entries = []
+    for path in sorted(cache_dir.glob(f"{STORE_PREFIX}*")):
+        descriptor = None
+        count = None
+        if path.is_dir() and (path / NAMESPACE_FILE).exists():
+            with open(path / NAMESPACE_FILE, 'r', encoding='utf-8') as f:
+                descriptor = json.load(f)
+            try:
+                count = len(EmbeddingStore(path, descriptor.get('storage', 'float32')))
+            except ValueError:
+                count = None
+
+        # Sem descritor: store anterior aos namespaces ou pickle do formato antigo
+        name = path.name[len(STORE_PREFIX):]
+        entries.append({
+            'path': path,
+            'id': name if descriptor is not None else None,
+            'namespace': descriptor,
+            'entries': count,
+            'bytes': disk_size(path),
+            'current': descriptor is not None and name in current_ids,
+        })
+    return entries
+
+
+def remove_namespace(path: Path) -> None:
+    """Apaga um namespace (diretório do store) ou um cache legado (arquivo)"""
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
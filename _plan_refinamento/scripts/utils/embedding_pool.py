@@ -0,0 +1,136 @@
+"""
+Pool de processos para gerar embeddings em CPU em escala de corpus
+
+Uma chamada a SentenceTransformer.encode ocupa um processo: tokenização e
+o laço em Python ficam presos ao GIL e boa parte dos núcleos fica ociosa.
+O pool divide os textos entre N processos (spawn), cada um com sua própria
+cópia do modelo (mesmo backend, truncamento e pooling do namespace) e um
+número controlado de threads intra-op, para que os processos não disputem
+os mesmos núcleos. Os textos são ordenados por tamanho antes da divisão
+(cada fatia fica homogênea para os batches por comprimento, ver
+embedding_batching) e os resultados voltam na ordem original.
+
+Os processos carregam o modelo na primeira fatia e ficam vivos até close().
+O tamanho dos batches vai junto com cada fatia: chamadas a encode com
+batch_size diferentes usam o mesmo pool.
+"""
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Textos por fatia enviada a um processo
+CHUNK_SIZE = 256
+
+_model = None
+_options = None
+
+
+def default_threads(workers: int) -> int:
+    """Threads intra-op por processo: núcleos divididos entre os processos"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_worker(options: dict) -> None:
+    global _options
+    # Antes de importar torch/onnxruntime: o limite vale para o OpenMP também
+    os.environ["OMP_NUM_THREADS"] = str(options['threads'])
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _options = options
+
+
+def _encode_chunk(task: Tuple[List[str], int]) -> np.ndarray:
+    global _model
+    chunk, batch_size = task
+    if _model is None:
+        import torch
+
+        from .embedding_backends import configure_model, load_model
+
+        torch.set_num_threads(_options['threads'])
+        _model = load_model(_options['model_name'], _options['backend'], device="cpu",
+                            revision=_options['revision'], models_dir=_options['models_dir'])
+        configure_model(_model, _options['max_seq_length'], _options['pooling'])
+
+    from .embedding_batching import encode_bucketed
+
+    token_budget = _options['token_budget'] or batch_size * _model.max_seq_length
+    return encode_bucketed(_model, chunk, token_budget, normalize=_options['normalize'])
+
+
+class EncodingPool:
+    """Processos com cópias do modelo; encode divide os textos e junta na ordem"""
+
+    def __init__(self, model_name: str, workers: int, threads: int = 0, backend: str = "torch",
+                 revision: Optional[str] = None, max_seq_length: Optional[int] = None,
+                 pooling: Optional[str] = None, normalize: bool = False, token_budget: int = 0,
+                 batch_size: int = 32, models_dir: Optional[Path] = None):
+        self.workers = workers
+        self.threads = threads or default_threads(workers)
+        self.batch_size = batch_size
+
+        if backend != "torch":
+            # Exportar uma vez aqui, e não em N processos ao mesmo tempo
+            from .embedding_backends import export_dir_for, export_onnx
+
+            export_onnx(model_name, export_dir_for(models_dir, model_name, revision), revision,
+                        int8=backend == "onnx-int8")
+
+        options = {
+            'model_name': model_name, 'backend': backend, 'revision': revision,
+            'max_seq_length': max_seq_length, 'pooling': pooling, 'normalize': normalize,
+            'token_budget': token_budget, 'models_dir': models_dir,
+            'threads': self.threads,
+        }
+        import multiprocessing as mp
+
+        # spawn: fork herdaria threads e estado do torch do processo principal
+        self._pool = mp.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(options,))
+
+    def encode(self, texts: List[str], show_progress: bool = False,
+               batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Embeddings dos textos, gerados nos processos do pool
+
+        Args:
+            texts: Textos
+            show_progress: Mostrar barra de progresso
+            batch_size: Tamanho do batch de textos mais longos (define o
+                orçamento de tokens se token_budget não foi configurado;
+                padrão: o do pool)
+
+        Returns:
+            Matriz float32 (len(texts), dim) na ordem de texts
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        from tqdm import tqdm
+
+        order = np.argsort([len(text) for text in texts], kind='stable')
+        chunks = [order[i:i + CHUNK_SIZE] for i in range(0, len(order), CHUNK_SIZE)]
+
+        out = None
+        batch_size = batch_size or self.batch_size
+        results = self._pool.imap(_encode_chunk, [([texts[i] for i in chunk], batch_size) for chunk in chunks])
+        with tqdm(total=len(texts), desc="Gerando embeddings", disable=not show_progress) as progress:
+            for chunk, vectors in zip(chunks, results):
+                if out is None:
+                    out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+                out[chunk] = vectors
+                progress.update(len(chunk))
+        return out
+
+    def close(self) -> None:
+        """Encerra os processos"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "EncodingPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
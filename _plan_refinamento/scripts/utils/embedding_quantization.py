@@ -0,0 +1,100 @@
+"""
+Quantização dos embeddings armazenados (float16 / int8)
+
+Modos de armazenamento do store de embeddings (ver embedding_store):
+
+- float32: vetor original (4 bytes por dimensão)
+- float16: meia precisão (2 bytes por dimensão)
+- int8:    inteiros com escala por vetor, v ≈ codes * scale
+           (1 byte por dimensão + 4 bytes de escala)
+
+A leitura devolve sempre float32 (dequantizado). ranking_drift mede quanto
+a quantização altera o ranking por similaridade de cosseno entre consultas
+(notícias) e alvos (nós da árvore), para decidir se um modo é aceitável.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+STORAGE_MODES = ('float32', 'float16', 'int8')
+
+CODE_DTYPES = {
+    'float32': np.dtype('<f4'),
+    'float16': np.dtype('<f2'),
+    'int8': np.dtype('i1'),
+}
+
+INT8_MAX = 127
+
+
+def check_mode(storage: str) -> str:
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"Modo de armazenamento desconhecido: {storage} (use {', '.join(STORAGE_MODES)})")
+    return storage
+
+
+def bytes_per_vector(storage: str, dim: int) -> int:
+    """Bytes em disco por vetor (sem a chave)"""
+    extra = 4 if storage == 'int8' else 0
+    return CODE_DTYPES[storage].itemsize * dim + extra
+
+
+def quantize(vectors: np.ndarray, storage: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantiza vetores (1D ou 2D) no modo pedido
+
+    Returns:
+        (codes, scales): scales só no modo int8 (um por vetor), senão None
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if storage == 'int8':
+        scales = np.abs(vectors).max(axis=-1) / INT8_MAX
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.rint(vectors / scales[..., None]).clip(-INT8_MAX, INT8_MAX).astype(np.int8)
+        return codes, scales
+    return vectors.astype(CODE_DTYPES[storage], copy=False), None
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray], storage: str) -> np.ndarray:
+    """Volta a float32 (view sem cópia no modo float32)"""
+    if storage == 'int8':
+        return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[..., None]
+    return codes.astype(np.float32, copy=False)
+
+
+def roundtrip(vectors: np.ndarray, storage: str) -> np.ndarray:
+    """Vetores como seriam lidos do store no modo pedido"""
+    return dequantize(*quantize(vectors, storage), storage)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def ranking_drift(queries: np.ndarray, targets: np.ndarray, storage: str, k: int = 5) -> Dict[str, float]:
+    """
+    Mudança no ranking de similaridade consulta → alvos causada pela quantização
+
+    Consultas e alvos passam pelo mesmo modo (ambos vêm do cache).
+
+    Returns:
+        Dict com top1_agreement (fração de consultas com o mesmo alvo mais
+        similar), topk_overlap (interseção média dos top-k), mean_abs_delta e
+        max_abs_delta (diferença nas similaridades de cosseno)
+    """
+    k = min(k, len(targets))
+    reference = _normalize(np.asarray(queries, dtype=np.float32)) @ _normalize(np.asarray(targets, dtype=np.float32)).T
+    quantized = _normalize(roundtrip(queries, storage)) @ _normalize(roundtrip(targets, storage)).T
+
+    ref_top = np.argsort(-reference, axis=1, kind='stable')[:, :k]
+    new_top = np.argsort(-quantized, axis=1, kind='stable')[:, :k]
+    overlap = [len(np.intersect1d(a, b)) / k for a, b in zip(ref_top, new_top)]
+    delta = np.abs(quantized - reference)
+
+    return {
+        'top1_agreement': float(np.mean(ref_top[:, 0] == new_top[:, 0])),
+        'topk_overlap': float(np.mean(overlap)),
+        'mean_abs_delta': float(delta.mean()),
+        'max_abs_delta': float(delta.max()),
+    }
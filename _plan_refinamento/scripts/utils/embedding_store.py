@@ -0,0 +1,653 @@
+"""
+Armazenamento persistente de embeddings em memória mapeada
+
+Os vetores ficam em uma matriz contígua (vectors.npy) e o índice
+hash → linha em um array compacto (index.npy, 16 bytes por entrada: linha 0
+com as chaves ordenadas, linha 1 com a linha correspondente na matriz). Os
+dois arquivos são abertos com mmap: abrir o store não lê os vetores, e o
+custo de abertura não depende do tamanho do cache. Buscas são binárias sobre
+as chaves e devolvem views da matriz, sem cópia.
+
+Vetores novos não regravam a matriz: são acrescentados, em lote e com
+fsync, a um segmento de log (segments/seg-*.log, registros chave + vetor de
+tamanho fixo). O custo de uma gravação depende apenas das entradas novas.
+De tempos em tempos (quando os segmentos passam de uma fração da matriz) os
+segmentos são compactados na matriz principal.
+
+Vários processos podem usar o mesmo diretório ao mesmo tempo:
+
+- cada processo grava apenas no próprio segmento, mantendo um flock
+  exclusivo sobre ele enquanto o store estiver aberto;
+- a compactação roda sob um lock exclusivo (compact.lock) e só incorpora
+  segmentos cujo lock consegue obter, isto é, de processos já encerrados
+  (ou do próprio processo);
+- leitores nunca pegam locks: matriz e índice são substituídos por rename,
+  e os mapeamentos já abertos continuam válidos. Em uma busca sem resultado
+  o store relê o diretório (no máximo a cada REFRESH_INTERVAL segundos) para
+  enxergar vetores gravados por outros processos.
+
+Invariante de gravação: as linhas da matriz nunca mudam de posição; novas
+linhas são acrescentadas ao final. A matriz é gravada antes do índice (e
+lida depois dele), e os segmentos só são apagados depois de ambos, de modo
+que nenhuma falha ou leitura concorrente vê o índice apontando para linhas
+inexistentes, nem perde vetores já gravados.
+
+Modos de armazenamento (ver embedding_quantization): float32 (padrão),
+float16 e int8 com escala por vetor (scales.npy / campo scale do segmento).
+Os vetores são quantizados no put e dequantizados na leitura; get devolve
+sempre float32 (view sem cópia apenas no modo float32). O modo fica no
+cabeçalho dos segmentos e no dtype da matriz, e não pode ser trocado em um
+store existente.
+
+Coleta de lixo (retain): descartar vetores muda as linhas de lugar, o que
+quebraria o invariante acima para leitores concorrentes. Por isso a matriz
+enxuta é gravada inteira em uma nova geração (gen-<ns>/, com matriz, índice
+e escalas próprios) e só então o arquivo CURRENT passa a apontar para ela,
+com um único rename. Leitores abertos continuam com os mapeamentos da
+geração anterior (arquivos apagados seguem válidos enquanto mapeados), e
+quem abre o store durante a troca relê CURRENT e tenta de novo. Sem CURRENT,
+a matriz fica na raiz do store (layout anterior à coleta).
+
+Sem fcntl (Windows), os locks não estão disponíveis: a compactação
+incorpora apenas o segmento do próprio processo.
+"""
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_quantization import CODE_DTYPES, STORAGE_MODES, check_mode, dequantize, quantize
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+VECTORS_FILE = "vectors.npy"
+INDEX_FILE = "index.npy"
+SCALES_FILE = "scales.npy"
+SEGMENTS_DIR = "segments"
+COMPACT_LOCK_FILE = "compact.lock"
+CURRENT_FILE = "CURRENT"
+GENERATION_PREFIX = "gen-"
+
+# Índice (2, n): chaves de 64 bits ordenadas e linhas correspondentes na matriz
+INDEX_DTYPE = np.dtype('<u8')
+
+# Segmento: cabeçalho (magic + dimensão + modo) seguido de registros de tamanho fixo
+SEGMENT_MAGIC = b"EMBSEG01"
+SEGMENT_HEADER_SIZE = 16
+
+# Compactar quando os segmentos somarem mais que max(mínimo, fração da matriz)
+COMPACT_MIN_ENTRIES = 10_000
+COMPACT_RATIO = 0.25
+
+# Intervalo mínimo (s) entre releituras do diretório em buscas sem resultado
+REFRESH_INTERVAL = 1.0
+
+# Linhas copiadas por vez em get_many
+GATHER_CHUNK = 1024
+
+# Tentativas de abertura quando a geração é trocada durante a leitura
+OPEN_ATTEMPTS = 3
+
+
+def text_key(text: str) -> int:
+    """Chave de 64 bits do texto (blake2b)"""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def text_keys(texts: List[str]) -> np.ndarray:
+    """Chaves de vários textos (mesmas de text_key), como array uint64"""
+    digests = b"".join(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest() for text in texts)
+    return np.frombuffer(digests, dtype=INDEX_DTYPE).copy()
+
+
+def segment_dtype(dim: int, storage: str = 'float32') -> np.dtype:
+    """Registro de segmento: chave (+ escala no modo int8) + vetor quantizado"""
+    fields = [('key', '<u8')]
+    if storage == 'int8':
+        fields.append(('scale', '<f4'))
+    fields.append(('vec', CODE_DTYPES[storage], (dim,)))
+    return np.dtype(fields)
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    """Grava .npy via temporário + rename"""
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, 'wb') as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        if tmp_file.exists():
+            tmp_file.unlink()
+        raise
+
+
+def _write_text(path: Path, text: str) -> None:
+    """Grava texto curto via temporário + fsync + rename"""
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def _try_lock(f) -> bool:
+    """flock exclusivo sem bloquear (False se outro processo o detém ou sem fcntl)"""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _map_segment(path: Path) -> Optional[np.ndarray]:
+    """
+    Mapeia os registros completos de um segmento (None se inválido)
+
+    Um registro incompleto no fim (gravação interrompida ou em andamento) é
+    ignorado.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(SEGMENT_HEADER_SIZE)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    if len(header) < SEGMENT_HEADER_SIZE or header[:8] != SEGMENT_MAGIC or header[12] >= len(STORAGE_MODES):
+        return None
+
+    dtype = segment_dtype(int.from_bytes(header[8:12], 'little'), STORAGE_MODES[header[12]])
+    count = (size - SEGMENT_HEADER_SIZE) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=SEGMENT_HEADER_SIZE, shape=(count,))
+
+
+class EmbeddingStore:
+    """Store de embeddings: matriz memmap + índice ordenado + segmentos de log"""
+
+    def __init__(self, store_dir: Path, storage: str = 'float32',
+                 compact_min_entries: int = COMPACT_MIN_ENTRIES):
+        self.store_dir = Path(store_dir)
+        self.storage = check_mode(storage)
+        self._use_generation(self.store_dir)
+        self.segments_dir = self.store_dir / SEGMENTS_DIR
+        self.compact_min_entries = compact_min_entries
+
+        self.vectors: Optional[np.ndarray] = None   # memmap (n, dim), dtype do modo
+        self.scales: Optional[np.ndarray] = None    # memmap (n,), só no modo int8
+        self.keys = np.empty(0, dtype=INDEX_DTYPE)   # views contíguas do índice memmap
+        self.rows = np.empty(0, dtype=INDEX_DTYPE)
+
+        # Segmentos mapeados e chave → (segmento, registro)
+        self._segments: Dict[Path, np.ndarray] = {}
+        self._segment_rows: Dict[int, Tuple[np.ndarray, int]] = {}
+
+        # Segmento deste processo, aberto para append e com flock exclusivo
+        self._own_segment: Optional[Path] = None
+        self._own_file = None
+
+        # Vetores ainda não persistidos, já quantizados (chave → (codes, escala))
+        self.pending: Dict[int, Tuple[np.ndarray, Optional[float]]] = {}
+
+        self._index_stat: Optional[Tuple[str, int, int]] = None
+        self._refreshed_at = 0.0
+        self._open()
+
+    def _reset(self) -> None:
+        self.vectors = None
+        self.scales = None
+        self.keys = np.empty(0, dtype=INDEX_DTYPE)
+        self.rows = np.empty(0, dtype=INDEX_DTYPE)
+        self._segments = {}
+        self._segment_rows = {}
+        self._index_stat = None
+
+    def _current_generation(self) -> Path:
+        """Diretório da matriz em uso (a raiz do store se não houver CURRENT)"""
+        try:
+            name = (self.store_dir / CURRENT_FILE).read_text(encoding='utf-8').strip()
+        except OSError:
+            return self.store_dir
+        return self.store_dir / name if name else self.store_dir
+
+    def _use_generation(self, generation_dir: Path) -> None:
+        self.generation_dir = generation_dir
+        self.vectors_file = generation_dir / VECTORS_FILE
+        self.index_file = generation_dir / INDEX_FILE
+        self.scales_file = generation_dir / SCALES_FILE
+
+    def _stat_index(self) -> Optional[Tuple[str, int, int]]:
+        generation_dir = self._current_generation()
+        try:
+            stat = (generation_dir / INDEX_FILE).stat()
+        except OSError:
+            return None
+        return generation_dir.name, stat.st_mtime_ns, stat.st_ino
+
+    def _open(self) -> None:
+        """Mapeia matriz, índice e segmentos (sem ler os vetores)"""
+        self._refreshed_at = time.monotonic()
+
+        for _ in range(OPEN_ATTEMPTS):
+            generation_dir = self._current_generation()
+            self._use_generation(generation_dir)
+            self._index_stat = self._stat_index()
+
+            # Índice antes da matriz: a matriz lida é sempre a mesma ou mais nova
+            try:
+                index = np.load(self.index_file, mmap_mode='r')
+                if index.dtype == INDEX_DTYPE and index.ndim == 2 and index.shape[0] == 2:
+                    vectors = np.load(self.vectors_file, mmap_mode='r')
+                    scales = np.load(self.scales_file, mmap_mode='r') if self.storage == 'int8' else None
+                    self.vectors, self.scales, self.keys, self.rows = vectors, scales, index[0], index[1]
+                break
+            except (OSError, ValueError):
+                # Geração trocada (e a anterior apagada) no meio da abertura: tentar de novo
+                if self._current_generation() == generation_dir:
+                    break
+
+        if self.vectors is not None and self.vectors.dtype != CODE_DTYPES[self.storage]:
+            raise ValueError(
+                f"Store {self.store_dir} gravado como {self.vectors.dtype}, "
+                f"incompatível com o modo {self.storage}"
+            )
+
+        if self.segments_dir.exists():
+            for path in sorted(self.segments_dir.glob("seg-*.log")):
+                self._map(path)
+
+    def _map(self, path: Path) -> None:
+        """(Re)mapeia um segmento e indexa os registros ainda não vistos"""
+        records = _map_segment(path)
+        if records is None or records.dtype['vec'].base != CODE_DTYPES[self.storage]:
+            return
+        if self.dim is not None and records.dtype['vec'].shape[0] != self.dim:
+            return
+
+        seen = len(self._segments.get(path, ()))
+        self._segments[path] = records
+        for row, key in enumerate(records['key'][seen:].tolist(), start=seen):
+            self._segment_rows.setdefault(key, (records, row))
+
+    def refresh(self) -> None:
+        """Enxerga vetores gravados/compactados por outros processos desde a abertura"""
+        current = sorted(self.segments_dir.glob("seg-*.log")) if self.segments_dir.exists() else []
+        if self._stat_index() != self._index_stat or any(path not in current for path in self._segments):
+            # Houve compactação: remapear tudo (os pendentes ficam intactos)
+            self._reset()
+            self._open()
+            return
+
+        self._refreshed_at = time.monotonic()
+        for path in current:
+            self._map(path)
+
+    @property
+    def dim(self) -> Optional[int]:
+        if self.vectors is not None:
+            return self.vectors.shape[1]
+        for records in self._segments.values():
+            return records.dtype['vec'].shape[0]
+        for codes, _ in self.pending.values():
+            return codes.shape[0]
+        return None
+
+    @property
+    def segment_entries(self) -> int:
+        """Registros nos segmentos (inclui chaves repetidas)"""
+        return sum(len(records) for records in self._segments.values())
+
+    def __len__(self) -> int:
+        extra = sum(1 for key in self._segment_rows if self._row(key) is None)
+        return len(self.keys) + extra + len(self.pending)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.pending or key in self._segment_rows or self._row(key) is not None
+
+    def _row(self, key: int) -> Optional[int]:
+        """Linha da chave na matriz persistida (busca binária)"""
+        # np.uint64 explícito: um int Python forçaria conversão do array inteiro
+        key = np.uint64(key)
+        pos = int(np.searchsorted(self.keys, key))
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return int(self.rows[pos])
+        return None
+
+    def _lookup(self, key: int) -> Optional[np.ndarray]:
+        """Vetor dequantizado da chave (pendentes, segmentos ou matriz)"""
+        pending = self.pending.get(key)
+        if pending is not None:
+            return dequantize(*pending, self.storage)
+        located = self._segment_rows.get(key)
+        if located is not None:
+            records, row = located
+            scale = records['scale'][row] if self.storage == 'int8' else None
+            return dequantize(records['vec'][row], scale, self.storage)
+        row = self._row(key)
+        if row is None:
+            return None
+        scale = self.scales[row] if self.storage == 'int8' else None
+        return dequantize(self.vectors[row], scale, self.storage)
+
+    def get(self, key: int) -> Optional[np.ndarray]:
+        """Vetor float32 da chave, ou None (no modo float32, view somente leitura sem cópia)"""
+        vector = self._lookup(key)
+        if vector is None and time.monotonic() - self._refreshed_at >= REFRESH_INTERVAL:
+            self.refresh()
+            vector = self._lookup(key)
+        return vector
+
+    def put(self, key: int, vector: np.ndarray) -> None:
+        """Adiciona vetor (persistido no próximo flush)"""
+        if key in self:
+            return
+        self.pending[key] = quantize(vector, self.storage)
+
+    def _gather(self, keys: np.ndarray, out: np.ndarray, found: np.ndarray) -> None:
+        """Preenche out/found para as chaves ainda não encontradas"""
+        todo = np.flatnonzero(~found)
+        if not len(todo):
+            return
+
+        # Matriz: busca binária vetorizada + leitura das linhas em lote
+        if len(self.keys):
+            wanted = keys[todo]
+            pos = np.minimum(np.searchsorted(self.keys, wanted), len(self.keys) - 1)
+            hit = self.keys[pos] == wanted
+            targets, rows = todo[hit], self.rows[pos[hit]].astype(np.intp)
+            # Linhas em ordem crescente (leitura sequencial do mmap), em blocos
+            # para que a cópia intermediária caiba no cache da CPU
+            order = np.argsort(rows, kind='stable')
+            targets, rows = targets[order], rows[order]
+            for start in range(0, len(rows), GATHER_CHUNK):
+                chunk = rows[start:start + GATHER_CHUNK]
+                scales = self.scales[chunk] if self.storage == 'int8' else None
+                out[targets[start:start + GATHER_CHUNK]] = dequantize(self.vectors[chunk], scales, self.storage)
+            found[targets] = True
+            todo = todo[~hit]
+
+        # Segmentos e pendentes (limitados pela compactação): por chave
+        if not self.pending and not self._segment_rows:
+            return
+        for i, key in zip(todo.tolist(), keys[todo].tolist()):
+            if key in self.pending or key in self._segment_rows:
+                out[i] = self._lookup(key)
+                found[i] = True
+
+    def get_many(self, keys: np.ndarray, dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vetores de várias chaves de uma vez
+
+        Args:
+            keys: Chaves (uint64, ver text_keys)
+            dim: Dimensão da saída se o store ainda estiver vazio
+
+        Returns:
+            (vectors, found): matriz float32 (n, dim) pré-alocada, com as
+            linhas encontradas preenchidas, e máscara booleana das encontradas
+        """
+        keys = np.asarray(keys, dtype=INDEX_DTYPE)
+        dim = self.dim or dim or 0
+        out = np.zeros((len(keys), dim), dtype=np.float32)
+        found = np.zeros(len(keys), dtype=bool)
+        if not dim:
+            return out, found
+
+        self._gather(keys, out, found)
+        if not found.all() and time.monotonic() - self._refreshed_at >= REFRESH_INTERVAL:
+            self.refresh()
+            self._gather(keys, out, found)
+        return out, found
+
+    def put_many(self, keys: np.ndarray, vectors: np.ndarray) -> None:
+        """Adiciona vários vetores (quantizados em lote; persistidos no próximo flush)"""
+        keys = np.asarray(keys, dtype=INDEX_DTYPE)
+        codes, scales = quantize(vectors, self.storage)
+
+        stored = np.zeros(len(keys), dtype=bool)
+        if len(self.keys):
+            pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            stored = self.keys[pos] == keys
+
+        for i in np.flatnonzero(~stored).tolist():
+            key = int(keys[i])
+            if key not in self.pending and key not in self._segment_rows:
+                self.pending[key] = (codes[i], None if scales is None else scales[i])
+
+    def flush(self) -> None:
+        """Persiste os vetores pendentes; compacta se os segmentos cresceram demais"""
+        if not self.pending:
+            return
+        self._append_pending()
+        if self.segment_entries > max(self.compact_min_entries, COMPACT_RATIO * len(self.keys)):
+            self.compact(wait=False)
+
+    def _open_own_segment(self) -> None:
+        """
+        Cria o segmento deste processo
+
+        O arquivo é criado com nome temporário, travado e só então renomeado
+        para seg-*.log: a compactação nunca vê um segmento novo sem dono.
+        """
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        name = f"seg-{os.getpid()}-{time.time_ns()}.log"
+        tmp_file = self.segments_dir / f".{name}.tmp"
+
+        f = open(tmp_file, 'ab')
+        _try_lock(f)
+        header = SEGMENT_MAGIC + self.dim.to_bytes(4, 'little') + bytes([STORAGE_MODES.index(self.storage)])
+        f.write(header.ljust(SEGMENT_HEADER_SIZE, b'\0'))
+        f.flush()
+        os.replace(tmp_file, self.segments_dir / name)
+
+        self._own_file = f
+        self._own_segment = self.segments_dir / name
+
+    def _close_own_segment(self) -> None:
+        """Fecha o segmento deste processo (libera o lock)"""
+        if self._own_file is not None:
+            self._own_file.close()
+        self._own_file = None
+        self._own_segment = None
+
+    def _append_pending(self) -> None:
+        """Acrescenta os vetores pendentes ao segmento deste processo (um write + fsync)"""
+        if not self.pending:
+            return
+
+        records = np.empty(len(self.pending), dtype=segment_dtype(self.dim, self.storage))
+        records['key'] = np.fromiter(self.pending.keys(), dtype=INDEX_DTYPE, count=len(self.pending))
+        records['vec'] = np.stack([codes for codes, _ in self.pending.values()])
+        if self.storage == 'int8':
+            records['scale'] = [scale for _, scale in self.pending.values()]
+
+        if self._own_file is None:
+            self._open_own_segment()
+
+        self._own_file.write(records.tobytes())
+        self._own_file.flush()
+        os.fsync(self._own_file.fileno())
+
+        self.pending = {}
+        self._map(self._own_segment)
+
+    def compact(self, wait: bool = True) -> bool:
+        """
+        Incorpora os segmentos inativos à matriz principal e apaga esses segmentos
+
+        Args:
+            wait: Esperar se outro processo estiver compactando (senão, desiste)
+
+        Returns:
+            True se a compactação rodou
+        """
+        self._append_pending()
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(self.store_dir / COMPACT_LOCK_FILE, 'a') as lock:
+            if fcntl is not None:
+                if wait:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                elif not _try_lock(lock):
+                    return False
+            self._compact_locked()
+
+        self._reset()
+        self._open()
+        return True
+
+    def _compact_locked(self) -> None:
+        """Corpo da compactação (chamado com compact.lock obtido)"""
+        # Segmento próprio fechado para que possa ser incorporado
+        own_segment = self._own_segment
+        self._close_own_segment()
+
+        # Estado atual em disco (outro processo pode ter acabado de compactar)
+        self._reset()
+        self._open()
+
+        # Segmentos incorporáveis: os que conseguimos travar (donos encerrados)
+        handles = []
+        for path in list(self._segments):
+            f = open(path, 'rb')
+            if path == own_segment or _try_lock(f):
+                handles.append((path, f))
+            else:
+                f.close()
+
+        try:
+            merged = [path for path, _ in handles]
+            # Remapear depois do lock: o dono pode ter gravado antes de encerrar
+            for path in merged:
+                self._map(path)
+            self._merge([self._segments[path] for path in merged if path in self._segments])
+            for path in merged:
+                path.unlink(missing_ok=True)
+        finally:
+            for _, f in handles:
+                f.close()
+
+        self._reset()
+        self._open()
+
+    def retain(self, keys: np.ndarray) -> int:
+        """
+        Coleta de lixo: mantém na matriz apenas as chaves dadas
+
+        Compacta os segmentos inativos e grava a matriz enxuta em uma nova
+        geração, trocada atomicamente (ver docstring do módulo); seguro com
+        leitores abertos. Segmentos de processos ainda ativos não são
+        tocados e entram na matriz na próxima compactação.
+
+        Args:
+            keys: Chaves a manter (uint64, ver text_keys)
+
+        Returns:
+            Número de vetores descartados
+        """
+        keys = np.asarray(keys, dtype=INDEX_DTYPE)
+        self._append_pending()
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(self.store_dir / COMPACT_LOCK_FILE, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            self._compact_locked()
+
+            keep = np.isin(self.keys, keys)
+            removed = int((~keep).sum())
+            if removed:
+                self._write_generation(keep)
+            self._remove_stale_generations()
+
+        self._reset()
+        self._open()
+        return removed
+
+    def _write_generation(self, keep: np.ndarray) -> None:
+        """Grava as linhas mantidas em uma nova geração e a torna a atual"""
+        # Linhas mantidas na ordem original (leitura sequencial), renumeradas
+        old_rows = np.sort(self.rows[keep]).astype(np.intp)
+        renumber = np.zeros(len(self.vectors), dtype=INDEX_DTYPE)
+        renumber[old_rows] = np.arange(len(old_rows), dtype=INDEX_DTYPE)
+
+        generation_dir = self.store_dir / f"{GENERATION_PREFIX}{time.time_ns()}"
+        generation_dir.mkdir()
+        if self.storage == 'int8':
+            _save_npy(generation_dir / SCALES_FILE, self.scales[old_rows])
+        _save_npy(generation_dir / VECTORS_FILE, self.vectors[old_rows])
+        _save_npy(generation_dir / INDEX_FILE, np.stack([self.keys[keep], renumber[self.rows[keep]]]))
+
+        # Troca atômica: a partir daqui quem abre o store vê só a nova geração
+        _write_text(self.store_dir / CURRENT_FILE, generation_dir.name)
+        self._reset()
+        self._open()
+
+    def _remove_stale_generations(self) -> None:
+        """Apaga gerações fora de uso (anteriores ou de coletas interrompidas)"""
+        current = self._current_generation()
+        if current != self.store_dir:
+            for name in (VECTORS_FILE, INDEX_FILE, SCALES_FILE):
+                (self.store_dir / name).unlink(missing_ok=True)
+        for path in self.store_dir.glob(f"{GENERATION_PREFIX}*"):
+            if path.is_dir() and path != current:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _merge(self, segments: List[np.ndarray]) -> None:
+        """Grava matriz + índice com os registros novos dos segmentos"""
+        if not segments:
+            return
+
+        # Registros cuja chave ainda não está na matriz (primeira ocorrência)
+        all_records = np.concatenate([np.asarray(records) for records in segments])
+        _, first = np.unique(all_records['key'], return_index=True)
+        new_records = all_records[np.sort(first)]
+        new_records = new_records[~np.isin(new_records['key'], self.keys)]
+        if not len(new_records):
+            return
+
+        old_rows = 0 if self.vectors is None else len(self.vectors)
+        vectors = new_records['vec'] if self.vectors is None else np.concatenate([self.vectors, new_records['vec']])
+
+        keys = np.concatenate([self.keys, new_records['key']])
+        rows = np.concatenate([self.rows, np.arange(old_rows, old_rows + len(new_records), dtype=INDEX_DTYPE)])
+        order = np.argsort(keys, kind='stable')
+
+        # Escalas e matriz antes do índice: o índice em disco só aponta para linhas existentes
+        if self.storage == 'int8':
+            scales = new_records['scale'] if self.scales is None else np.concatenate([self.scales, new_records['scale']])
+            _save_npy(self.scales_file, scales)
+        _save_npy(self.vectors_file, vectors)
+        _save_npy(self.index_file, np.stack([keys[order], rows[order]]))
+
+    def close(self) -> None:
+        """Persiste pendentes e libera o segmento deste processo"""
+        self._append_pending()
+        self._close_own_segment()
+
+    def clear(self) -> None:
+        """Remove todos os vetores (memória e disco)"""
+        self.pending = {}
+        self._close_own_segment()
+        segments = list(self.segments_dir.glob("seg-*.log")) if self.segments_dir.exists() else []
+        self._reset()
+        (self.store_dir / CURRENT_FILE).unlink(missing_ok=True)
+        for path in self.store_dir.glob(f"{GENERATION_PREFIX}*"):
+            shutil.rmtree(path, ignore_errors=True)
+        for path in [self.store_dir / VECTORS_FILE, self.store_dir / INDEX_FILE, self.store_dir / SCALES_FILE, *segments]:
+            if path.exists():
+                path.unlink()
+        self._use_generation(self.store_dir)
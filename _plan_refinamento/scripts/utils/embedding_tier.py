@@ -0,0 +1,117 @@
+"""
+Camada em memória (LRU) e estatísticas do cache de embeddings
+
+A camada LRU guarda os vetores mais usados já em float32, limitada em
+bytes; ao estourar a capacidade, os menos usados recentemente são
+descartados. Ela fica à frente do store persistente (ver embedding_store),
+evitando buscas e dequantização (modos float16/int8) repetidas.
+
+CacheStats conta acertos (memória e store), falhas, descartes, bytes em
+memória, falhas duplicadas (textos repetidos na mesma chamada, gerados uma
+vez só) e o tempo gasto gerando embeddings; o tempo economizado é estimado
+pelo tempo médio de geração por texto vezes o número de acertos e
+duplicadas.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class CacheStats:
+    """Contadores do cache de embeddings"""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self.duplicates = 0
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.store_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Tempo de geração evitado por acertos e duplicadas (estimativa pela média por texto)"""
+        if not self.encoded:
+            return 0.0
+        return (self.hits + self.duplicates) * self.encode_seconds / self.encoded
+
+    def record_encode(self, count: int, seconds: float) -> None:
+        self.encoded += count
+        self.encode_seconds += seconds
+
+    def summary(self) -> str:
+        """Resumo em uma linha"""
+        return (
+            f"{self.hits:,} acertos ({self.hit_rate:.1%}; "
+            f"{self.memory_hits:,} memória, {self.store_hits:,} disco), {self.misses:,} falhas "
+            f"({self.duplicates:,} duplicadas), "
+            f"{self.evictions:,} descartes, {self.bytes / 2**20:.1f} MB em memória | "
+            f"geração {self.encode_seconds:.1f}s ({self.encoded:,} textos), "
+            f"economia estimada {self.saved_seconds:.1f}s"
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'bytes': self.bytes,
+            'duplicates': self.duplicates,
+            'encoded': self.encoded,
+            'encode_seconds': self.encode_seconds,
+            'saved_seconds': self.saved_seconds,
+        }
+
+
+class LRUTier:
+    """Vetores em memória limitados em bytes, com descarte LRU"""
+
+    def __init__(self, capacity_bytes: int, stats: Optional[CacheStats] = None):
+        self.capacity_bytes = capacity_bytes
+        self.stats = stats if stats is not None else CacheStats()
+        self._entries: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def get(self, key: int) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: int, vector: np.ndarray) -> None:
+        if self.capacity_bytes <= 0 or vector.nbytes > self.capacity_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.stats.bytes -= old.nbytes
+
+        self._entries[key] = vector
+        self.stats.bytes += vector.nbytes
+        while self.stats.bytes > self.capacity_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.stats.bytes -= evicted.nbytes
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats.bytes = 0
@@ -1,103 +1,255 @@
 """
 Utilitários para geração e cache de embeddings
 """
-import pickle
-import hashlib
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from tqdm import tqdm
 
+from .embedding_backends import check_backend, configure_model, load_model, load_tokenizer
+from .embedding_batching import encode_bucketed
+from .embedding_chunks import SPECIAL_TOKENS, TextChunker, check_pooling, pool_chunks
+from .embedding_namespace import EmbeddingNamespace
+from .embedding_pool import CHUNK_SIZE, EncodingPool
+from .embedding_store import text_key, text_keys
+from .embedding_tier import CacheStats, LRUTier
 
-class EmbeddingCache:
-    """Cache de embeddings para evitar recalcular"""
 
-    def __init__(self, cache_dir: Path, model_name: str):
-        self.cache_dir = cache_dir
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.model_name = model_name
+class EmbeddingCache:
+    """
+    Cache de embeddings para evitar recalcular (store memmap, ver embedding_store)
 
-        # Criar hash do modelo para cache
-        model_hash = hashlib.md5(model_name.encode()).hexdigest()[:8]
-        self.cache_file = self.cache_dir / f"embeddings_{model_hash}.pkl"
+    Pode ser compartilhado por vários processos (jobs de similaridade,
+    workers do Streamlit) apontando para o mesmo cache_dir. À frente do
+    store fica uma camada LRU em memória de até memory_mb (0 desativa), e
+    stats acumula acertos, falhas e tempo de geração (ver embedding_tier).
 
-        self.cache = self._load_cache()
+    Os vetores ficam no store do namespace (modelo, revisão, pooling,
+    truncamento, normalização, pré-processamento e modo de armazenamento;
+    ver embedding_namespace).
+    """
 
-    def _load_cache(self) -> Dict:
-        """Carrega cache do disco"""
-        if self.cache_file.exists():
-            with open(self.cache_file, 'rb') as f:
-                return pickle.load(f)
-        return {}
+    def __init__(self, cache_dir: Path, namespace: EmbeddingNamespace, memory_mb: float = 256):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.model_name = namespace.model
 
-    def _save_cache(self) -> None:
-        """Salva cache no disco"""
-        with open(self.cache_file, 'wb') as f:
-            pickle.dump(self.cache, f)
+        self.store = namespace.open_store(self.cache_dir)
+        self.store_dir = self.store.store_dir
+        self.stats = CacheStats()
+        self.memory = LRUTier(int(memory_mb * 1024 * 1024), self.stats)
 
     def get(self, text: str) -> Optional[np.ndarray]:
-        """Busca embedding no cache"""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        return self.cache.get(text_hash)
+        """Busca embedding no cache (float32; em float32, view somente leitura sem cópia)"""
+        key = text_key(text)
+        vector = self.memory.get(key)
+        if vector is not None:
+            self.stats.memory_hits += 1
+            return vector
+
+        vector = self.store.get(key)
+        if vector is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.store_hits += 1
+        self.memory.put(key, vector)
+        return vector
 
     def set(self, text: str, embedding: np.ndarray) -> None:
         """Adiciona embedding ao cache"""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        self.cache[text_hash] = embedding
+        key = text_key(text)
+        self.store.put(key, embedding)
+        # Na memória, o vetor como será lido do store (dequantizado)
+        self.memory.put(key, self.store.get(key))
+
+    def keys_for(self, texts: List[str]) -> np.ndarray:
+        """Chaves dos textos (um hash por texto), para get_many/put_many"""
+        return text_keys(texts)
+
+    def get_many(self, keys: np.ndarray, dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca em lote: camada LRU primeiro, store para as demais chaves
+
+        Os acertos do store são promovidos para a camada em memória.
+
+        Returns:
+            (embeddings, found): matriz float32 (n, dim) com as linhas
+            encontradas preenchidas e máscara das encontradas
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        in_memory = np.zeros(len(keys), dtype=bool)
+        memory_vectors = {}
+        if len(self.memory):
+            for i, key in enumerate(keys.tolist()):
+                vector = self.memory.get(key)
+                if vector is not None:
+                    memory_vectors[i] = vector
+            in_memory[list(memory_vectors)] = True
+
+        rest = np.flatnonzero(~in_memory)
+        store_vectors, store_found = self.store.get_many(keys[rest], dim)
+        dim = store_vectors.shape[1]
+        if not dim and memory_vectors:
+            dim = len(next(iter(memory_vectors.values())))
+
+        embeddings = np.zeros((len(keys), dim), dtype=np.float32)
+        found = in_memory.copy()
+        for i, vector in memory_vectors.items():
+            embeddings[i] = vector
+        if store_vectors.shape[1]:
+            embeddings[rest] = store_vectors
+            found[rest] = store_found
+
+        # Cópias: a camada não pode segurar (nem ver alterada) a matriz devolvida
+        for i in rest[store_found].tolist():
+            self.memory.put(int(keys[i]), embeddings[i].copy())
+
+        store_hits = int(store_found.sum())
+        self.stats.memory_hits += len(memory_vectors)
+        self.stats.store_hits += store_hits
+        self.stats.misses += len(rest) - store_hits
+        return embeddings, found
+
+    def put_many(self, keys: np.ndarray, embeddings: np.ndarray) -> None:
+        """Adiciona embeddings em lote (no store e na camada em memória)"""
+        self.store.put_many(keys, embeddings)
+        if self.memory.capacity_bytes > 0:
+            # Na memória, os vetores como serão lidos do store (dequantizados)
+            stored, _ = self.store.get_many(keys, embeddings.shape[1])
+            for key, vector in zip(np.asarray(keys, dtype=np.uint64).tolist(), stored):
+                self.memory.put(key, vector.copy())
 
     def save(self) -> None:
         """Persiste cache no disco"""
-        self._save_cache()
+        self.store.flush()
+
+    def close(self) -> None:
+        """Persiste pendentes e libera o segmento deste processo para compactação"""
+        self.store.close()
 
     def clear(self) -> None:
         """Limpa cache"""
-        self.cache = {}
-        if self.cache_file.exists():
-            self.cache_file.unlink()
+        self.memory.clear()
+        self.store.clear()
 
 
 class EmbeddingGenerator:
-    """Gerador de embeddings com cache"""
+    """
+    Gerador de embeddings com cache
 
-    def __init__(self, model_name: str, cache_dir: Path, device: str = "cpu"):
-        import torch
+    revision, max_seq_length (truncamento), pooling e normalize configuram o
+    modelo e, junto com storage, definem o namespace do cache: mudar
+    qualquer um deles nunca reaproveita vetores gerados com outra
+    configuração. None mantém o padrão do modelo.
+
+    Os textos não cacheados são gerados em batches por comprimento sob um
+    orçamento de tokens (token_budget; 0 = batch_size × max_seq_length, o
+    mesmo pico de memória de batches fixos), ver embedding_batching.
+
+    backend escolhe a inferência (torch, onnx ou onnx-int8; ver
+    embedding_backends); os backends ONNX exportam o modelo uma vez para
+    models_dir.
+
+    Com workers > 1 (e device cpu), chamadas com muitos textos não
+    cacheados são divididas entre processos com cópias do modelo, cada um
+    com threads intra-op (0 = núcleos / workers); ver embedding_pool. O pool
+    é criado no primeiro uso e encerrado por close().
+
+    O modelo (e torch) só é carregado na primeira falha de cache: execuções
+    com todos os textos em cache nunca importam torch.
 
+    encode_long gera embeddings de documentos inteiros: trechos de até
+    chunk_tokens tokens com chunk_overlap tokens de sobreposição, cada trecho
+    cacheado como um texto comum (ver embedding_chunks).
+    """
+
+    def __init__(self, model_name: str, cache_dir: Path, device: str = "cpu", storage: str = "float32",
+                 memory_mb: float = 256, revision: Optional[str] = None,
+                 max_seq_length: Optional[int] = None, pooling: Optional[str] = None,
+                 normalize: bool = False, token_budget: int = 0, backend: str = "torch",
+                 models_dir: Optional[Path] = None, workers: int = 0, threads: int = 0,
+                 chunk_tokens: int = 126, chunk_overlap: int = 32):
         self.model_name = model_name
-        self.cache = EmbeddingCache(cache_dir, model_name)
+        self.token_budget = token_budget
+        self.models_dir = models_dir
+        self.workers = workers
+        self.threads = threads
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.pool: Optional[EncodingPool] = None
+        self._chunker: Optional[TextChunker] = None
+        self.namespace = EmbeddingNamespace(
+            model_name, revision=revision, max_seq_length=max_seq_length,
+            pooling=pooling, normalize=normalize, storage=storage, backend=check_backend(backend)
+        )
+        self.cache = EmbeddingCache(cache_dir, self.namespace, memory_mb)
+
+        # Dispositivo e modelo só na primeira falha de cache (ver model)
+        self.requested_device = device
+        self._device: Optional[str] = None
+        self._model = None
+
+    @property
+    def device(self) -> str:
+        """Dispositivo efetivo (resolver 'auto' importa torch)"""
+        if self._device is None:
+            self._device = self._resolve_device(self.requested_device)
+        return self._device
+
+    @staticmethod
+    def _resolve_device(device: str) -> str:
+        import torch
 
         # Auto-detect and configure device
         if device == 'auto':
             if torch.cuda.is_available():
-                self.device = 'cuda'
                 print("✓ Auto-detectado CUDA GPU")
-            elif torch.backends.mps.is_available() and torch.backends.mps.is_built():
-                self.device = 'mps'
+                return 'cuda'
+            if torch.backends.mps.is_available() and torch.backends.mps.is_built():
                 print("✓ Auto-detectado Apple Metal (MPS)")
-            else:
-                self.device = 'cpu'
-                print("⚠ GPU não detectada, usando CPU")
-        else:
-            # Check device availability for explicit selections
-            if device == 'cuda' and not torch.cuda.is_available():
-                print("⚠ CUDA não disponível, usando CPU")
-                self.device = 'cpu'
-            elif device == 'mps':
-                if not torch.backends.mps.is_available():
-                    print("⚠ MPS não disponível (requer macOS 12.3+ e Apple Silicon)")
-                    self.device = 'cpu'
-                elif not torch.backends.mps.is_built():
-                    print("⚠ MPS não compilado nesta instalação PyTorch, usando CPU")
-                    self.device = 'cpu'
-                else:
-                    print("✓ Usando Apple Metal Performance Shaders (MPS)")
-                    self.device = 'mps'
-            else:
-                self.device = device
-
-        print(f"Carregando modelo de embeddings: {model_name}")
-        self.model = SentenceTransformer(model_name, device=self.device)
-        print(f"✓ Modelo carregado (device: {self.device})")
+                return 'mps'
+            print("⚠ GPU não detectada, usando CPU")
+            return 'cpu'
+
+        # Check device availability for explicit selections
+        if device == 'cuda' and not torch.cuda.is_available():
+            print("⚠ CUDA não disponível, usando CPU")
+            return 'cpu'
+        if device == 'mps':
+            if not torch.backends.mps.is_available():
+                print("⚠ MPS não disponível (requer macOS 12.3+ e Apple Silicon)")
+                return 'cpu'
+            if not torch.backends.mps.is_built():
+                print("⚠ MPS não compilado nesta instalação PyTorch, usando CPU")
+                return 'cpu'
+            print("✓ Usando Apple Metal Performance Shaders (MPS)")
+            return 'mps'
+        return device
+
+    @property
+    def model(self):
+        """SentenceTransformer, carregado no primeiro acesso"""
+        if self._model is None:
+            backend = self.namespace.backend
+            print(f"Carregando modelo de embeddings: {self.model_name} (backend: {backend})")
+            self._model = load_model(self.model_name, backend, device=self.device,
+                                     revision=self.namespace.revision, models_dir=self.models_dir)
+            configure_model(self._model, self.namespace.max_seq_length, self.namespace.pooling)
+            print(f"✓ Modelo carregado (device: {self.device})")
+        return self._model
+
+    @property
+    def model_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def dim(self) -> int:
+        """Dimensão dos vetores (do cache, se houver vetores; senão carrega o modelo)"""
+        if self._model is None and self.cache.store.dim:
+            return self.cache.store.dim
+        return self.model.get_sentence_embedding_dimension()
 
     def encode(self, texts: List[str], batch_size: int = 32,
                show_progress: bool = True) -> np.ndarray:
@@ -106,50 +258,129 @@ class EmbeddingGenerator:
 
         Args:
             texts: Lista de textos
-            batch_size: Tamanho do batch para processamento
+            batch_size: Tamanho do batch de textos mais longos (define o
+                orçamento de tokens se token_budget não foi configurado)
             show_progress: Mostrar barra de progresso
 
         Returns:
             Array numpy com embeddings
         """
-        embeddings = []
-        texts_to_encode = []
-        indices_to_encode = []
-
-        # Verificar cache
-        for i, text in enumerate(texts):
-            cached = self.cache.get(text)
-            if cached is not None:
-                embeddings.append(cached)
+        # Verificar cache em lote: um hash por texto, acertos já na matriz de saída
+        keys = self.cache.keys_for(texts)
+        embeddings, found = self.cache.get_many(keys, self.cache.store.dim)
+        missing = np.flatnonzero(~found)
+
+        # Gerar embeddings para textos não cacheados, cada texto distinto uma vez
+        if len(missing):
+            unique_keys, first, inverse = np.unique(keys[missing], return_index=True, return_inverse=True)
+            self.cache.stats.duplicates += len(missing) - len(unique_keys)
+            texts_to_encode = [texts[i] for i in missing[first]]
+            start = time.perf_counter()
+            if self._use_pool(len(texts_to_encode)):
+                new_embeddings = self._get_pool().encode(texts_to_encode, show_progress, batch_size)
             else:
-                texts_to_encode.append(text)
-                indices_to_encode.append(i)
-                embeddings.append(None)  # Placeholder
-
-        # Gerar embeddings para textos não cacheados
-        if texts_to_encode:
-            desc = "Gerando embeddings" if show_progress else None
-            new_embeddings = self.model.encode(
-                texts_to_encode,
-                batch_size=batch_size,
-                show_progress_bar=show_progress,
-                convert_to_numpy=True
-            )
+                token_budget = self.token_budget or batch_size * self.model.max_seq_length
+                new_embeddings = encode_bucketed(
+                    self.model, texts_to_encode, token_budget,
+                    normalize=self.namespace.normalize, show_progress=show_progress
+                )
+            self.cache.stats.record_encode(len(texts_to_encode), time.perf_counter() - start)
+
+            # Cache vazio: a dimensão só é conhecida depois de gerar
+            if embeddings.shape[1] != new_embeddings.shape[1]:
+                embeddings = np.zeros((len(texts), new_embeddings.shape[1]), dtype=np.float32)
 
-            # Adicionar ao cache e à lista
-            for idx, text, emb in zip(indices_to_encode, texts_to_encode, new_embeddings):
-                self.cache.set(text, emb)
-                embeddings[idx] = emb
+            # Adicionar ao cache e à matriz de saída (cópias repetidas recebem o mesmo vetor)
+            embeddings[missing] = new_embeddings[inverse]
+            self.cache.put_many(unique_keys, new_embeddings)
 
             # Salvar cache
             self.cache.save()
 
-        return np.array(embeddings)
+        return embeddings
+
+    @property
+    def chunker(self) -> TextChunker:
+        """Divisor de trechos (só o tokenizer, se o modelo ainda não foi carregado)"""
+        if self._chunker is None:
+            if self._model is not None:
+                tokenizer = self._model.tokenizer
+            else:
+                tokenizer = load_tokenizer(self.model_name, self.namespace.revision)
+            self._chunker = TextChunker(tokenizer, self.chunk_tokens, self.chunk_overlap)
+        return self._chunker
+
+    def encode_long(self, texts: List[str], pooling: str = "mean", first_k: int = 3,
+                    batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
+        """
+        Gera embeddings de documentos longos (conteúdo completo, sem truncar)
+
+        Cada documento é dividido em trechos com sobreposição; os trechos de
+        todos os documentos passam juntos por encode (cache, deduplicação e
+        batches por comprimento), e os vetores de cada documento são
+        combinados por pooling. Um documento editado só gera os trechos novos.
+
+        Args:
+            texts: Documentos
+            pooling: mean (ponderada por tokens), max ou first-k (ver pool_chunks)
+            first_k: Trechos considerados por first-k
+            batch_size: Ver encode
+            show_progress: Mostrar barra de progresso
+
+        Returns:
+            Array numpy (len(texts), dim) com um vetor por documento
+        """
+        check_pooling(pooling)
+        if not texts:
+            return np.empty((0, self.cache.store.dim or 0), dtype=np.float32)
+
+        chunks = self.chunker.split(texts)
+        vectors = self.encode([chunk.text for doc in chunks for chunk in doc], batch_size, show_progress)
+        if self.model_loaded and self.chunk_tokens + SPECIAL_TOKENS > self.model.max_seq_length:
+            print(f"⚠ Trechos de {self.chunk_tokens} tokens truncados pelo modelo "
+                  f"(max_seq_length {self.model.max_seq_length})")
+
+        embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        start = 0
+        for i, doc in enumerate(chunks):
+            tokens = np.array([chunk.tokens for chunk in doc], dtype=np.float32)
+            embeddings[i] = pool_chunks(vectors[start:start + len(doc)], tokens, pooling, first_k)
+            start += len(doc)
+
+        if self.namespace.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+    def _use_pool(self, n_texts: int) -> bool:
+        # Abaixo de duas fatias, subir o pool custa mais do que gerar aqui
+        return self.workers > 1 and self.device == 'cpu' and n_texts >= 2 * CHUNK_SIZE
+
+    def _get_pool(self) -> EncodingPool:
+        if self.pool is None:
+            ns = self.namespace
+            print(f"Iniciando pool de {self.workers} processos de embeddings")
+            self.pool = EncodingPool(
+                self.model_name, self.workers, threads=self.threads, backend=ns.backend,
+                revision=ns.revision, max_seq_length=ns.max_seq_length, pooling=ns.pooling,
+                normalize=ns.normalize, token_budget=self.token_budget, models_dir=self.models_dir
+            )
+        return self.pool
+
+    def close(self) -> None:
+        """Encerra o pool de processos (se iniciado) e libera o cache"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        self.cache.close()
 
     def encode_single(self, text: str) -> np.ndarray:
         """Gera embedding para um único texto"""
         return self.encode([text], show_progress=False)[0]
 
+    def summary(self) -> str:
+        """Resumo em uma linha do uso do cache (acertos, falhas, tempo de geração)"""
+        return self.cache.stats.summary()
+
 
 def cosine_similarity(emb1: np.ndarray, emb2: np.ndarray) -> float:
     """Calcula similaridade cosine entre dois embeddings"""
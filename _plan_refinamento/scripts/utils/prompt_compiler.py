@@ -0,0 +1,199 @@
+"""
+Compilador de prompts da árvore temática para classificação via LLM
+
+Renderiza a árvore em variantes compactas de prompt, do mais leve ao mais
+completo:
+
+- labels:        códigos e labels (L1 → L3)
+- labels_short:  labels + descrição curta (primeira frase, limitada em palavras)
+- full:          labels + descrições completas (o que o classificador envia hoje)
+- l1:<código>:   um único L1 com sua subárvore (labels + descrição curta),
+                 para classificação em duas etapas (L1 primeiro, depois o ramo)
+
+Tokens são contados com um tokenizador local (tiktoken, se instalado e com a
+codificação disponível offline); na falta dele, usa-se uma estimativa por
+tamanho de palavra. As renderizações ficam em cache em .tree_cache/, indexadas
+pelo hash da árvore (ver tree_hashes), e só são refeitas quando a árvore muda.
+"""
+import json
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .tree_hashes import TreeHashes
+from .tree_snapshot import TreeSnapshot, artifact_path, atomic_write
+
+# Versão do formato das renderizações (invalida o cache ao mudar)
+RENDER_VERSION = 1
+
+BASE_VARIANTS = ('labels', 'labels_short', 'full')
+BASELINE_VARIANT = 'full'
+
+# Descrição curta: primeira frase, no máximo SHORT_DESCRIPTION_WORDS palavras
+SHORT_DESCRIPTION_WORDS = 12
+
+INDENT = "  "
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s')
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+def short_description(description: Optional[str], max_words: int = SHORT_DESCRIPTION_WORDS) -> str:
+    """Primeira frase da descrição, truncada em max_words palavras"""
+    if not description:
+        return ""
+    first = _SENTENCE_END.split(description.strip(), maxsplit=1)[0]
+    words = first.split()
+    if len(words) > max_words:
+        return " ".join(words[:max_words]).rstrip(',;:') + "…"
+    return first
+
+
+class TokenCounter:
+    """
+    Contador de tokens local
+
+    Usa tiktoken com a codificação pedida quando possível; caso contrário, uma
+    estimativa (~4 caracteres por token em cada palavra, 1 por pontuação).
+    """
+
+    def __init__(self, encoding: str = "o200k_base"):
+        self._encoder = None
+        self.method = "estimativa por tamanho de palavra"
+        try:
+            import tiktoken
+            self._encoder = tiktoken.get_encoding(encoding)
+            self.method = f"tiktoken/{encoding}"
+        except Exception:
+            # Pacote ausente ou codificação indisponível offline
+            pass
+
+    @property
+    def estimated(self) -> bool:
+        """Se as contagens são estimativas (tiktoken indisponível)"""
+        return self._encoder is None
+
+    def count(self, text: str) -> int:
+        if self._encoder is not None:
+            return len(self._encoder.encode(text))
+        return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECES.findall(text))
+
+
+def _render_nodes(nodes: List[Dict], mode: str, depth: int, lines: List[str]) -> None:
+    for node in nodes:
+        line = f"{INDENT * depth}{node.get('code', '')} {node.get('label', '')}"
+        if mode == 'labels_short':
+            description = short_description(node.get('description'))
+            if description:
+                line += f": {description}"
+        elif mode == 'full':
+            description = (node.get('description') or '').strip()
+            if description:
+                line += f": {' '.join(description.split())}"
+        lines.append(line)
+        _render_nodes(node.get('children', []), mode, depth + 1, lines)
+
+
+def render_variant(tree: Dict, variant: str) -> str:
+    """Renderiza a árvore (ou um L1, em 'l1:<código>') na variante pedida"""
+    themes = tree.get('themes', [])
+
+    if variant.startswith('l1:'):
+        code = variant.split(':', 1)[1]
+        themes = [node for node in themes if node.get('code') == code]
+        if not themes:
+            raise KeyError(f"L1 inexistente: {code}")
+        mode = 'labels_short'
+    elif variant in BASE_VARIANTS:
+        mode = variant
+    else:
+        raise ValueError(f"Variante desconhecida: {variant}")
+
+    lines: List[str] = []
+    _render_nodes(themes, mode, 0, lines)
+    return "\n".join(lines) + "\n"
+
+
+class PromptCompiler:
+    """Renderizações da árvore em cache, indexadas pelo hash da árvore"""
+
+    def __init__(self, yaml_file: Path, encoding: str = "o200k_base", cache_dir: Optional[Path] = None):
+        self.yaml_file = Path(yaml_file)
+        self.cache_file = artifact_path(self.yaml_file, cache_dir, ".prompts.json")
+        self.counter = TokenCounter(encoding)
+        self.cache_dir = cache_dir
+
+        self.tree_hash = TreeHashes.from_file(self.yaml_file, cache_dir).root
+        self._tree: Optional[Dict] = None
+        self._renders: Dict[str, Dict] = self._read_cache()
+        self._dirty = False
+
+    def _read_cache(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # Cache de outra árvore, outro formato ou outro tokenizador: descartar
+        if data.get('key') != self._cache_key():
+            return {}
+        return data.get('renders', {})
+
+    def _cache_key(self) -> Dict:
+        return {
+            'version': RENDER_VERSION,
+            'tree_hash': self.tree_hash,
+            'tokenizer': self.counter.method,
+            'short_description_words': SHORT_DESCRIPTION_WORDS,
+        }
+
+    @property
+    def tree(self) -> Dict:
+        if self._tree is None:
+            self._tree = TreeSnapshot(self.yaml_file, self.cache_dir).load()
+        return self._tree
+
+    def variants(self) -> List[str]:
+        """Todas as variantes: as três globais e uma por L1"""
+        return list(BASE_VARIANTS) + [f"l1:{node.get('code', '')}" for node in self.tree.get('themes', [])]
+
+    def render(self, variant: str) -> Dict:
+        """
+        Renderização de uma variante (do cache, se a árvore não mudou)
+
+        Returns:
+            Dict com 'text', 'chars' e 'tokens'
+        """
+        cached = self._renders.get(variant)
+        if cached is not None:
+            return cached
+
+        text = render_variant(self.tree, variant)
+        entry = {'text': text, 'chars': len(text), 'tokens': self.counter.count(text)}
+        self._renders[variant] = entry
+        self._dirty = True
+        return entry
+
+    def compile(self, max_tokens: int) -> Dict:
+        """
+        Variante global mais rica que cabe no orçamento de tokens
+
+        Returns:
+            Dict da renderização com 'variant'; a mais leve (labels) se nenhuma couber
+        """
+        for variant in reversed(BASE_VARIANTS):
+            entry = self.render(variant)
+            if entry['tokens'] <= max_tokens:
+                return {'variant': variant, **entry}
+        return {'variant': BASE_VARIANTS[0], **self.render(BASE_VARIANTS[0])}
+
+    def save(self) -> None:
+        """Grava as renderizações novas no cache"""
+        if not self._dirty:
+            return
+        data = {'key': self._cache_key(), 'renders': self._renders}
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        if atomic_write(self.cache_file, lambda f: f.write(payload)):
+            self._dirty = False
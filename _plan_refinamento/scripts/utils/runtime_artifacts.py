@@ -0,0 +1,185 @@
+"""
+Artefatos de runtime da árvore temática (scraper e portal)
+
+Compila a árvore em um documento pronto para consumo: árvore minificada mais
+tabelas de consulta pré-calculadas (código → label, código → pai, códigos por
+nível), de modo que os consumidores não precisem de parser YAML nem de
+indexação em tempo de carga.
+
+Formatos: JSON minificado (sempre) e MessagePack (se o pacote `msgpack`
+estiver instalado). Os arquivos têm o hash do conteúdo no nome e são
+descritos por um manifest.json com versão da árvore, hashes de integridade
+(sha256) e tamanhos.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .tree_hashes import TreeHashes
+from .tree_io import load_tree
+from .tree_snapshot import atomic_write, content_hash
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+RUNTIME_SCHEMA = 1
+MANIFEST_NAME = "manifest.json"
+ARTIFACT_STEM = "themes_tree"
+
+# Campos de cada nó copiados para a árvore de runtime
+RUNTIME_FIELDS = ('code', 'label', 'description', 'keywords', 'examples', 'includes', 'excludes')
+
+VERSION_PATTERN = re.compile(r'^#\s*Vers[ãa]o:\s*(\S+)', re.MULTILINE)
+
+
+def tree_version(themes_file: Path) -> Optional[str]:
+    """Versão declarada no cabeçalho do YAML ("# Versão: 3.1"), se houver"""
+    with open(themes_file, 'r', encoding='utf-8') as f:
+        header = f.read(2048)
+    match = VERSION_PATTERN.search(header)
+    return match.group(1) if match else None
+
+
+def available_formats() -> List[str]:
+    """Formatos que podem ser gerados neste ambiente"""
+    return ['json', 'msgpack'] if msgpack is not None else ['json']
+
+
+def compile_runtime(tree: Dict, version: Optional[str] = None) -> Dict:
+    """
+    Monta o documento de runtime: árvore minificada + tabelas de consulta
+
+    Returns:
+        Dict com 'schema', 'version', 'tree_hash', 'themes', 'labels',
+        'parents' e 'levels'
+    """
+    labels: Dict[str, str] = {}
+    parents: Dict[str, Optional[str]] = {}
+    levels: Dict[str, List[str]] = {}
+
+    def compile_nodes(nodes: List[Dict], parent_code: Optional[str], level: int) -> List[Dict]:
+        compiled = []
+        for node in nodes:
+            code = node.get('code', '')
+            entry = {field: node[field] for field in RUNTIME_FIELDS if node.get(field)}
+
+            labels.setdefault(code, node.get('label', ''))
+            parents.setdefault(code, parent_code)
+            levels.setdefault(f"L{level}", []).append(code)
+
+            children = compile_nodes(node.get('children', []), code, level + 1)
+            if children:
+                entry['children'] = children
+            compiled.append(entry)
+        return compiled
+
+    themes = compile_nodes(tree.get('themes', []), None, 1)
+
+    return {
+        'schema': RUNTIME_SCHEMA,
+        'version': version,
+        'tree_hash': TreeHashes(tree).root,
+        'themes': themes,
+        'labels': labels,
+        'parents': parents,
+        'levels': levels,
+    }
+
+
+def encode_runtime(document: Dict, fmt: str) -> bytes:
+    """Serializa o documento de runtime no formato pedido"""
+    if fmt == 'json':
+        return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError("Formato msgpack requer o pacote msgpack (pip install msgpack)")
+        return msgpack.packb(document, use_bin_type=True)
+    raise ValueError(f"Formato desconhecido: {fmt}")
+
+
+def decode_runtime(data: bytes, fmt: str) -> Dict:
+    """Desserializa um artefato de runtime"""
+    if fmt == 'json':
+        return json.loads(data)
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError("Formato msgpack requer o pacote msgpack (pip install msgpack)")
+        return msgpack.unpackb(data, raw=False)
+    raise ValueError(f"Formato desconhecido: {fmt}")
+
+
+def build_runtime_artifacts(themes_file: Path, output_dir: Path,
+                            formats: Optional[List[str]] = None) -> Dict:
+    """
+    Compila a árvore e grava os artefatos e o manifest
+
+    Args:
+        themes_file: YAML da árvore
+        output_dir: Diretório de saída
+        formats: Formatos a gerar (padrão: todos os disponíveis)
+
+    Returns:
+        Manifest gravado
+    """
+    themes_file = Path(themes_file)
+    output_dir = Path(output_dir)
+    source = themes_file.read_bytes()
+
+    document = compile_runtime(load_tree(themes_file), tree_version(themes_file))
+
+    manifest = {
+        'schema': RUNTIME_SCHEMA,
+        'version': document['version'],
+        'tree_hash': document['tree_hash'],
+        'source': themes_file.name,
+        'source_hash': content_hash(source),
+        'nodes': len(document['labels']),
+        'artifacts': {},
+    }
+
+    for fmt in formats or available_formats():
+        payload = encode_runtime(document, fmt)
+        sha256 = hashlib.sha256(payload).hexdigest()
+        filename = f"{ARTIFACT_STEM}.{sha256[:12]}.{fmt}"
+
+        if not atomic_write(output_dir / filename, lambda f: f.write(payload)):
+            raise OSError(f"Não foi possível gravar {output_dir / filename}")
+
+        manifest['artifacts'][fmt] = {'file': filename, 'sha256': sha256, 'size': len(payload)}
+
+    manifest_data = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+    if not atomic_write(output_dir / MANIFEST_NAME, lambda f: f.write(manifest_data)):
+        raise OSError(f"Não foi possível gravar {output_dir / MANIFEST_NAME}")
+
+    return manifest
+
+
+def load_runtime(output_dir: Path, fmt: str = 'json', verify: bool = True) -> Dict:
+    """
+    Carrega um artefato de runtime a partir do manifest
+
+    Args:
+        output_dir: Diretório com manifest.json
+        fmt: 'json' ou 'msgpack'
+        verify: Conferir o sha256 do artefato contra o manifest
+
+    Raises:
+        ValueError: Se o artefato não corresponder ao manifest
+    """
+    output_dir = Path(output_dir)
+    with open(output_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    entry = manifest['artifacts'].get(fmt)
+    if entry is None:
+        raise ValueError(f"Formato {fmt} não consta no manifest de {output_dir}")
+
+    data = (output_dir / entry['file']).read_bytes()
+    if verify and hashlib.sha256(data).hexdigest() != entry['sha256']:
+        raise ValueError(f"Integridade violada: {entry['file']} não corresponde ao manifest")
+
+    return decode_runtime(data, fmt)
@@ -0,0 +1,216 @@
+"""
+Representação colunar da árvore temática
+
+A árvore é achatada uma única vez em arrays paralelos, com os nós ordenados
+por nível (todos os L1, depois todos os L2 agrupados por pai, depois todos
+os L3 agrupados por pai). Nessa ordem, os filhos de um nó, os irmãos de um nó
+e todos os descendentes de um nó em um dado nível ocupam faixas contíguas,
+de modo que operações em lote viram fatias em vez de percursos na árvore.
+
+Labels, descrições e keywords ficam em tabelas de strings internadas; os nós
+guardam apenas índices para essas tabelas.
+"""
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .yaml_utils import load_yaml
+
+
+class _StringTable:
+    """Tabela de strings internadas (cada valor distinto armazenado uma vez)"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(sys.intern(value))
+            self._ids[value] = value_id
+        return value_id
+
+
+class ThemeNode:
+    """Visão leve (sem cópia) de um nó da representação colunar"""
+
+    __slots__ = ('_cols', 'row')
+
+    def __init__(self, cols: "ThemeColumns", row: int):
+        self._cols = cols
+        self.row = row
+
+    @property
+    def code(self) -> str:
+        return self._cols.codes[self.row]
+
+    @property
+    def level(self) -> str:
+        return f"L{self._cols.levels[self.row]}"
+
+    @property
+    def label(self) -> str:
+        return self._cols.label_table.values[self._cols.label_ids[self.row]]
+
+    @property
+    def description(self) -> str:
+        return self._cols.description_table.values[self._cols.description_ids[self.row]]
+
+    @property
+    def keywords(self) -> List[str]:
+        return self._cols.keyword_list(self.row)
+
+    @property
+    def parent(self) -> Optional["ThemeNode"]:
+        parent_row = self._cols.parents[self.row]
+        return ThemeNode(self._cols, parent_row) if parent_row >= 0 else None
+
+    @property
+    def children(self) -> List["ThemeNode"]:
+        return [ThemeNode(self._cols, row) for row in self._cols.children_range(self.row)]
+
+    def get(self, field: str, default=None):
+        """Acesso por nome de campo, como nos nós dict da árvore"""
+        if field in ('code', 'label', 'description', 'keywords'):
+            return getattr(self, field)
+        return default
+
+    def __repr__(self) -> str:
+        return f"ThemeNode({self.code!r}, {self.label!r})"
+
+
+class ThemeColumns:
+    """Árvore temática em arrays paralelos, ordenada por nível"""
+
+    def __init__(self, tree: Dict):
+        self.codes: List[str] = []
+        self.levels = array('b')          # 1, 2, 3
+        self.parents = array('i')         # linha do pai (-1 para L1)
+        self.child_offsets = array('i')   # filhos de i: [child_offsets[i], child_offsets[i + 1])
+        self.label_ids = array('i')
+        self.description_ids = array('i')
+        self.keyword_offsets = array('i')  # keywords de i: keyword_ids[keyword_offsets[i]:keyword_offsets[i + 1]]
+        self.keyword_ids = array('i')
+
+        self.label_table = _StringTable()
+        self.description_table = _StringTable()
+        self.keyword_table = _StringTable()
+
+        self.rows: Dict[str, int] = {}
+        self.level_offsets: Dict[int, range] = {}
+
+        self._build(tree.get('themes', []))
+
+    @classmethod
+    def from_file(cls, themes_file: Path) -> "ThemeColumns":
+        """Carrega árvore do YAML e constrói a representação colunar"""
+        return cls(load_yaml(themes_file))
+
+    def _build(self, roots: List[Dict]) -> None:
+        """Percorre a árvore em largura, um nível por vez"""
+        current = [(node, -1) for node in roots]
+        level = 1
+
+        self.keyword_offsets.append(0)
+        while current:
+            start = len(self.codes)
+            next_level = []
+
+            for node, parent_row in current:
+                row = len(self.codes)
+                code = node.get('code', '')
+
+                self.codes.append(code)
+                self.rows.setdefault(code, row)
+                self.levels.append(level)
+                self.parents.append(parent_row)
+                self.label_ids.append(self.label_table.add(node.get('label', '')))
+                self.description_ids.append(self.description_table.add(node.get('description', '') or ''))
+
+                for keyword in node.get('keywords', []) or []:
+                    self.keyword_ids.append(self.keyword_table.add(keyword))
+                self.keyword_offsets.append(len(self.keyword_ids))
+
+                # Filhos entram no próximo nível, preservando a ordem dos pais
+                self.child_offsets.append(start + len(current) + len(next_level))
+                next_level.extend((child, row) for child in node.get('children', []))
+
+            self.level_offsets[level] = range(start, len(self.codes))
+            current = next_level
+            level += 1
+
+        # Sentinela: fim dos filhos da última linha
+        self.child_offsets.append(len(self.codes))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.rows
+
+    def __getitem__(self, key: Union[str, int]) -> ThemeNode:
+        row = self.rows[key] if isinstance(key, str) else key
+        return ThemeNode(self, row)
+
+    def row_of(self, code: str) -> int:
+        """Linha do código (KeyError se não existir)"""
+        return self.rows[code]
+
+    def level_range(self, level: Union[str, int]) -> range:
+        """Linhas de um nível ("L2" ou 2)"""
+        if isinstance(level, str):
+            level = int(level.lstrip('L'))
+        return self.level_offsets.get(level, range(0))
+
+    def children_range(self, row: int) -> range:
+        """Linhas dos filhos diretos"""
+        return range(self.child_offsets[row], self.child_offsets[row + 1])
+
+    def sibling_range(self, row: int) -> range:
+        """Linhas dos irmãos (incluindo o próprio nó)"""
+        parent_row = self.parents[row]
+        if parent_row < 0:
+            return self.level_range(1)
+        return self.children_range(parent_row)
+
+    def descendants_range(self, row: int, level: Union[str, int]) -> range:
+        """
+        Linhas dos descendentes de um nó em um nível (ex: todos os L3 sob "05")
+
+        Como os filhos de uma faixa contígua também formam uma faixa contígua,
+        basta descer os offsets um nível por vez.
+        """
+        if isinstance(level, str):
+            level = int(level.lstrip('L'))
+
+        start, end = row, row + 1
+        for _ in range(level - self.levels[row]):
+            start, end = self.child_offsets[start], self.child_offsets[end]
+        return range(start, end) if level >= self.levels[row] else range(0)
+
+    def codes_in(self, rows: range) -> List[str]:
+        """Códigos de uma faixa de linhas"""
+        return self.codes[rows.start:rows.stop]
+
+    def labels_in(self, rows: range) -> List[str]:
+        """Labels de uma faixa de linhas"""
+        table = self.label_table.values
+        return [table[i] for i in self.label_ids[rows.start:rows.stop]]
+
+    def descriptions_in(self, rows: range) -> List[str]:
+        """Descrições de uma faixa de linhas"""
+        table = self.description_table.values
+        return [table[i] for i in self.description_ids[rows.start:rows.stop]]
+
+    def keyword_list(self, row: int) -> List[str]:
+        """Keywords de uma linha"""
+        table = self.keyword_table.values
+        ids = self.keyword_ids[self.keyword_offsets[row]:self.keyword_offsets[row + 1]]
+        return [table[i] for i in ids]
+
+    def keywords_in(self, rows: range) -> List[List[str]]:
+        """Listas de keywords de uma faixa de linhas"""
+        return [self.keyword_list(row) for row in rows]
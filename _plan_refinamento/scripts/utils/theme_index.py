@@ -0,0 +1,126 @@
+"""
+Índice compilado da árvore temática
+
+Constrói, uma única vez, tabelas de consulta sobre a árvore carregada do YAML
+para que buscas por código, pai, filhos, irmãos, ancestrais e nível sejam O(1),
+em vez de percorrer a árvore inteira a cada chamada.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .yaml_utils import get_level, load_yaml
+
+
+class ThemeIndex:
+    """Índice O(1) sobre a árvore temática (código → nó, pai, filhos, irmãos)"""
+
+    def __init__(self, tree: Dict):
+        self.tree = tree
+
+        self._nodes: Dict[str, Dict] = {}
+        self._levels: Dict[str, str] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._siblings: Dict[str, List[Dict]] = {}
+        self._by_level: Dict[str, List[str]] = {"L1": [], "L2": [], "L3": []}
+
+        # Códigos repetidos (mantém-se o primeiro, como get_node_by_code)
+        self.duplicates: List[str] = []
+
+        self._build(tree.get('themes', []), None)
+
+    @classmethod
+    def from_file(cls, themes_file: Path) -> "ThemeIndex":
+        """Carrega árvore do YAML e constrói o índice"""
+        return cls(load_yaml(themes_file))
+
+    def _build(self, nodes: List[Dict], parent_code: Optional[str]) -> None:
+        """Percorre a árvore uma vez preenchendo as tabelas"""
+        for node in nodes:
+            code = node.get('code', '')
+
+            if code in self._nodes:
+                self.duplicates.append(code)
+            else:
+                level = get_level(code)
+                self._nodes[code] = node
+                self._levels[code] = level
+                self._parents[code] = parent_code
+                self._siblings[code] = nodes
+                self._by_level.setdefault(level, []).append(code)
+
+            if 'children' in node:
+                self._build(node['children'], code)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._nodes
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Itera sobre os nós na ordem da árvore (pré-ordem)"""
+        return iter(self._nodes.values())
+
+    def get(self, code: str) -> Optional[Dict]:
+        """Retorna nó pelo código, ou None se não existir"""
+        return self._nodes.get(code)
+
+    def get_node(self, code: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Equivalente O(1) de yaml_utils.get_node_by_code
+
+        Returns:
+            Tuple[level, node]: Nível e nó encontrado, ou (None, None)
+        """
+        node = self._nodes.get(code)
+        if node is None:
+            return None, None
+        return self._levels[code], node
+
+    def level(self, code: str) -> str:
+        """Nível do nó ("L1", "L2", "L3" ou "?")"""
+        level = self._levels.get(code)
+        return level if level is not None else get_level(code)
+
+    def label(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        """Label do nó, ou default se o código não existir"""
+        node = self._nodes.get(code)
+        return node.get('label', default) if node is not None else default
+
+    def parent_code(self, code: str) -> Optional[str]:
+        """Código do pai (None para L1 ou código inexistente)"""
+        return self._parents.get(code)
+
+    def parent(self, code: str) -> Optional[Dict]:
+        """Nó pai (None para L1 ou código inexistente)"""
+        parent_code = self._parents.get(code)
+        return self._nodes.get(parent_code) if parent_code is not None else None
+
+    def children(self, code: str) -> List[Dict]:
+        """Filhos diretos do nó"""
+        node = self._nodes.get(code)
+        return node.get('children', []) if node is not None else []
+
+    def siblings(self, code: str) -> List[Dict]:
+        """
+        Irmãos do nó (incluindo o próprio), como yaml_utils.get_siblings
+        """
+        return self._siblings.get(code, [])
+
+    def ancestors(self, code: str) -> List[Dict]:
+        """Ancestrais do nó, do L1 até o pai direto"""
+        chain = []
+        parent_code = self._parents.get(code)
+        while parent_code is not None:
+            chain.append(self._nodes[parent_code])
+            parent_code = self._parents.get(parent_code)
+        chain.reverse()
+        return chain
+
+    def codes_at_level(self, level: str) -> List[str]:
+        """Códigos de um nível, na ordem da árvore"""
+        return self._by_level.get(level, [])
+
+    def nodes_at_level(self, level: str) -> List[Dict]:
+        """Nós de um nível, na ordem da árvore"""
+        return [self._nodes[code] for code in self._by_level.get(level, [])]
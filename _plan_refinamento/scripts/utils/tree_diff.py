@@ -0,0 +1,276 @@
+"""
+Diff estrutural e semântico entre duas versões da árvore temática
+
+Compara as árvores em paralelo, por código, usando os hashes de subárvore
+(ver tree_hashes): um ramo com o mesmo hash nas duas versões é pulado sem
+ser percorrido. Os nós que mudaram são pareados primeiro pelo hash de
+conteúdo na árvore inteira, e só depois por código, para que códigos
+deslocados apareçam como renumerações. Nos ramos que mudaram, reporta:
+
+- nós adicionados e removidos;
+- renumerações (código mudou, conteúdo idêntico);
+- renomeações (código mudou, label mantido, conteúdo alterado);
+- mudanças de label, descrição, keywords, includes e excludes.
+
+Uso como biblioteca (validação incremental, re-embedding):
+
+    diff = diff_files(old_file, new_file)
+    for code in diff.affected_codes():
+        ...
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .tree_hashes import HASHED_FIELDS, TreeHashes, node_content_hash
+from .tree_snapshot import TreeSnapshot
+
+# Campos de lista: diferenças reportadas como itens adicionados/removidos
+LIST_FIELDS = ('keywords', 'includes', 'excludes')
+
+
+def _iter_subtree(node: Dict) -> Iterator[Dict]:
+    """Nó e todos os seus descendentes, em pré-ordem"""
+    yield node
+    for child in node.get('children', []):
+        yield from _iter_subtree(child)
+
+
+def _summary(node: Dict) -> Dict:
+    return {'code': node.get('code', ''), 'label': node.get('label', '')}
+
+
+def compare_fields(old: Dict, new: Dict) -> Dict[str, Dict]:
+    """
+    Diferenças de conteúdo entre dois nós
+
+    Returns:
+        Dict campo → {'old', 'new'} (textos) ou {'added', 'removed'} (listas);
+        vazio se o conteúdo for igual
+    """
+    changes = {}
+    for field in HASHED_FIELDS:
+        old_value = old.get(field) or None
+        new_value = new.get(field) or None
+        if old_value == new_value:
+            continue
+
+        if field in LIST_FIELDS:
+            old_items = old_value or []
+            new_items = new_value or []
+            old_set, new_set = set(old_items), set(new_items)
+            changes[field] = {
+                'added': [item for item in new_items if item not in old_set],
+                'removed': [item for item in old_items if item not in new_set],
+            }
+        else:
+            changes[field] = {'old': old_value, 'new': new_value}
+    return changes
+
+
+class TreeDiff:
+    """Resultado da comparação entre duas versões da árvore"""
+
+    def __init__(self):
+        self.added: List[Dict] = []        # {'code', 'label'}
+        self.removed: List[Dict] = []      # {'code', 'label'}
+        self.renumbered: List[Dict] = []   # {'old_code', 'new_code', 'label'}
+        self.renamed: List[Dict] = []      # {'old_code', 'new_code', 'label', 'changes'}
+        self.modified: List[Dict] = []     # {'code', 'changes'} (mesmo código nas duas versões)
+
+        # Subárvores idênticas puladas pela comparação de hashes
+        self.skipped_subtrees = 0
+        self.skipped_nodes = 0
+
+    @property
+    def relabelled(self) -> List[Dict]:
+        """Nós (mesmo código) cujo label mudou: {'code', 'old', 'new'}"""
+        return [
+            {'code': entry['code'], **entry['changes']['label']}
+            for entry in self.modified if 'label' in entry['changes']
+        ]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.renumbered or self.renamed or self.modified)
+
+    def affected_codes(self) -> Set[str]:
+        """
+        Códigos da nova versão cujo conteúdo ou código mudou
+
+        São os nós que precisam ser revalidados ou ter embeddings recalculados.
+        """
+        codes = {entry['code'] for entry in self.added}
+        codes.update(entry['code'] for entry in self.modified)
+        codes.update(entry['new_code'] for entry in self.renumbered)
+        codes.update(entry['new_code'] for entry in self.renamed)
+        return codes
+
+    def removed_codes(self) -> Set[str]:
+        """Códigos da versão anterior que deixaram de existir"""
+        codes = {entry['code'] for entry in self.removed}
+        codes.update(entry['old_code'] for entry in self.renumbered)
+        codes.update(entry['old_code'] for entry in self.renamed)
+        return codes
+
+    def to_dict(self) -> Dict:
+        return {
+            'added': self.added,
+            'removed': self.removed,
+            'renumbered': self.renumbered,
+            'renamed': self.renamed,
+            'modified': self.modified,
+            'skipped_subtrees': self.skipped_subtrees,
+            'skipped_nodes': self.skipped_nodes,
+        }
+
+
+class _TreeDiffer:
+    """
+    Percorre as duas árvores em paralelo preenchendo um TreeDiff
+
+    O percurso por código só resolve de vez os nós com o mesmo código e o
+    mesmo conteúdo. Pares de mesmo código com conteúdo diferente e nós sem
+    par ficam pendentes e são pareados ao final, primeiro por conteúdo na
+    árvore inteira: depois de remover um L1 e deslocar os seguintes
+    (24 → 23), o 23 novo tem o conteúdo do 24 antigo e é uma renumeração,
+    não uma modificação do 23 antigo.
+    """
+
+    def __init__(self, old_hashes: TreeHashes, new_hashes: TreeHashes):
+        self.old_hashes = old_hashes
+        self.new_hashes = new_hashes
+        self.diff = TreeDiff()
+
+        # Nós ainda sem par resolvido, em ordem de documento
+        self.pending_old: List[Dict] = []
+        self.pending_new: List[Dict] = []
+
+    def run(self, old_tree: Dict, new_tree: Dict) -> TreeDiff:
+        if self.old_hashes.root != self.new_hashes.root:
+            self._walk(old_tree.get('themes', []), new_tree.get('themes', []))
+        else:
+            self.diff.skipped_subtrees = 1
+            self.diff.skipped_nodes = len(self.new_hashes)
+
+        self._pair_pending()
+        return self.diff
+
+    def _walk(self, old_nodes: List[Dict], new_nodes: List[Dict]) -> None:
+        old_by_code = {node.get('code', ''): node for node in old_nodes}
+        new_codes = set()
+
+        for new_node in new_nodes:
+            code = new_node.get('code', '')
+            new_codes.add(code)
+            old_node = old_by_code.get(code)
+
+            if old_node is None:
+                self.pending_new.extend(_iter_subtree(new_node))
+                continue
+
+            # Ramo idêntico: nada a percorrer
+            old_subtree = self.old_hashes.subtree_hash(code)
+            if old_subtree is not None and old_subtree == self.new_hashes.subtree_hash(code):
+                self.diff.skipped_subtrees += 1
+                self.diff.skipped_nodes += sum(1 for _ in _iter_subtree(new_node))
+                continue
+
+            # Conteúdo diferente: o par por código só vale se nenhum outro nó tiver este conteúdo
+            if self.old_hashes.content_hash(code) != self.new_hashes.content_hash(code):
+                self.pending_old.append(old_node)
+                self.pending_new.append(new_node)
+
+            self._walk(old_node.get('children', []), new_node.get('children', []))
+
+        for code, old_node in old_by_code.items():
+            if code not in new_codes:
+                self.pending_old.extend(_iter_subtree(old_node))
+
+    def _pair_pending(self) -> None:
+        """Pareia os nós pendentes: mesmo conteúdo, depois mesmo código ou mesmo label"""
+        old_pending = {id(node): node for node in self.pending_old}
+
+        # Conteúdo idêntico: mesmo código (nó movido) ou renumeração
+        old_by_content: Dict[str, List[Dict]] = {}
+        for node in self.pending_old:
+            old_by_content.setdefault(node_content_hash(node), []).append(node)
+
+        unmatched_new = []
+        for new_node in self.pending_new:
+            code = new_node.get('code', '')
+            candidates = [node for node in old_by_content.get(node_content_hash(new_node), [])
+                          if id(node) in old_pending]
+            if not candidates:
+                unmatched_new.append(new_node)
+                continue
+
+            old_node = next((node for node in candidates if node.get('code', '') == code), candidates[0])
+            del old_pending[id(old_node)]
+            if old_node.get('code', '') != code:
+                self.diff.renumbered.append({
+                    'old_code': old_node.get('code', ''),
+                    'new_code': code,
+                    'label': new_node.get('label', ''),
+                })
+
+        # Conteúdo alterado: mesmo código (modificação) ou mesmo label (renomeação). Um
+        # código reaproveitado por outro nó (label diferente) perde para o label
+        old_by_code: Dict[str, Dict] = {}
+        old_by_label: Dict[str, List[Dict]] = {}
+        for node in old_pending.values():
+            old_by_code.setdefault(node.get('code', ''), node)
+            old_by_label.setdefault(node.get('label', ''), []).append(node)
+
+        for new_node in unmatched_new:
+            code, label = new_node.get('code', ''), new_node.get('label', '')
+            same_code = old_by_code.get(code)
+            if same_code is not None and id(same_code) not in old_pending:
+                same_code = None
+            same_label = next((node for node in old_by_label.get(label, []) if id(node) in old_pending), None)
+
+            if same_code is not None and (same_label is None or same_code.get('label', '') == label):
+                del old_pending[id(same_code)]
+                changes = compare_fields(same_code, new_node)
+                if changes:
+                    self.diff.modified.append({'code': code, 'changes': changes})
+            elif same_label is not None:
+                del old_pending[id(same_label)]
+                self.diff.renamed.append({
+                    'old_code': same_label.get('code', ''),
+                    'new_code': code,
+                    'label': label,
+                    'changes': compare_fields(same_label, new_node),
+                })
+            else:
+                self.diff.added.append(_summary(new_node))
+
+        self.diff.removed.extend(_summary(node) for node in old_pending.values())
+
+
+def diff_trees(
+    old_tree: Dict,
+    new_tree: Dict,
+    old_hashes: Optional[TreeHashes] = None,
+    new_hashes: Optional[TreeHashes] = None,
+) -> TreeDiff:
+    """
+    Compara duas versões da árvore
+
+    Args:
+        old_tree: Versão anterior
+        new_tree: Versão nova
+        old_hashes, new_hashes: Hashes já calculados (ex: TreeHashes.from_file);
+            calculados aqui se omitidos
+    """
+    old_hashes = old_hashes or TreeHashes(old_tree)
+    new_hashes = new_hashes or TreeHashes(new_tree)
+    return _TreeDiffer(old_hashes, new_hashes).run(old_tree, new_tree)
+
+
+def diff_files(old_file: Path, new_file: Path) -> TreeDiff:
+    """Compara dois arquivos YAML da árvore (árvores e hashes vêm do cache, se válido)"""
+    return diff_trees(
+        TreeSnapshot(old_file).load(),
+        TreeSnapshot(new_file).load(),
+        TreeHashes.from_file(old_file),
+        TreeHashes.from_file(new_file),
+    )
@@ -0,0 +1,164 @@
+"""
+Hashes de conteúdo por nó e por subárvore (estilo Merkle)
+
+Cada nó recebe um hash do seu conteúdo (label, description, keywords,
+includes, excludes) e um hash de subárvore que combina o código do nó, o
+hash de conteúdo e os hashes de subárvore dos filhos, na ordem da árvore.
+Assim, uma subárvore (L2 ou L1 inteiro) só muda de hash se algo abaixo dela
+mudou, e etapas posteriores podem pular ramos idênticos comparando um único
+valor.
+
+O hash de conteúdo não inclui o código: um nó apenas renumerado mantém o
+mesmo hash de conteúdo (útil para detectar renumerações), mas muda o hash de
+subárvore de todos os seus ancestrais.
+
+Os hashes são guardados em .tree_cache/, ao lado do snapshot da árvore, e
+invalidados pelo mesmo critério (tamanho, mtime e hash do YAML).
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .tree_snapshot import (
+    SNAPSHOT_VERSION, TreeSnapshot, artifact_path, atomic_write, check_source
+)
+
+# Campos que compõem o hash de conteúdo de um nó
+HASHED_FIELDS = ('label', 'description', 'keywords', 'includes', 'excludes')
+
+HASH_SIZE = 16  # bytes (32 caracteres hex)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).hexdigest()
+
+
+def node_content_hash(node: Dict) -> str:
+    """
+    Hash do conteúdo de um nó (sem código e sem filhos)
+
+    Campos ausentes e vazios são equivalentes, para que adicionar
+    `includes: []` não conte como mudança.
+    """
+    content = [node.get(field) or None for field in HASHED_FIELDS]
+    data = json.dumps(content, ensure_ascii=False, separators=(',', ':'))
+    return _digest(data.encode('utf-8'))
+
+
+class TreeHashes:
+    """Hashes de conteúdo e de subárvore de todos os nós da árvore"""
+
+    def __init__(self, tree: Optional[Dict] = None):
+        self.content: Dict[str, str] = {}   # código → hash de conteúdo
+        self.subtree: Dict[str, str] = {}   # código → hash de subárvore
+        self.root: Optional[str] = None     # hash da árvore inteira
+
+        # Informações da última carga (from_file)
+        self.source = None  # "cache" ou "tree"
+        self.load_time = 0.0
+
+        if tree is not None:
+            self.root = self._build(tree.get('themes', []))
+
+    @classmethod
+    def from_file(cls, yaml_file: Path, cache_dir: Optional[Path] = None) -> "TreeHashes":
+        """
+        Hashes da árvore de um arquivo YAML, usando os hashes gravados se o YAML não mudou
+        """
+        start = time.perf_counter()
+        yaml_file = Path(yaml_file)
+        hashes_file = artifact_path(yaml_file, cache_dir, ".hashes.json")
+
+        stored = None
+        try:
+            with open(hashes_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        header = stored.get('header') if isinstance(stored, dict) else None
+        if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+            header = None
+        fresh, current = check_source(yaml_file, header)
+
+        if fresh:
+            hashes = cls.from_dict(stored)
+            hashes.source = "cache"
+            if header['mtime_ns'] != current['mtime_ns']:
+                hashes.save(hashes_file, current)
+        else:
+            hashes = cls(TreeSnapshot(yaml_file, cache_dir).load())
+            hashes.source = "tree"
+            hashes.save(hashes_file, current)
+
+        hashes.load_time = time.perf_counter() - start
+        return hashes
+
+    def _build(self, nodes: List[Dict]) -> str:
+        """Calcula os hashes de baixo para cima; retorna o hash combinado da lista"""
+        combined = hashlib.blake2b(digest_size=HASH_SIZE)
+        for node in nodes:
+            code = node.get('code', '')
+            content = node_content_hash(node)
+            children = self._build(node.get('children', []))
+
+            subtree = _digest(f"{code}\x00{content}\x00{children}".encode('utf-8'))
+
+            # Códigos repetidos: mantém-se o primeiro (como ThemeIndex)
+            self.content.setdefault(code, content)
+            self.subtree.setdefault(code, subtree)
+
+            combined.update(subtree.encode('ascii'))
+        return combined.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.subtree)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.subtree
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.subtree)
+
+    def content_hash(self, code: str) -> Optional[str]:
+        """Hash de conteúdo do nó (None se o código não existir)"""
+        return self.content.get(code)
+
+    def subtree_hash(self, code: str) -> Optional[str]:
+        """Hash da subárvore enraizada no nó (None se o código não existir)"""
+        return self.subtree.get(code)
+
+    def same_subtree(self, code: str, other: "TreeHashes") -> bool:
+        """Se a subárvore do código é idêntica em outra versão da árvore"""
+        subtree = self.subtree.get(code)
+        return subtree is not None and subtree == other.subtree.get(code)
+
+    def changed_codes(self, other: "TreeHashes") -> List[str]:
+        """Códigos cujo conteúdo difere (ou que não existem) na outra versão"""
+        return [code for code, content in self.content.items() if other.content.get(code) != content]
+
+    def to_dict(self) -> Dict:
+        """Representação serializável (código → [conteúdo, subárvore])"""
+        return {
+            'root': self.root,
+            'nodes': {code: [self.content[code], self.subtree[code]] for code in self.subtree},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TreeHashes":
+        hashes = cls()
+        hashes.root = data['root']
+        for code, (content, subtree) in data['nodes'].items():
+            hashes.content[code] = content
+            hashes.subtree[code] = subtree
+        return hashes
+
+    def save(self, hashes_file: Path, header: Optional[Dict] = None) -> bool:
+        """Grava os hashes em JSON de forma atômica (com cabeçalho de origem, se houver)"""
+        data = self.to_dict()
+        if header is not None:
+            data = {'header': header, **data}
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return atomic_write(Path(hashes_file), lambda f: f.write(payload))
@@ -0,0 +1,219 @@
+"""
+Leitura e escrita da árvore temática em YAML
+
+Ponto único de I/O da árvore: usa os bindings em C da libyaml
+(CSafeLoader/CSafeDumper) quando disponíveis e recai para as
+implementações em Python puro caso contrário. A formatação de saída é a
+mesma usada até aqui em todo o projeto (allow_unicode, sort_keys=False,
+width=120), byte a byte.
+
+A escrita é em streaming e atômica: cada L1 é serializado e gravado em um
+arquivo temporário, que recebe fsync antes de substituir o destino por
+rename. Uma falha no meio da escrita nunca deixa a árvore truncada.
+
+O PyYAML só é importado no primeiro uso (carregá-lo custa dezenas de ms e,
+com o snapshot em dia, a árvore nem passa pelo YAML). TreeLoader,
+TreeDumper, LIBYAML e YAMLError continuam acessíveis como atributos do
+módulo.
+"""
+import json
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+# Chave da lista de L1, gravada nó a nó
+THEMES_KEY = 'themes'
+
+# Início de um bloco L1 no arquivo canônico ("- code: '01'")
+_L1_BLOCK_START = re.compile(r"^- code: '?([^'\n]*)'?$")
+
+# Formatação canônica da árvore
+DUMP_OPTIONS = {
+    'allow_unicode': True,
+    'sort_keys': False,
+    'default_flow_style': False,
+    'width': 120,
+}
+
+
+@lru_cache(maxsize=None)
+def _bindings() -> Tuple[type, type, bool]:
+    """(Loader, Dumper, libyaml): bindings em C quando disponíveis"""
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        return loader, dumper, True
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+        return loader, dumper, False
+
+
+def __getattr__(name: str):
+    if name in ('TreeLoader', 'TreeDumper', 'LIBYAML'):
+        return _bindings()[('TreeLoader', 'TreeDumper', 'LIBYAML').index(name)]
+    if name == 'YAMLError':
+        import yaml
+        return yaml.YAMLError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def loads_tree(content: str) -> Dict:
+    """Converte texto YAML em árvore"""
+    import yaml
+    return yaml.load(content, Loader=_bindings()[0])
+
+
+def load_tree(themes_file: Path) -> Dict:
+    """Carrega árvore de arquivo YAML"""
+    import yaml
+    with open(themes_file, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_bindings()[0])
+
+
+def dump_tree(tree: Dict, stream: IO[str]) -> None:
+    """Escreve árvore em stream de texto com a formatação canônica"""
+    import yaml
+    yaml.dump(tree, stream, Dumper=_bindings()[1], **DUMP_OPTIONS)
+
+
+def dumps_tree(tree: Dict) -> str:
+    """Serializa árvore para texto YAML com a formatação canônica"""
+    import yaml
+    return yaml.dump(tree, Dumper=_bindings()[1], **DUMP_OPTIONS)
+
+
+def save_tree(themes_file: Path, tree: Dict, header: Optional[str] = None,
+              only_changed: bool = False) -> None:
+    """
+    Salva árvore em arquivo YAML (streaming, atômico)
+
+    Args:
+        themes_file: Arquivo de destino
+        tree: Árvore temática
+        header: Comentários de cabeçalho, escritos antes do YAML
+        only_changed: Reaproveitar, byte a byte, os blocos L1 do arquivo atual
+            que não mudaram, serializando apenas os L1 alterados
+    """
+    themes_file = Path(themes_file)
+    reuse = _reusable_blocks(themes_file, tree) if only_changed else {}
+
+    with _atomic_output(themes_file) as f:
+        if header:
+            f.write(header)
+        stream_tree(tree, f, reuse)
+
+
+def stream_tree(tree: Dict, stream: IO[str], reuse: Optional[Dict[int, str]] = None) -> None:
+    """
+    Escreve árvore nó L1 a nó L1, com saída idêntica a dump_tree
+
+    Args:
+        reuse: Texto já serializado de L1s (posição → bloco), copiado sem reserializar
+    """
+    if not isinstance(tree, dict) or not tree:
+        dump_tree(tree, stream)
+        return
+
+    reuse = reuse or {}
+    for key, value in tree.items():
+        if key == THEMES_KEY and isinstance(value, list) and value:
+            stream.write(f"{THEMES_KEY}:\n")
+            for position, node in enumerate(value):
+                block = reuse.get(position)
+                stream.write(block if block is not None else dumps_tree([node]))
+        else:
+            dump_tree({key: value}, stream)
+
+
+@contextmanager
+def _atomic_output(target: Path) -> Iterator[IO[str]]:
+    """Arquivo temporário no mesmo diretório, com fsync e rename ao final"""
+    tmp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, target)
+    except BaseException:
+        if tmp_file.exists():
+            tmp_file.unlink()
+        raise
+
+    # Persistir também a entrada de diretório do rename (POSIX)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(target.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _split_l1_blocks(text: str) -> Optional[List[str]]:
+    """
+    Blocos L1 de um arquivo no formato canônico (None se o formato não for reconhecido)
+    """
+    lines = text.splitlines(keepends=True)
+    try:
+        start = lines.index(f"{THEMES_KEY}:\n") + 1
+    except ValueError:
+        return None
+
+    blocks: List[List[str]] = []
+    for line in lines[start:]:
+        if line.startswith("- "):
+            blocks.append([line])
+        elif (line.startswith(" ") or line == "\n") and blocks:
+            # Continuação do L1 (inclui linhas vazias de strings multilinha)
+            blocks[-1].append(line)
+        else:
+            # Outra chave de topo depois de themes: formato não reaproveitável
+            return None
+    return ["".join(block) for block in blocks]
+
+
+def _fingerprint(node: Dict) -> str:
+    """Representação exata do nó, incluindo a ordem das chaves"""
+    return json.dumps(node, ensure_ascii=False, default=str)
+
+
+def _reusable_blocks(themes_file: Path, tree: Dict) -> Dict[int, str]:
+    """
+    Blocos L1 do arquivo atual que podem ser copiados sem reserializar
+
+    Um L1 é reaproveitado quando o nó é idêntico (conteúdo e ordem das chaves)
+    ao do arquivo atual; qualquer dúvida sobre o formato leva a reescrever tudo.
+    """
+    # Import local: tree_snapshot depende deste módulo
+    import yaml
+
+    from .tree_snapshot import TreeSnapshot
+
+    if not themes_file.exists() or not isinstance(tree, dict):
+        return {}
+
+    try:
+        old_tree = TreeSnapshot(themes_file).load()
+        blocks = _split_l1_blocks(themes_file.read_text(encoding='utf-8'))
+    except (yaml.YAMLError, UnicodeDecodeError):
+        return {}
+
+    old_themes = old_tree.get(THEMES_KEY, []) if isinstance(old_tree, dict) else []
+    if blocks is None or len(blocks) != len(old_themes):
+        return {}
+
+    old_by_code = {}
+    for node, block in zip(old_themes, blocks):
+        match = _L1_BLOCK_START.match(block.split("\n", 1)[0])
+        if not match or match.group(1) != str(node.get('code', '')):
+            return {}
+        old_by_code[node.get('code')] = (_fingerprint(node), block)
+
+    reuse = {}
+    for position, node in enumerate(tree.get(THEMES_KEY, []) or []):
+        old = old_by_code.get(node.get('code'))
+        if old is not None and old[0] == _fingerprint(node):
+            reuse[position] = old[1]
+    return reuse
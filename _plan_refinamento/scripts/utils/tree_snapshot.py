@@ -0,0 +1,164 @@
+"""
+Snapshot binário da árvore temática
+
+Evita reprocessar o YAML (parsing em Python puro) a cada execução: a árvore
+já carregada é persistida em pickle, identificada por tamanho, mtime e hash
+do conteúdo do YAML. Se o YAML não mudou, a árvore volta do snapshot em
+milissegundos; se mudou, o YAML é relido e o snapshot regenerado.
+"""
+import hashlib
+import io
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import IO, Callable, Dict, Optional, Tuple
+
+from .tree_io import load_tree
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIRNAME = ".tree_cache"
+
+
+def content_hash(data: bytes) -> str:
+    """Hash do conteúdo bruto do YAML"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def artifact_path(yaml_file: Path, cache_dir: Optional[Path], suffix: str) -> Path:
+    """
+    Caminho de um artefato derivado do YAML (um por arquivo, caminho absoluto no nome)
+
+    Args:
+        yaml_file: Arquivo YAML de origem
+        cache_dir: Diretório dos artefatos (padrão: .tree_cache/ ao lado do YAML)
+        suffix: Sufixo do artefato (ex: ".pkl")
+    """
+    cache_dir = Path(cache_dir) if cache_dir else yaml_file.parent / SNAPSHOT_DIRNAME
+    path_hash = hashlib.md5(str(yaml_file.resolve()).encode()).hexdigest()[:8]
+    return cache_dir / f"{yaml_file.stem}_{path_hash}{suffix}"
+
+
+def check_source(yaml_file: Path, header: Optional[Dict]) -> Tuple[bool, Dict]:
+    """
+    Confere se o cabeçalho de um artefato derivado corresponde ao YAML atual
+
+    Compara tamanho e mtime; só lê o YAML e calcula o hash se eles diferirem.
+
+    Returns:
+        Tuple[fresh, current]: Se o artefato é válido e o cabeçalho atual do YAML
+    """
+    stat = yaml_file.stat()
+    current = {
+        'version': SNAPSHOT_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': None,
+    }
+
+    if header and header['size'] == stat.st_size and header['mtime_ns'] == stat.st_mtime_ns:
+        current['hash'] = header['hash']
+        return True, current
+
+    current['hash'] = content_hash(yaml_file.read_bytes())
+    return bool(header) and header['hash'] == current['hash'], current
+
+
+def atomic_write(target: Path, write: Callable[[IO[bytes]], None]) -> bool:
+    """
+    Grava arquivo via temporário + rename (falhas de escrita são ignoradas)
+
+    Returns:
+        True se o arquivo foi gravado
+    """
+    tmp_file = target.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            write(f)
+        os.replace(tmp_file, target)
+        return True
+    except OSError:
+        # Diretório somente leitura etc.: seguir sem o artefato
+        if tmp_file.exists():
+            tmp_file.unlink()
+        return False
+
+
+class TreeSnapshot:
+    """Carregador de árvore YAML com snapshot binário transparente"""
+
+    def __init__(self, yaml_file: Path, cache_dir: Optional[Path] = None):
+        self.yaml_file = Path(yaml_file)
+        self.snapshot_file = artifact_path(self.yaml_file, cache_dir, ".pkl")
+
+        # Informações da última carga
+        self.source = None  # "snapshot" ou "yaml"
+        self.load_time = 0.0
+
+    def load(self) -> Dict:
+        """
+        Carrega a árvore, usando o snapshot se o YAML não mudou
+
+        Raises:
+            yaml.YAMLError, UnicodeDecodeError: Se o YAML precisar ser relido e for inválido
+        """
+        start = time.perf_counter()
+
+        header, stream = self._read_snapshot()
+        fresh, current = check_source(self.yaml_file, header)
+
+        if fresh:
+            tree = self._load_tree(stream)
+            if tree is not None:
+                # mtime mudou mas o conteúdo não (ex: git checkout): atualizar cabeçalho
+                if header['mtime_ns'] != current['mtime_ns']:
+                    self._write(tree, current)
+                return self._done(tree, "snapshot", start)
+
+        tree = load_tree(self.yaml_file)
+        self._write(tree, current)
+        return self._done(tree, "yaml", start)
+
+    def invalidate(self) -> None:
+        """Remove o snapshot (próxima carga relê o YAML)"""
+        if self.snapshot_file.exists():
+            self.snapshot_file.unlink()
+
+    def _done(self, tree: Dict, source: str, start: float) -> Dict:
+        self.source = source
+        self.load_time = time.perf_counter() - start
+        return tree
+
+    def _read_snapshot(self) -> Tuple[Optional[Dict], Optional[io.BytesIO]]:
+        """
+        Lê o snapshot de uma vez e decodifica apenas o cabeçalho
+
+        Returns:
+            Tuple[header, stream]: stream posicionado no início da árvore
+        """
+        try:
+            stream = io.BytesIO(self.snapshot_file.read_bytes())
+            header = pickle.load(stream)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None, None
+
+        if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+            return None, None
+        return header, stream
+
+    def _load_tree(self, stream: io.BytesIO) -> Optional[Dict]:
+        """Decodifica a árvore (segundo objeto do snapshot)"""
+        try:
+            return pickle.load(stream)
+        except (pickle.UnpicklingError, EOFError):
+            return None
+
+    def _write(self, tree: Dict, header: Dict) -> None:
+        """Grava snapshot de forma atômica"""
+
+        def write(f):
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        atomic_write(self.snapshot_file, write)
@@ -1,15 +1,26 @@
 """
 Utilitários para manipulação de arquivos YAML da árvore temática
 """
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple, Generator
 
+from .tree_io import load_tree, save_tree
+from .tree_snapshot import TreeSnapshot
 
-def load_yaml(themes_file: Path) -> Dict:
-    """Carrega árvore temática de arquivo YAML"""
-    with open(themes_file, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+
+def load_yaml(themes_file: Path, use_snapshot: bool = True) -> Dict:
+    """
+    Carrega árvore temática de arquivo YAML
+
+    Args:
+        themes_file: Arquivo YAML
+        use_snapshot: Usar snapshot binário (ver tree_snapshot) se o YAML não mudou
+    """
+    if use_snapshot:
+        return TreeSnapshot(themes_file).load()
+
+    return load_tree(themes_file)
 
 
 def load_themes_tree(themes_file: Path) -> Dict:
@@ -17,11 +28,14 @@ def load_themes_tree(themes_file: Path) -> Dict:
     return load_yaml(themes_file)
 
 
-def save_themes_tree(themes_file: Path, tree: Dict) -> None:
-    """Salva árvore temática em arquivo YAML"""
-    with open(themes_file, 'w', encoding='utf-8') as f:
-        yaml.dump(tree, f, allow_unicode=True, sort_keys=False,
-                  default_flow_style=False, width=120)
+def save_themes_tree(themes_file: Path, tree: Dict, only_changed: bool = False) -> None:
+    """
+    Salva árvore temática em arquivo YAML (escrita atômica, ver tree_io.save_tree)
+
+    Args:
+        only_changed: Reserializar apenas os L1 alterados em relação ao arquivo atual
+    """
+    save_tree(themes_file, tree, only_changed=only_changed)
 
 
 def iter_all_nodes(tree: Dict) -> Generator[Dict, None, None]:
@@ -73,9 +87,10 @@ def get_siblings(tree: Dict, code: str) -> List[Dict]:
     return siblings
 
 
+@lru_cache(maxsize=None)
 def get_level(code: str) -> str:
     """
-    Determina o nível de um nó baseado no código
+    Determina o nível de um nó baseado no código (memoizado por código)
 
     Args:
         code: Código do nó (ex: "01", "01.02", "01.02.03")
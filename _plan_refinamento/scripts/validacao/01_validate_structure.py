@@ -16,14 +16,16 @@ from pathlib import Path
 from collections import defaultdict, Counter
 from typing import Dict, List, Tuple, Set
 
-import yaml
-
 # Adicionar diretório pai ao path para imports
 sys.path.append(str(Path(__file__).parent.parent))
 from config import (
     THEMES_FILE, REPORTS_DIR, MIN_KEYWORDS, COLORS,
-    print_config
+    print_config, ensure_dir
 )
+from utils import tree_io
+from utils.theme_index import ThemeIndex
+from utils.tree_hashes import TreeHashes
+from utils.tree_snapshot import TreeSnapshot
 
 
 class StructureValidator:
@@ -32,6 +34,8 @@ class StructureValidator:
     def __init__(self, themes_file: Path):
         self.themes_file = themes_file
         self.tree = None
+        self.index = None
+        self.hashes = None
         self.errors = []
         self.warnings = []
         self.stats = {
@@ -46,14 +50,19 @@ class StructureValidator:
         print(f"{COLORS['blue']}1. Validando sintaxe YAML...{COLORS['reset']}")
 
         try:
-            with open(self.themes_file, 'r', encoding='utf-8') as f:
-                self.tree = yaml.safe_load(f)
+            snapshot = TreeSnapshot(self.themes_file)
+            self.tree = snapshot.load()
+
+            self.index = ThemeIndex(self.tree)
+            self.hashes = TreeHashes.from_file(self.themes_file)
 
             print(f"  {COLORS['green']}✓{COLORS['reset']} Sintaxe YAML válida")
             print(f"  {COLORS['green']}✓{COLORS['reset']} Encoding UTF-8 correto")
+            print(f"  Árvore carregada de {snapshot.source} em {snapshot.load_time * 1000:.1f} ms")
             return True
 
-        except yaml.YAMLError as e:
+        # tree_io.YAMLError só importa o PyYAML se houver exceção a comparar
+        except tree_io.YAMLError as e:
             self.errors.append(f"Erro de sintaxe YAML: {e}")
             print(f"  {COLORS['red']}✗{COLORS['reset']} Erro de sintaxe YAML: {e}")
             return False
@@ -318,7 +327,7 @@ class StructureValidator:
         print(f"\n{COLORS['blue']}6. Gerando relatórios...{COLORS['reset']}")
 
         # Relatório em Markdown
-        report_file = REPORTS_DIR / "01_estrutura_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "01_estrutura_report.md"
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write("# Relatório de Validação Estrutural\n\n")
             f.write(f"**Data:** {Path(__file__).stat().st_mtime}\n")
@@ -378,9 +387,8 @@ class StructureValidator:
             for l1_info in distribution['l1']:
                 l1_code = l1_info['code']
                 l3_total = sum(
-                    distribution['l3_per_l2'].get(l2_code, 0)
-                    for l2_code in distribution['l3_per_l2']
-                    if l2_code.startswith(l1_code + ".")
+                    distribution['l3_per_l2'].get(l2.get('code'), 0)
+                    for l2 in self.index.children(l1_code)
                 )
                 f.write(f"| {l1_code} | {l1_info['label']} | {l1_info['l2_count']} | {l3_total} |\n")
 
@@ -394,7 +402,12 @@ class StructureValidator:
             "warnings_count": len(self.warnings),
             "errors": self.errors,
             "warnings": self.warnings,
-            "distribution": distribution
+            "distribution": distribution,
+            # Hashes de subárvore: etapas posteriores comparam para pular ramos inalterados
+            "hashes": {
+                "tree": self.hashes.root,
+                "l1": {code: self.hashes.subtree_hash(code) for code in self.index.codes_at_level('L1')},
+            },
         }
 
         with open(stats_file, 'w', encoding='utf-8') as f:
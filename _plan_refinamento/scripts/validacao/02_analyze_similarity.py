@@ -18,9 +18,14 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from config import (
     THEMES_FILE, REPORTS_DIR, DATA_DIR,
-    EMBEDDING_MODEL, EMBEDDINGS_CACHE_DIR, EMBEDDING_DEVICE
+    EMBEDDING_MODEL, EMBEDDINGS_CACHE_DIR, EMBEDDING_DEVICE, EMBEDDING_STORAGE,
+    EMBEDDING_MEMORY_MB, EMBEDDING_REVISION, EMBEDDING_MAX_SEQ_LENGTH,
+    EMBEDDING_POOLING, EMBEDDING_NORMALIZE, EMBEDDING_TOKEN_BUDGET,
+    EMBEDDING_BACKEND, EMBEDDING_MODELS_DIR, EMBEDDING_WORKERS, EMBEDDING_THREADS,
+    ensure_dir, export_env
 )
-from utils.yaml_utils import load_yaml, iter_all_nodes, get_level, get_siblings
+from utils.yaml_utils import load_yaml
+from utils.theme_columns import ThemeColumns
 from utils.embedding_utils import EmbeddingGenerator, similarity_matrix
 from colorama import Fore, Style, init
 
@@ -35,6 +40,7 @@ class SimilarityAnalyzer:
     def __init__(self, themes_file: Path):
         self.themes_file = themes_file
         self.tree = load_yaml(themes_file)
+        self.columns = ThemeColumns(self.tree)
         self.problems = []
 
         # Inicializar gerador de embeddings
@@ -42,7 +48,18 @@ class SimilarityAnalyzer:
         self.embedding_gen = EmbeddingGenerator(
             model_name=EMBEDDING_MODEL,
             cache_dir=EMBEDDINGS_CACHE_DIR,
-            device=EMBEDDING_DEVICE
+            device=EMBEDDING_DEVICE,
+            storage=EMBEDDING_STORAGE,
+            memory_mb=EMBEDDING_MEMORY_MB,
+            revision=EMBEDDING_REVISION,
+            max_seq_length=EMBEDDING_MAX_SEQ_LENGTH,
+            pooling=EMBEDDING_POOLING,
+            normalize=EMBEDDING_NORMALIZE,
+            token_budget=EMBEDDING_TOKEN_BUDGET,
+            backend=EMBEDDING_BACKEND,
+            models_dir=EMBEDDING_MODELS_DIR,
+            workers=EMBEDDING_WORKERS,
+            threads=EMBEDDING_THREADS
         )
 
     def analyze_l2_similarity(self):
@@ -50,22 +67,22 @@ class SimilarityAnalyzer:
         print(f"\n{Fore.CYAN}=== Análise de Similaridade L2 ==={Style.RESET_ALL}\n")
 
         # Agrupar L2 por pai L1
-        l2_by_l1 = defaultdict(list)
-        for node in iter_all_nodes(self.tree):
-            if get_level(node.get("code", "")) == "L2":
-                l1_code = node["code"].split(".")[0]
-                l2_by_l1[l1_code].append(node)
+        cols = self.columns
+        l2_by_l1 = {
+            cols.codes[l1_row]: cols.children_range(l1_row)
+            for l1_row in cols.level_range("L1")
+        }
 
         high_similarity_pairs = []
 
-        for l1_code, l2_nodes in l2_by_l1.items():
-            if len(l2_nodes) <= 1:
+        for l1_code, l2_rows in l2_by_l1.items():
+            if len(l2_rows) <= 1:
                 continue  # Precisa de pelo menos 2 irmãos
 
             # Gerar embeddings
-            descriptions = [n.get("description", "") for n in l2_nodes]
-            codes = [n.get("code") for n in l2_nodes]
-            labels = [n.get("label") for n in l2_nodes]
+            descriptions = cols.descriptions_in(l2_rows)
+            codes = cols.codes_in(l2_rows)
+            labels = cols.labels_in(l2_rows)
 
             embeddings = self.embedding_gen.encode(descriptions, show_progress=False)
 
@@ -73,7 +90,7 @@ class SimilarityAnalyzer:
             sim_matrix = similarity_matrix(embeddings)
 
             # Identificar pares com alta similaridade
-            n = len(l2_nodes)
+            n = len(l2_rows)
             for i in range(n):
                 for j in range(i + 1, n):
                     similarity = sim_matrix[i, j]
@@ -112,23 +129,23 @@ class SimilarityAnalyzer:
         print(f"\n{Fore.CYAN}=== Análise de Similaridade L3 ==={Style.RESET_ALL}\n")
 
         # Agrupar L3 por pai L2
-        l3_by_l2 = defaultdict(list)
-        for node in iter_all_nodes(self.tree):
-            if get_level(node.get("code", "")) == "L3":
-                l2_code = ".".join(node["code"].split(".")[:2])
-                l3_by_l2[l2_code].append(node)
+        cols = self.columns
+        l3_by_l2 = {
+            cols.codes[l2_row]: cols.children_range(l2_row)
+            for l2_row in cols.level_range("L2")
+        }
 
         high_similarity_pairs = []
         l2_with_issues = set()
 
-        for l2_code, l3_nodes in l3_by_l2.items():
-            if len(l3_nodes) <= 1:
+        for l2_code, l3_rows in l3_by_l2.items():
+            if len(l3_rows) <= 1:
                 continue
 
             # Gerar embeddings
-            descriptions = [n.get("description", "") for n in l3_nodes]
-            codes = [n.get("code") for n in l3_nodes]
-            labels = [n.get("label") for n in l3_nodes]
+            descriptions = cols.descriptions_in(l3_rows)
+            codes = cols.codes_in(l3_rows)
+            labels = cols.labels_in(l3_rows)
 
             embeddings = self.embedding_gen.encode(descriptions, show_progress=False)
 
@@ -136,7 +153,7 @@ class SimilarityAnalyzer:
             sim_matrix = similarity_matrix(embeddings)
 
             # Identificar pares com alta similaridade
-            n = len(l3_nodes)
+            n = len(l3_rows)
             has_issue = False
             for i in range(n):
                 for j in range(i + 1, n):
@@ -222,7 +239,7 @@ class SimilarityAnalyzer:
             plt.title(f"Similaridade L2 - Tema {l1_code}: {l1_label}")
             plt.tight_layout()
 
-            output_file = REPORTS_DIR / f"02_similarity_heatmap_L2_{l1_code}.png"
+            output_file = ensure_dir(REPORTS_DIR) / f"02_similarity_heatmap_L2_{l1_code}.png"
             plt.savefig(output_file, dpi=150, bbox_inches="tight")
             plt.close()
 
@@ -230,12 +247,13 @@ class SimilarityAnalyzer:
 
     def generate_report(self, l2_pairs: List[Dict], l3_pairs: List[Dict]):
         """Gera relatório de similaridade"""
-        report_file = REPORTS_DIR / "02_similarity_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "02_similarity_report.md"
 
         with open(report_file, "w", encoding="utf-8") as f:
             f.write("# Relatório de Análise de Similaridade Semântica - Subfase 4.2\n\n")
             f.write(f"**Modelo de embeddings:** `{EMBEDDING_MODEL}`\n\n")
             f.write(f"**Threshold de similaridade:** {SIMILARITY_THRESHOLD}\n\n")
+            f.write(f"**Cache de embeddings:** {self.embedding_gen.summary()}\n\n")
 
             # Sumário
             f.write("## Sumário Executivo\n\n")
@@ -295,6 +313,7 @@ class SimilarityAnalyzer:
 
 
 def main():
+    export_env()
     print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}Subfase 4.2: Análise de Similaridade Semântica{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
@@ -317,6 +336,7 @@ def main():
     # Sumário final
     print(f"\n{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
     print(f"{Fore.GREEN}✓ Análise de similaridade concluída{Style.RESET_ALL}")
+    print(f"Cache de embeddings: {analyzer.embedding_gen.summary()}")
     print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
 
     if len(l2_pairs) > 0:
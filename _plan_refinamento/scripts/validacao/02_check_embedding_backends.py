@@ -0,0 +1,108 @@
+"""
+Subfase 4.2: Paridade dos backends de inferência de embeddings
+
+Gera os embeddings das notícias de test_dataset.csv (título + resumo, como
+na classificação) com o backend torch e com os backends ONNX (onnx e
+onnx-int8), sem passar pelo cache, e compara vetor a vetor pelo cosseno.
+Gera relatório com cosseno mínimo/médio e tempo de geração de cada backend
+e falha se algum ficar abaixo do cosseno mínimo.
+
+Uso:
+    python scripts/validacao/02_check_embedding_backends.py [--min-cosine 0.99] [--backends onnx onnx-int8]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    REPORTS_DIR, DATA_DIR, EMBEDDING_MODEL, EMBEDDING_REVISION, EMBEDDING_MODELS_DIR,
+    EMBEDDING_TOKEN_BUDGET, EMBEDDING_BATCH_SIZE, ensure_dir, export_env
+)
+from utils.embedding_backends import BACKENDS, load_model
+from utils.embedding_batching import encode_bucketed
+from utils.embedding_corpus import news_texts
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+
+def row_cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def write_report(results: Dict[str, Dict], n_texts: int, min_cosine: float, report_file: Path) -> None:
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write("# Paridade dos Backends de Embeddings\n\n")
+        f.write(f"**Modelo:** `{EMBEDDING_MODEL}`\n")
+        f.write(f"**Notícias:** {n_texts} (test_dataset.csv, CPU, sem cache)\n")
+        f.write(f"**Cosseno mínimo exigido:** {min_cosine}\n\n")
+
+        f.write("| Backend | Cosseno mín | Cosseno médio | Tempo (s) | Textos/s | Status |\n")
+        f.write("|---------|------------:|--------------:|----------:|---------:|--------|\n")
+        for backend, r in results.items():
+            status = "referência" if backend == "torch" else ("✓" if r['min'] >= min_cosine else "✗")
+            f.write(f"| `{backend}` | {r['min']:.5f} | {r['mean']:.5f} | {r['seconds']:.2f} | "
+                    f"{n_texts / r['seconds']:.1f} | {status} |\n")
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Paridade dos backends ONNX com o backend torch")
+    parser.add_argument("--min-cosine", type=float, default=0.99,
+                        help="Cosseno mínimo com o torch para cada vetor (padrão: 0.99)")
+    parser.add_argument("--backends", nargs="+", default=[b for b in BACKENDS if b != "torch"],
+                        choices=[b for b in BACKENDS if b != "torch"], help="Backends comparados")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Subfase 4.2: Paridade dos Backends de Embeddings{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    texts = news_texts(DATA_DIR / "test_dataset.csv")
+    results, reference = {}, None
+    for backend in ["torch", *args.backends]:
+        try:
+            model = load_model(EMBEDDING_MODEL, backend, device="cpu", revision=EMBEDDING_REVISION or None,
+                               models_dir=EMBEDDING_MODELS_DIR)
+        except ImportError as e:
+            print(f"{Fore.RED}❌ {backend}: {e}{Style.RESET_ALL}")
+            return 1
+
+        token_budget = EMBEDDING_TOKEN_BUDGET or EMBEDDING_BATCH_SIZE * model.max_seq_length
+        encode_bucketed(model, texts[:EMBEDDING_BATCH_SIZE], token_budget)  # aquecimento
+        start = time.perf_counter()
+        vectors = encode_bucketed(model, texts, token_budget, show_progress=True)
+        seconds = time.perf_counter() - start
+
+        if reference is None:
+            reference = vectors
+        cosines = row_cosines(reference, vectors)
+        results[backend] = {'min': float(cosines.min()), 'mean': float(cosines.mean()), 'seconds': seconds}
+        print(f"  {backend:10s} cosseno mín {cosines.min():.5f}  médio {cosines.mean():.5f}  "
+              f"{len(texts) / seconds:6.1f} textos/s")
+
+    report_file = ensure_dir(REPORTS_DIR) / "02_embedding_backends.md"
+    write_report(results, len(texts), args.min_cosine, report_file)
+    print(f"\n{Fore.GREEN}✓ Relatório: {report_file}{Style.RESET_ALL}")
+
+    failed = [b for b in args.backends if results[b]['min'] < args.min_cosine]
+    if failed:
+        for backend in failed:
+            print(f"{Fore.RED}✗ {backend}: cosseno mínimo {results[backend]['min']:.5f} "
+                  f"abaixo de {args.min_cosine}{Style.RESET_ALL}")
+        return 1
+
+    print(f"{Fore.GREEN}✓ Backends ONNX equivalentes ao torch (cosseno ≥ {args.min_cosine}){Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Subfase 4.2: Verificação dos modos de armazenamento de embeddings
+
+Mede quanto a quantização do cache de embeddings (float16, int8) altera o
+ranking de similaridade de cosseno entre as notícias de test_dataset.csv e
+os nós da árvore (L1 e L3): concordância do nó mais similar, interseção do
+top-k e diferença nas similaridades. Gera relatório com o tamanho por vetor
+de cada modo e falha se o modo configurado (EMBEDDING_STORAGE) ficar abaixo
+da concordância mínima.
+
+Uso:
+    python scripts/validacao/02_check_embedding_storage.py [--k 5] [--min-top1 0.98]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import (
+    THEMES_FILE, REPORTS_DIR, DATA_DIR,
+    EMBEDDING_MODEL, EMBEDDINGS_CACHE_DIR, EMBEDDING_DEVICE, EMBEDDING_STORAGE,
+    EMBEDDING_MEMORY_MB, EMBEDDING_REVISION, EMBEDDING_MAX_SEQ_LENGTH,
+    EMBEDDING_POOLING, EMBEDDING_NORMALIZE, EMBEDDING_TOKEN_BUDGET,
+    EMBEDDING_BACKEND, EMBEDDING_MODELS_DIR, EMBEDDING_WORKERS, EMBEDDING_THREADS,
+    ensure_dir, export_env
+)
+from utils.theme_columns import ThemeColumns
+from utils.embedding_corpus import news_texts, node_texts
+from utils.embedding_quantization import STORAGE_MODES, bytes_per_vector, ranking_drift
+from utils.embedding_utils import EmbeddingGenerator
+from colorama import Fore, Style, init
+
+init(autoreset=True)
+
+LEVELS = ("L1", "L3")
+
+
+def write_report(results: Dict[str, Dict[str, Dict]], dim: int, n_news: int, k: int,
+                 min_top1: float, cache_summary: str, report_file: Path) -> None:
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write("# Modos de Armazenamento de Embeddings\n\n")
+        f.write(f"**Modelo:** `{EMBEDDING_MODEL}` ({dim} dimensões)\n")
+        f.write(f"**Notícias:** {n_news} (test_dataset.csv)\n")
+        f.write(f"**Modo configurado:** `{EMBEDDING_STORAGE}` (concordância top-1 mínima: {min_top1:.0%})\n")
+        f.write(f"**Cache de embeddings:** {cache_summary}\n\n")
+
+        f.write(f"| Modo | Bytes/vetor | % do float32 | Nível | Top-1 igual | Top-{k} (interseção) "
+                "| Δ cosseno médio | Δ cosseno máx |\n")
+        f.write("|------|------------:|-------------:|-------|------------:|------------:|------------:|------------:|\n")
+        for mode in STORAGE_MODES:
+            size = bytes_per_vector(mode, dim)
+            for level in LEVELS:
+                r = results[mode][level]
+                f.write(f"| `{mode}` | {size:,} | {size / bytes_per_vector('float32', dim):.0%} | {level} | "
+                        f"{r['top1_agreement']:.2%} | {r['topk_overlap']:.2%} | "
+                        f"{r['mean_abs_delta']:.5f} | {r['max_abs_delta']:.5f} |\n")
+
+        f.write("\n*Consultas e nós passam pelo mesmo modo, como ao serem lidos do cache.*\n")
+
+
+def main():
+    export_env()
+    parser = argparse.ArgumentParser(description="Impacto da quantização do cache de embeddings nos rankings")
+    parser.add_argument("--k", type=int, default=5, help="Tamanho do top-k comparado (padrão: 5)")
+    parser.add_argument("--min-top1", type=float, default=0.98,
+                        help="Concordância top-1 mínima para o modo configurado (padrão: 0.98)")
+    args = parser.parse_args()
+
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Subfase 4.2: Verificação dos Modos de Armazenamento de Embeddings{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
+
+    # Referência em float32 (cache_embeddings.py trata este namespace como atual)
+    generator = EmbeddingGenerator(
+        model_name=EMBEDDING_MODEL,
+        cache_dir=EMBEDDINGS_CACHE_DIR,
+        device=EMBEDDING_DEVICE,
+        storage="float32",
+        memory_mb=EMBEDDING_MEMORY_MB,
+        revision=EMBEDDING_REVISION,
+        max_seq_length=EMBEDDING_MAX_SEQ_LENGTH,
+        pooling=EMBEDDING_POOLING,
+        normalize=EMBEDDING_NORMALIZE,
+        token_budget=EMBEDDING_TOKEN_BUDGET,
+        backend=EMBEDDING_BACKEND,
+        models_dir=EMBEDDING_MODELS_DIR,
+        workers=EMBEDDING_WORKERS,
+        threads=EMBEDDING_THREADS
+    )
+    cols = ThemeColumns.from_file(THEMES_FILE)
+    news = generator.encode(news_texts(DATA_DIR / "test_dataset.csv"))
+    targets = {level: generator.encode(node_texts(cols, level), show_progress=False) for level in LEVELS}
+
+    results = {
+        mode: {level: ranking_drift(news, targets[level], mode, k=args.k) for level in LEVELS}
+        for mode in STORAGE_MODES
+    }
+
+    for mode in STORAGE_MODES:
+        line = "  ".join(
+            f"{level}: top-1 {results[mode][level]['top1_agreement']:.2%}, "
+            f"top-{args.k} {results[mode][level]['topk_overlap']:.2%}"
+            for level in LEVELS
+        )
+        print(f"  {mode:8s} {bytes_per_vector(mode, news.shape[1]):5,} B/vetor  {line}")
+
+    print(f"\nCache de embeddings: {generator.summary()}")
+
+    report_file = ensure_dir(REPORTS_DIR) / "02_embedding_storage.md"
+    write_report(results, news.shape[1], len(news), args.k, args.min_top1, generator.summary(), report_file)
+    print(f"\n{Fore.GREEN}✓ Relatório: {report_file}{Style.RESET_ALL}")
+
+    worst = min(results[EMBEDDING_STORAGE][level]['top1_agreement'] for level in LEVELS)
+    if worst < args.min_top1:
+        print(f"{Fore.RED}✗ Modo {EMBEDDING_STORAGE}: concordância top-1 {worst:.2%} "
+              f"abaixo do mínimo {args.min_top1:.0%}{Style.RESET_ALL}")
+        return 1
+
+    print(f"{Fore.GREEN}✓ Modo {EMBEDDING_STORAGE} dentro do limite (top-1 ≥ {args.min_top1:.0%}){Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,8 +16,10 @@ from typing import Dict, List, Set
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import THEMES_FILE, REPORTS_DIR
-from utils.yaml_utils import load_yaml, iter_all_nodes, get_level
+from config import THEMES_FILE, REPORTS_DIR, ensure_dir
+from utils.yaml_utils import load_yaml
+from utils.theme_index import ThemeIndex
+from utils.theme_columns import ThemeColumns
 from colorama import Fore, Style, init
 
 init(autoreset=True)
@@ -40,6 +42,8 @@ class KeywordAnalyzer:
     def __init__(self, themes_file: Path):
         self.themes_file = themes_file
         self.tree = load_yaml(themes_file)
+        self.index = ThemeIndex(self.tree)
+        self.columns = ThemeColumns(self.tree)
         self.problems = []
         self.stats = defaultdict(int)
 
@@ -49,11 +53,11 @@ class KeywordAnalyzer:
 
         issues_by_level = defaultdict(list)
 
-        for node in iter_all_nodes(self.tree):
+        for node in self.index:
             code = node.get("code", "?")
             label = node.get("label", "?")
             keywords = node.get("keywords", [])
-            level = get_level(code)
+            level = self.index.level(code)
 
             kw_count = len(keywords)
             self.stats[f"{level}_keyword_counts"] += 1
@@ -118,11 +122,11 @@ class KeywordAnalyzer:
 
         nodes_with_generic = []
 
-        for node in iter_all_nodes(self.tree):
+        for node in self.index:
             code = node.get("code", "?")
             label = node.get("label", "?")
             keywords = node.get("keywords", [])
-            level = get_level(code)
+            level = self.index.level(code)
 
             # Normalizar keywords para lowercase
             kw_set = {kw.lower() for kw in keywords}
@@ -162,22 +166,22 @@ class KeywordAnalyzer:
         """Analisa sobreposição de keywords entre irmãos"""
         print(f"\n{Fore.CYAN}=== Análise de Sobreposição de Keywords ==={Style.RESET_ALL}\n")
 
-        # Analisar L2 por pai L1
-        l2_by_l1 = defaultdict(list)
-        for node in iter_all_nodes(self.tree):
-            if get_level(node.get("code", "")) == "L2":
-                l1_code = node["code"].split(".")[0]
-                l2_by_l1[l1_code].append(node)
+        # Analisar L2 por pai L1 (irmãos são faixas contíguas na representação colunar)
+        cols = self.columns
 
         high_overlap_l2 = []
-        for l1_code, l2_nodes in l2_by_l1.items():
-            if len(l2_nodes) <= 1:
+        for l1_row in cols.level_range("L1"):
+            l2_rows = cols.children_range(l1_row)
+            if len(l2_rows) <= 1:
                 continue
 
-            for i, node1 in enumerate(l2_nodes):
-                kw1 = set(k.lower() for k in node1.get("keywords", []))
-                for node2 in l2_nodes[i+1:]:
-                    kw2 = set(k.lower() for k in node2.get("keywords", []))
+            codes = cols.codes_in(l2_rows)
+            labels = cols.labels_in(l2_rows)
+            kw_sets = [set(k.lower() for k in kws) for kws in cols.keywords_in(l2_rows)]
+
+            for i, kw1 in enumerate(kw_sets):
+                for j in range(i + 1, len(kw_sets)):
+                    kw2 = kw_sets[j]
 
                     if not kw1 or not kw2:
                         continue
@@ -187,17 +191,17 @@ class KeywordAnalyzer:
 
                     if overlap_ratio > 0.5:  # Mais de 50% de sobreposição
                         high_overlap_l2.append({
-                            "code1": node1["code"],
-                            "label1": node1["label"],
-                            "code2": node2["code"],
-                            "label2": node2["label"],
+                            "code1": codes[i],
+                            "label1": labels[i],
+                            "code2": codes[j],
+                            "label2": labels[j],
                             "overlap": list(overlap),
                             "ratio": overlap_ratio
                         })
 
                         self.problems.append({
-                            "code": f"{node1['code']} ↔ {node2['code']}",
-                            "label": f"{node1['label']} ↔ {node2['label']}",
+                            "code": f"{codes[i]} ↔ {codes[j]}",
+                            "label": f"{labels[i]} ↔ {labels[j]}",
                             "level": "L2",
                             "type": "high_keyword_overlap",
                             "severity": "MÉDIO",
@@ -215,22 +219,16 @@ class KeywordAnalyzer:
                 print(f"    Comuns: {', '.join(list(pair['overlap'])[:5])}...")
 
         # Analisar L3 por pai L2 (apenas contagem)
-        l3_by_l2 = defaultdict(list)
-        for node in iter_all_nodes(self.tree):
-            if get_level(node.get("code", "")) == "L3":
-                l2_code = ".".join(node["code"].split(".")[:2])
-                l3_by_l2[l2_code].append(node)
-
         high_overlap_l3_count = 0
-        for l2_code, l3_nodes in l3_by_l2.items():
-            if len(l3_nodes) <= 1:
+        for l2_row in cols.level_range("L2"):
+            l3_rows = cols.children_range(l2_row)
+            if len(l3_rows) <= 1:
                 continue
 
-            for i, node1 in enumerate(l3_nodes):
-                kw1 = set(k.lower() for k in node1.get("keywords", []))
-                for node2 in l3_nodes[i+1:]:
-                    kw2 = set(k.lower() for k in node2.get("keywords", []))
+            kw_sets = [set(k.lower() for k in kws) for kws in cols.keywords_in(l3_rows)]
 
+            for i, kw1 in enumerate(kw_sets):
+                for kw2 in kw_sets[i + 1:]:
                     if not kw1 or not kw2:
                         continue
 
@@ -244,7 +242,7 @@ class KeywordAnalyzer:
 
     def generate_report(self):
         """Gera relatório de análise de keywords"""
-        report_file = REPORTS_DIR / "02_keywords_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "02_keywords_report.md"
 
         with open(report_file, "w", encoding="utf-8") as f:
             f.write("# Relatório de Análise de Keywords - Subfase 4.2\n\n")
@@ -15,8 +15,9 @@ from typing import Dict, List, Tuple
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import THEMES_FILE, REPORTS_DIR
-from utils.yaml_utils import load_yaml, iter_all_nodes, count_words, get_level
+from config import THEMES_FILE, REPORTS_DIR, ensure_dir
+from utils.yaml_utils import load_yaml, count_words
+from utils.theme_index import ThemeIndex
 from colorama import Fore, Style, init
 
 init(autoreset=True)
@@ -33,6 +34,7 @@ class QualityValidator:
     def __init__(self, themes_file: Path):
         self.themes_file = themes_file
         self.tree = load_yaml(themes_file)
+        self.index = ThemeIndex(self.tree)
         self.problems = []
         self.stats = defaultdict(list)
 
@@ -42,11 +44,11 @@ class QualityValidator:
 
         issues_by_type = defaultdict(list)
 
-        for node in iter_all_nodes(self.tree):
+        for node in self.index:
             code = node.get("code", "?")
             label = node.get("label", "?")
             description = node.get("description", "")
-            level = get_level(code)
+            level = self.index.level(code)
 
             word_count = count_words(description)
             self.stats[f"{level}_word_counts"].append(word_count)
@@ -172,7 +174,7 @@ class QualityValidator:
 
     def generate_report(self):
         """Gera relatório de qualidade em Markdown"""
-        report_file = REPORTS_DIR / "02_qualidade_report.md"
+        report_file = ensure_dir(REPORTS_DIR) / "02_qualidade_report.md"
         problems_file = REPORTS_DIR / "02_problemas_qualidade.csv"
 
         # Gerar markdown
@@ -52,12 +52,15 @@ class AnnotationApp:
         agencies_file = data_dir / self.agencies_filename
         self.agency_loader = AgencyLoader(agencies_file) if agencies_file.exists() else None
 
+        # Esqueleto da árvore temática: só códigos, labels e pais (carregado em run())
+        self.theme_index = None
+
     def load_data(self):
         """Carrega dataset e árvore temática (sem cache para suportar trabalho em paralelo)"""
         try:
             df = self.data_loader.load_csv(self.dataset_filename)
-            themes_tree = self.data_loader.load_yaml(self.themes_filename)
-            return df, themes_tree
+            theme_skeleton = self.data_loader.load_theme_skeleton(self.themes_filename)
+            return df, theme_skeleton
         except FileNotFoundError as e:
             st.error(f"❌ Erro ao carregar dados: {e}")
             st.info("💡 Certifique-se de que os arquivos estão no local correto:")
@@ -110,6 +113,9 @@ class AnnotationApp:
         if not code or not themes:
             return code
 
+        if self.theme_index is not None:
+            return self.theme_index.label(str(code), code)
+
         # Determinar nível
         parts = str(code).split('.')
         level = len(parts)
@@ -601,8 +607,8 @@ class AnnotationApp:
         # Aplicação principal (sem título grande para economizar espaço)
 
         # Carregar dados
-        df, themes_tree = self.load_data()
-        themes = get_theme_hierarchy(themes_tree)
+        df, self.theme_index = self.load_data()
+        themes = get_theme_hierarchy(self.theme_index)
 
         # Primeiro passo: aplicar filtros para obter índices e posição
         # Fazer uma primeira passagem sem renderizar sidebar
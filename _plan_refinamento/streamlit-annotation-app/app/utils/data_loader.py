@@ -5,7 +5,9 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 import pandas as pd
-import yaml
+
+from .tree_skeleton import TreeSkeleton
+from .tree_snapshot import TreeSnapshot
 
 
 class DataLoader:
@@ -49,6 +51,13 @@ class DataLoader:
         else:
             return self._load_yaml_local(filename)
 
+    def load_theme_skeleton(self, filename: str) -> TreeSkeleton:
+        """Carrega apenas códigos, labels e pais da árvore (campos pesados sob demanda)"""
+        if self.use_gcs:
+            return self._load_theme_skeleton_gcs(filename)
+        else:
+            return self._load_theme_skeleton_local(filename)
+
     # Métodos locais
     def _load_csv_local(self, filename: str) -> pd.DataFrame:
         """Carrega CSV local com tipos corretos para códigos temáticos"""
@@ -78,8 +87,14 @@ class DataLoader:
         filepath = self.local_data_dir / filename
         if not filepath.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {filepath}")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return TreeSnapshot(filepath).load()
+
+    def _load_theme_skeleton_local(self, filename: str) -> TreeSkeleton:
+        """Carrega esqueleto da árvore local"""
+        filepath = self.local_data_dir / filename
+        if not filepath.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {filepath}")
+        return TreeSkeleton(filepath).load()
 
     # Métodos GCS
     def _load_csv_gcs(self, filename: str) -> pd.DataFrame:
@@ -129,4 +144,15 @@ class DataLoader:
         blob = bucket.blob(filename)
 
         content = blob.download_as_text()
-        return yaml.safe_load(content)
+        return TreeSnapshot(self.local_data_dir / filename).load_text(content)
+
+    def _load_theme_skeleton_gcs(self, filename: str) -> TreeSkeleton:
+        """Carrega esqueleto da árvore do GCS"""
+        from google.cloud import storage
+
+        client = storage.Client()
+        bucket = client.bucket(self.bucket_name)
+        blob = bucket.blob(filename)
+
+        content = blob.download_as_text()
+        return TreeSkeleton(self.local_data_dir / filename).load_text(content)
@@ -1,7 +1,10 @@
 """
 Utilitários para trabalhar com a hierarquia de temas
 """
-from typing import Dict, Generator
+from typing import TYPE_CHECKING, Dict, Generator, List, Optional, Union
+
+if TYPE_CHECKING:
+    from .tree_skeleton import TreeSkeleton
 
 
 def iter_all_nodes(tree: Dict) -> Generator[Dict, None, None]:
@@ -40,31 +43,84 @@ def get_level(code: str) -> str:
     return level_map.get(len(parts), "?")
 
 
-def get_theme_hierarchy(tree: Dict) -> Dict[str, Dict]:
+class ThemeIndex:
+    """
+    Índice O(1) sobre a árvore temática (código → nó, pai, filhos, nível)
+
+    Cópia enxuta de scripts/utils/theme_index.py (o app é empacotado isoladamente).
+    """
+
+    def __init__(self, tree: Dict):
+        self.tree = tree
+        self._nodes: Dict[str, Dict] = {}
+        self._levels: Dict[str, str] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._by_level: Dict[str, List[str]] = {'L1': [], 'L2': [], 'L3': []}
+        self._build(tree.get('themes', []), None)
+
+    def _build(self, nodes: List[Dict], parent_code: Optional[str]) -> None:
+        for node in nodes:
+            code = node.get('code', '')
+            if code not in self._nodes:
+                level = get_level(code)
+                self._nodes[code] = node
+                self._levels[code] = level
+                self._parents[code] = parent_code
+                self._by_level.setdefault(level, []).append(code)
+
+            if 'children' in node:
+                self._build(node['children'], code)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._nodes
+
+    def get(self, code: str) -> Optional[Dict]:
+        """Retorna nó pelo código, ou None"""
+        return self._nodes.get(code)
+
+    def level(self, code: str) -> str:
+        """Nível do nó ("L1", "L2", "L3" ou "?")"""
+        level = self._levels.get(code)
+        return level if level is not None else get_level(code)
+
+    def label(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        """Label do nó, ou default se o código não existir"""
+        node = self._nodes.get(code)
+        return node.get('label', default) if node is not None else default
+
+    def parent_code(self, code: str) -> Optional[str]:
+        """Código do pai (None para L1 ou código inexistente)"""
+        return self._parents.get(code)
+
+    def children(self, code: str) -> List[Dict]:
+        """Filhos diretos do nó"""
+        node = self._nodes.get(code)
+        return node.get('children', []) if node is not None else []
+
+    def codes_at_level(self, level: str) -> List[str]:
+        """Códigos de um nível, na ordem da árvore"""
+        return self._by_level.get(level, [])
+
+
+def get_theme_hierarchy(tree: Union[Dict, ThemeIndex, "TreeSkeleton"]) -> Dict[str, Dict]:
     """
     Extrai hierarquia de temas da árvore
 
+    Args:
+        tree: Árvore temática, ThemeIndex ou TreeSkeleton já carregado
+
     Returns:
         Dict com estrutura: {'L1': {code: label}, 'L2': {parent: {code: label}}, 'L3': {parent: {code: label}}}
     """
+    index = ThemeIndex(tree) if isinstance(tree, dict) else tree
     themes = {'L1': {}, 'L2': {}, 'L3': {}}
 
-    for node in iter_all_nodes(tree):
-        code = node.get('code', '')
-        label = node.get('label', '')
-        level = get_level(code)
-
-        if level == 'L1':
-            themes['L1'][code] = label
-        elif level == 'L2':
-            parent_l1 = code.split('.')[0]
-            if parent_l1 not in themes['L2']:
-                themes['L2'][parent_l1] = {}
-            themes['L2'][parent_l1][code] = label
-        elif level == 'L3':
-            parent_l2 = '.'.join(code.split('.')[:2])
-            if parent_l2 not in themes['L3']:
-                themes['L3'][parent_l2] = {}
-            themes['L3'][parent_l2][code] = label
+    for code in index.codes_at_level('L1'):
+        themes['L1'][code] = index.label(code, '')
+
+    for level in ('L2', 'L3'):
+        for code in index.codes_at_level(level):
+            parent = index.parent_code(code)
+            themes[level].setdefault(parent, {})[code] = index.label(code, '')
 
     return themes
@@ -0,0 +1,276 @@
+"""
+Esqueleto da árvore temática com carga preguiçosa dos campos pesados
+
+Consumidores que só precisam de código e label (seletores de tema, apps de
+anotação) não precisam pagar pela leitura de descrições, keywords, includes
+e excludes. O esqueleto guarda apenas códigos, labels, níveis e pais em um
+artefato pequeno; os campos pesados de cada nó ficam em um arquivo separado,
+lido sob demanda por offset (via mmap).
+
+Os dois artefatos ficam em .tree_cache/, ao lado do snapshot da árvore, e são
+invalidados pelo mesmo critério (tamanho, mtime e hash do YAML).
+
+Cópia de scripts/utils/tree_skeleton.py com suporte a conteúdo baixado do GCS
+(o app é empacotado isoladamente).
+"""
+import mmap
+import pickle
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .tree_snapshot import (
+    SNAPSHOT_VERSION, TreeSnapshot, artifact_path, atomic_write, check_source, text_header
+)
+
+# Campos mantidos no esqueleto; todos os demais (description, keywords,
+# examples, includes, excludes...) vão para o arquivo de campos
+SKELETON_FIELDS = ('code', 'label', 'children')
+
+# O arquivo de campos começa com o hash do YAML de origem (32 caracteres hex)
+HASH_PREFIX_LEN = 32
+
+
+class TreeSkeleton:
+    """Códigos, labels e pais da árvore; campos pesados lidos por nó sob demanda"""
+
+    def __init__(self, yaml_file: Path, cache_dir: Optional[Path] = None):
+        self.yaml_file = Path(yaml_file)
+        self.cache_dir = cache_dir
+        self.skeleton_file = artifact_path(self.yaml_file, cache_dir, ".skeleton.pkl")
+        self.fields_file = artifact_path(self.yaml_file, cache_dir, ".fields.bin")
+
+        self.codes: List[str] = []
+        self.labels: List[str] = []
+        self.levels = array('b')
+        self.parents = array('i')        # linha do pai (-1 para L1)
+        self.offsets = array('q')        # campos de i: [offsets[i], offsets[i + 1]) no arquivo de campos
+        self.digest: Optional[str] = None
+
+        self._rows: Dict[str, int] = {}
+        self._by_level: Dict[str, List[str]] = {}
+        self._fields_data = None
+        self._fields_cache: Dict[str, Dict] = {}
+        self._text: Optional[str] = None  # conteúdo de origem quando carregado via load_text
+
+        # Informações da última carga
+        self.source = None  # "skeleton" ou "yaml"
+        self.load_time = 0.0
+
+    def load(self) -> "TreeSkeleton":
+        """
+        Carrega o esqueleto, reconstruindo os artefatos se o YAML mudou
+
+        Returns:
+            self (para encadear: TreeSkeleton(path).load())
+        """
+        start = time.perf_counter()
+
+        header, skeleton = self._read_skeleton()
+        fresh, current = check_source(self.yaml_file, header)
+
+        if fresh:
+            # mtime mudou mas o conteúdo não: atualizar cabeçalho
+            if header['mtime_ns'] != current['mtime_ns']:
+                self._write_skeleton(current, skeleton)
+            self._set(skeleton, current['hash'])
+            self.source = "skeleton"
+        else:
+            self._rebuild(current)
+            self.source = "yaml"
+
+        self.load_time = time.perf_counter() - start
+        return self
+
+    def load_text(self, text: str) -> "TreeSkeleton":
+        """
+        Carrega o esqueleto a partir de conteúdo já baixado (ex: GCS)
+
+        Sem mtime disponível, os artefatos são validados apenas pelo hash do conteúdo.
+        """
+        start = time.perf_counter()
+        self._text = text
+
+        header, skeleton = self._read_skeleton()
+        current = text_header(text)
+
+        if header and header['hash'] == current['hash']:
+            self._set(skeleton, current['hash'])
+            self.source = "skeleton"
+        else:
+            self._rebuild(current)
+            self.source = "yaml"
+
+        self.load_time = time.perf_counter() - start
+        return self
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def level(self, code: str) -> str:
+        """Nível do nó ("L1", "L2", "L3" ou "?")"""
+        row = self._rows.get(code)
+        return f"L{self.levels[row]}" if row is not None else "?"
+
+    def label(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        """Label do nó, ou default se o código não existir"""
+        row = self._rows.get(code)
+        return self.labels[row] if row is not None else default
+
+    def parent_code(self, code: str) -> Optional[str]:
+        """Código do pai (None para L1 ou código inexistente)"""
+        row = self._rows.get(code)
+        if row is None or self.parents[row] < 0:
+            return None
+        return self.codes[self.parents[row]]
+
+    def codes_at_level(self, level: str) -> List[str]:
+        """Códigos de um nível, na ordem da árvore"""
+        return self._by_level.get(level, [])
+
+    def fields(self, code: str) -> Dict:
+        """
+        Campos pesados do nó (description, keywords, examples, includes, excludes)
+
+        Lidos do arquivo de campos na primeira chamada e memoizados.
+        """
+        cached = self._fields_cache.get(code)
+        if cached is not None:
+            return cached
+
+        # Abrir o arquivo antes de resolver a linha: pode haver reconstrução
+        data = self._fields_store()
+        row = self._rows.get(code)
+        if row is None:
+            return {}
+
+        fields = pickle.loads(data[self.offsets[row]:self.offsets[row + 1]])
+        self._fields_cache[code] = fields
+        return fields
+
+    def node(self, code: str) -> Optional[Dict]:
+        """Nó completo (sem filhos), montado a partir do esqueleto e dos campos"""
+        row = self._rows.get(code)
+        if row is None:
+            return None
+        return {'code': code, 'label': self.labels[row], **self.fields(code)}
+
+    def invalidate(self) -> None:
+        """Remove os artefatos (próxima carga reconstrói a partir da árvore)"""
+        for artifact in (self.skeleton_file, self.fields_file):
+            if artifact.exists():
+                artifact.unlink()
+
+    def _set(self, skeleton: Dict, digest: str) -> None:
+        """Instala o esqueleto e os índices derivados"""
+        self.codes = skeleton['codes']
+        self.labels = skeleton['labels']
+        self.levels = skeleton['levels']
+        self.parents = skeleton['parents']
+        self.offsets = skeleton['offsets']
+        self.digest = digest
+
+        self._rows = {}
+        self._by_level = {}
+        for row, code in enumerate(self.codes):
+            self._rows.setdefault(code, row)
+            self._by_level.setdefault(f"L{self.levels[row]}", []).append(code)
+
+        self._fields_data = None
+        self._fields_cache = {}
+
+    def _rebuild(self, header: Dict) -> None:
+        """Reconstrói os dois artefatos a partir da árvore completa"""
+        snapshot = TreeSnapshot(self.yaml_file, self.cache_dir)
+        tree = snapshot.load_text(self._text) if self._text is not None else snapshot.load()
+
+        skeleton = {
+            'codes': [],
+            'labels': [],
+            'levels': array('b'),
+            'parents': array('i'),
+            'offsets': array('q'),
+        }
+        chunks = [header['hash'].encode('ascii')]
+        offset = HASH_PREFIX_LEN
+
+        def walk(nodes, parent_row, level):
+            nonlocal offset
+            for node in nodes:
+                row = len(skeleton['codes'])
+                skeleton['codes'].append(node.get('code', ''))
+                skeleton['labels'].append(node.get('label', ''))
+                skeleton['levels'].append(level)
+                skeleton['parents'].append(parent_row)
+
+                blob = pickle.dumps(
+                    {field: value for field, value in node.items() if field not in SKELETON_FIELDS},
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+                skeleton['offsets'].append(offset)
+                chunks.append(blob)
+                offset += len(blob)
+
+                walk(node.get('children', []), row, level + 1)
+
+        walk(tree.get('themes', []), -1, 1)
+        skeleton['offsets'].append(offset)
+
+        fields_data = b''.join(chunks)
+
+        # Campos primeiro: um esqueleto gravado sempre aponta para campos completos
+        if atomic_write(self.fields_file, lambda f: f.write(fields_data)):
+            self._write_skeleton(header, skeleton)
+
+        self._set(skeleton, header['hash'])
+        self._fields_data = fields_data
+
+    def _write_skeleton(self, header: Dict, skeleton: Dict) -> None:
+        def write(f):
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(skeleton, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        atomic_write(self.skeleton_file, write)
+
+    def _read_skeleton(self):
+        """Lê cabeçalho e esqueleto (None, None se ausente ou inválido)"""
+        try:
+            with open(self.skeleton_file, 'rb') as f:
+                header = pickle.load(f)
+                if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+                    return None, None
+                return header, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None, None
+
+    def _fields_store(self):
+        """Arquivo de campos mapeado em memória, conferindo o hash de origem"""
+        if self._fields_data is not None:
+            return self._fields_data
+
+        try:
+            with open(self.fields_file, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            data = None
+
+        if data is not None and data[:HASH_PREFIX_LEN] == self.digest.encode('ascii'):
+            self._fields_data = data
+        else:
+            # Arquivo ausente ou de outra versão do YAML: reconstruir tudo
+            if data is not None:
+                data.close()
+            if self._text is not None:
+                current = text_header(self._text)
+            else:
+                _, current = check_source(self.yaml_file, None)
+            self._rebuild(current)
+
+        return self._fields_data